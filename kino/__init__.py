@@ -10,8 +10,23 @@
 
 
 from .bot import KinoBot
+from .management import benchmark_predictor
+from .management import benchmark_skill_data
+from .management import benchmark_templates
 from .management import prepare_feed_data
 from .management import prepare_skill_data
+from .management import profile_import_time
 from .management import register_skills
+from .management import replay_messages
 
-__all__ = ["KinoBot", "prepare_feed_data", "prepare_skill_data", "register_skills"]
+__all__ = [
+    "KinoBot",
+    "benchmark_predictor",
+    "benchmark_skill_data",
+    "benchmark_templates",
+    "prepare_feed_data",
+    "prepare_skill_data",
+    "profile_import_time",
+    "register_skills",
+    "replay_messages",
+]
@@ -0,0 +1,133 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from hbconfig import Config
+
+from ..utils.logger import Logger
+from ..utils.metrics import Metrics
+
+
+class JobExecutor(object):
+    """ Bounded thread pool for scheduled jobs """
+
+    class __Executor:
+
+        MAX_WORKERS = 4
+
+        def __init__(self):
+            max_workers = Config.bot.get("JOB_WORKERS", self.MAX_WORKERS)
+            self.pool = ThreadPoolExecutor(max_workers=max_workers)
+            self.logger = Logger().get_logger()
+
+            self.lock = threading.Lock()
+            self.queued = collections.Counter()  # job_id -> count
+            self.running = {}  # job_id -> {run_id: (name, deadline)}
+
+        def submit(
+            self,
+            job_id,
+            func,
+            kwargs=None,
+            name=None,
+            max_instances=1,
+            coalesce=True,
+            timeout=None,
+            callback=None,
+        ):
+            """ Run func(**kwargs) in the pool.
+
+            - max_instances: queued and running runs of the job_id at once
+            - coalesce: at most one queued run per job_id (missed runs are merged)
+            - timeout: seconds, a run over it is logged. It keeps counting for
+              max_instances until it returns (python threads can not be killed)
+            - callback: callback(result) after a successful run
+
+            :return: Future, or None when the run is skipped
+            """
+            if name is None:
+                name = getattr(func, "__name__", str(job_id))
+
+            with self.lock:
+                self.__check_timeouts()
+
+                queued = self.queued[job_id]
+                running = len(self.running.get(job_id, {}))
+                if coalesce and queued > 0:
+                    skip_reason = "coalesced"
+                elif queued + running >= max_instances:
+                    skip_reason = "max_instances"
+                else:
+                    skip_reason = None
+                    self.queued[job_id] += 1
+
+            if skip_reason is not None:
+                self.logger.info(f"skip job {name}: {skip_reason}")
+                Metrics().inc("kino_job_skips_total", job=name, reason=skip_reason)
+                return None
+
+            return self.pool.submit(
+                self.__run, job_id, name, func, kwargs or {}, timeout, callback
+            )
+
+        def __run(self, job_id, name, func, kwargs, timeout, callback):
+            run_id = object()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with self.lock:
+                self.queued[job_id] -= 1
+                if self.queued[job_id] <= 0:
+                    del self.queued[job_id]
+                self.running.setdefault(job_id, {})[run_id] = (name, deadline)
+
+            try:
+                with Metrics().timer("kino_job_duration_seconds", job=name):
+                    result = func(**kwargs)
+                if callback is not None:
+                    callback(result)
+                return result
+            except BaseException:
+                self.logger.exception(f"job {name}")
+                raise
+            finally:
+                with self.lock:
+                    runs = self.running.get(job_id, {})
+                    runs.pop(run_id, None)
+                    if not runs:
+                        self.running.pop(job_id, None)
+
+        def __check_timeouts(self):
+            now = time.monotonic()
+            for job_id, runs in list(self.running.items()):
+                for run_id, (name, deadline) in list(runs.items()):
+                    if deadline is None or now < deadline:
+                        continue
+
+                    self.logger.warning(f"job {name} is over its timeout.")
+                    Metrics().inc("kino_job_timeouts_total", job=name)
+                    runs[run_id] = (name, None)  # logged once
+
+        @property
+        def running_count(self):
+            with self.lock:
+                self.__check_timeouts()
+                return sum(len(runs) for runs in self.running.values())
+
+        @property
+        def queued_count(self):
+            with self.lock:
+                return sum(self.queued.values())
+
+        def collect_metrics(self, metrics):
+            metrics.gauge("kino_jobs_running", self.running_count)
+            metrics.gauge("kino_jobs_queued", self.queued_count)
+
+    instance = None
+
+    def __init__(self):
+        if not JobExecutor.instance:
+            JobExecutor.instance = JobExecutor.__Executor()
+            Metrics().register_collector(JobExecutor.instance.collect_metrics)
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
@@ -0,0 +1,67 @@
+import datetime
+import threading
+
+from hbconfig import Config
+
+from ..utils.data_handler import DataHandler
+
+
+class JobStore(object):
+    """ Last run times of scheduled jobs, kept across restarts (data/jobs.json) """
+
+    class __Store:
+
+        FNAME = "jobs.json"
+        MISFIRE_GRACE_TIME = 60 * 60  # Unit (Second)
+
+        def __init__(self):
+            self.data_handler = DataHandler()
+            self.lock = threading.Lock()
+            self.last_runs = self.data_handler.read_file(self.FNAME)  # id -> timestamp
+
+        def get_last_run(self, job_id):
+            timestamp = self.last_runs.get(job_id, None)
+            if timestamp is None:
+                return None
+            return datetime.datetime.fromtimestamp(timestamp)
+
+        def set_last_run(self, job_id, run_time=None):
+            if run_time is None:
+                run_time = datetime.datetime.now()
+
+            with self.lock:
+                self.last_runs[job_id] = run_time.timestamp()
+                self.data_handler.write_file(self.FNAME, self.last_runs)
+
+        def is_misfired(self, job_id, job, now=None, grace_time=None):
+            """ True when the last due run of the (scheduled) job is missed,
+            and it is not older than the grace time.
+            A job that never ran before is not misfired. """
+            if now is None:
+                now = datetime.datetime.now()
+            if grace_time is None:
+                grace_time = Config.bot.get(
+                    "MISFIRE_GRACE_TIME", self.MISFIRE_GRACE_TIME
+                )
+
+            last_run = self.get_last_run(job_id)
+            if last_run is None or job.next_run is None:
+                return False
+
+            if job.at_time is not None or job.start_day is not None:
+                last_due = job.next_run - job.period
+            else:
+                last_due = last_run + job.period
+
+            if not (last_run < last_due <= now):
+                return False
+            return (now - last_due).total_seconds() <= grace_time
+
+    instance = None
+
+    def __init__(self):
+        if not JobStore.instance:
+            JobStore.instance = JobStore.__Store()
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
@@ -36,13 +36,17 @@ Usage:
 [2] https://github.com/tomykaira/clockwork
 [3] http://adam.heroku.com/past/2010/6/30/replace_cron_with_clockwork/
 """
-import collections
+import collections.abc
 import datetime
 import functools
+import heapq
+import itertools
 import logging
 import time
 import threading
 
+from ...utils.metrics import Metrics
+
 logger = logging.getLogger("schedule")
 
 
@@ -58,10 +62,22 @@ class Scheduler(object):
     """
     Objects instantiated by the `Scheduler` are factories to create
     jobs, keep record of scheduled jobs and handle their execution.
+
+    Scheduled jobs are kept in a heap ordered by `next_run`. A cancelled
+    or rescheduled job leaves its old heap entry behind (marked as removed),
+    which is dropped when it reaches the top of the heap.
     """
 
+    MAX_IDLE_SECONDS = 60  # longest sleep, bounds the delay after a clock jump
+    CLOCK_JUMP_SECONDS = 5  # wall clock vs monotonic clock difference to adjust
+
     def __init__(self):
-        self.jobs = []
+        self.jobs = {}  # job -> heap entry [next_run, sequence, job]
+        self._queue = []  # heap of entries
+        self._sequence = itertools.count()  # FIFO order for the same next_run
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)  # notified on add/cancel
+        self._cease_continuous_run = None
 
     def run_pending(self):
         """
@@ -73,29 +89,58 @@ class Scheduler(object):
         increments then your job won't be run 60 times in between but
         only once.
         """
-        runnable_jobs = (job for job in self.jobs if job.should_run)
-        for job in sorted(runnable_jobs):
-            self._run_job(job)
+        runnable_jobs = self._pop_runnable_jobs(datetime.datetime.now())
+        try:
+            while runnable_jobs:
+                self._run_job(runnable_jobs.popleft())
+        finally:
+            # an exception from a job must not unschedule the other jobs
+            for job in runnable_jobs:
+                self._schedule_job(job)
+
+    def run_continuously(self, interval=MAX_IDLE_SECONDS):
+        """Continuously run, sleeping until the next job should run.
+        Adding or cancelling a job wakes the thread up early, and it never
+        sleeps longer than `interval` seconds, so a wall clock that jumped
+        forward is noticed within `interval`. When the wall clock jumped
+        backward, jobs without a specific time (every N minutes ..) are
+        moved back by the jump, instead of waiting for the old time again.
+
+        Only one continuous run is kept per scheduler. A new call ceases
+        the previous one.
 
-    def run_continuously(self, interval=1):
-        """Continuously run, while executing pending jobs at each elapsed
-        time interval.
         @return cease_continuous_run: threading.Event which can be set to
         cease continuous run.
         Please note that it is *intended behavior that run_continuously()
         does not run missed jobs*. For example, if you've registered a job
-        that should run every minute and you set a continuous run interval
-        of one hour then your job won't be run 60 times at each interval but
-        only once.
+        that should run every minute and the machine was asleep for an hour
+        then your job won't be run 60 times but only once.
         """
-        cease_continuous_run = threading.Event()
+        scheduler = self
+
+        class CeaseEvent(threading.Event):
+            def set(self):
+                super().set()
+                with scheduler._changed:
+                    scheduler._changed.notify_all()
+
+        cease_continuous_run = CeaseEvent()
+
+        with self._lock:
+            if self._cease_continuous_run is not None:
+                self._cease_continuous_run.set()
+            self._cease_continuous_run = cease_continuous_run
 
         class ScheduleThread(threading.Thread):
             @classmethod
             def run(cls):
                 while not cease_continuous_run.is_set():
-                    self.run_pending()
-                    time.sleep(interval)
+                    try:
+                        self.run_pending()
+                    except Exception:
+                        # the failed job is moved to its next run, keep going
+                        logger.exception("Job failed")
+                    self._wait_next_run(interval, cease_continuous_run)
 
         continuous_thread = ScheduleThread()
         continuous_thread.daemon = True
@@ -103,6 +148,41 @@ class Scheduler(object):
 
         return cease_continuous_run
 
+    def _wait_next_run(self, max_seconds, cease_continuous_run):
+        with self._changed:
+            if cease_continuous_run.is_set():
+                return
+
+            entry = self._peek()
+            timeout = max_seconds
+            if entry is not None:
+                idle_seconds = (entry[0] - datetime.datetime.now()).total_seconds()
+                timeout = max(0, min(idle_seconds, max_seconds))
+            if timeout == 0:
+                return
+
+            wall_start, monotonic_start = time.time(), time.monotonic()
+            self._changed.wait(timeout)
+            jump = (time.time() - wall_start) - (time.monotonic() - monotonic_start)
+
+        Metrics().inc("kino_schedule_wakeups_total")
+        if jump < -self.CLOCK_JUMP_SECONDS:
+            logger.info("Wall clock jumped back %.0fs", -jump)
+            self._shift_interval_jobs(datetime.timedelta(seconds=jump))
+
+    def _shift_interval_jobs(self, delta):
+        """
+        Move `next_run` of the jobs without a specific time by `delta`.
+        """
+        with self._lock:
+            for job in list(self.jobs):
+                if job.next_run is None:
+                    continue
+                if job.at_time is not None or job.start_day is not None:
+                    continue
+                job.next_run += delta
+                self._schedule_job(job)
+
     def run_all(self, delay_seconds=0):
         """
         Run all jobs regardless if they are scheduled to run or not.
@@ -118,7 +198,9 @@ class Scheduler(object):
             len(self.jobs),
             delay_seconds,
         )
-        for job in self.jobs[:]:
+        for job in list(self.jobs):
+            if job.next_run is None:  # not scheduled yet (without do())
+                continue
             self._run_job(job)
             time.sleep(delay_seconds)
 
@@ -130,10 +212,14 @@ class Scheduler(object):
         :param tag: An identifier used to identify a subset of
                     jobs to delete
         """
-        if tag is None:
-            del self.jobs[:]
-        else:
-            self.jobs[:] = (job for job in self.jobs if tag not in job.tags)
+        with self._lock:
+            if tag is None:
+                self.jobs.clear()
+                del self._queue[:]
+                self._changed.notify_all()
+            else:
+                for job in [job for job in self.jobs if tag in job.tags]:
+                    self.cancel_job(job)
 
     def cancel_job(self, job):
         """
@@ -141,10 +227,11 @@ class Scheduler(object):
 
         :param job: The job to be unscheduled
         """
-        try:
-            self.jobs.remove(job)
-        except ValueError:
-            pass
+        with self._lock:
+            entry = self.jobs.pop(job, None)
+            if entry is not None:
+                entry[-1] = None  # removed from the heap lazily
+                self._changed.notify_all()
 
     def every(self, interval=1):
         """
@@ -153,12 +240,74 @@ class Scheduler(object):
         :param interval: A quantity of a certain time unit
         :return: An empty job
         """
-        job = Job(interval)
-        self.jobs.append(job)
+        job = Job(interval, scheduler=self)
+        with self._lock:
+            self.jobs[job] = None  # pushed to the heap by Job.do()
         return job
 
+    def _schedule_job(self, job):
+        """
+        Push the job to the heap with its current `next_run`.
+        """
+        with self._lock:
+            if job not in self.jobs:  # cancelled
+                return
+
+            old_entry = self.jobs[job]
+            if old_entry is not None:
+                old_entry[-1] = None
+
+            entry = [job.next_run, next(self._sequence), job]
+            self.jobs[job] = entry
+            heapq.heappush(self._queue, entry)
+            if self._queue[0] is entry:  # sooner than the sleeping loop expects
+                self._changed.notify_all()
+
+            if len(self._queue) > 2 * len(self.jobs) + 64:
+                self._compact()
+
+    def _compact(self):
+        self._queue[:] = [entry for entry in self._queue if entry[-1] is not None]
+        heapq.heapify(self._queue)
+
+    def _peek(self):
+        """
+        :return: The heap entry of the next job, or None.
+        """
+        with self._lock:
+            while self._queue and self._queue[0][-1] is None:
+                heapq.heappop(self._queue)
+            return self._queue[0] if self._queue else None
+
+    def _pop_runnable_jobs(self, now):
+        runnable_jobs = collections.deque()
+        with self._lock:
+            while True:
+                entry = self._peek()
+                if entry is None or entry[0] > now:
+                    break
+                heapq.heappop(self._queue)
+                runnable_jobs.append(entry[-1])
+        return runnable_jobs
+
     def _run_job(self, job):
-        ret = job.run()
+        metrics = Metrics()
+        metrics.inc("kino_schedule_job_runs_total")
+        if job.next_run is not None and job.period:
+            # runs that were skipped because the job is late (not run twice)
+            missed = int((datetime.datetime.now() - job.next_run) / job.period)
+            if missed > 0:
+                metrics.inc("kino_schedule_job_misses_total", missed)
+
+        try:
+            ret = job.run()
+        except Exception:
+            # not run again until its next run
+            job.last_run = datetime.datetime.now()
+            job._schedule_next_run()
+            raise
+        finally:
+            self._schedule_job(job)
         if isinstance(ret, CancelJob) or ret is CancelJob:
             self.cancel_job(job)
 
@@ -169,9 +318,10 @@ class Scheduler(object):
 
         :return: A :class:`~datetime.datetime` object
         """
-        if not self.jobs:
+        entry = self._peek()
+        if entry is None:
             return None
-        return min(self.jobs).next_run
+        return entry[0]
 
     @property
     def idle_seconds(self):
@@ -195,7 +345,7 @@ class Job(object):
     method, which also defines its `interval`
     """
 
-    def __init__(self, interval):
+    def __init__(self, interval, scheduler=None):
         self.interval = interval  # pause interval * unit between runs
         self.job_func = None  # the job job_func to run
         self.unit = None  # time units, e.g. 'minutes', 'hours', ...
@@ -205,6 +355,7 @@ class Job(object):
         self.period = None  # timedelta between runs, only valid for
         self.start_day = None  # Specific day of the week to start on
         self.tags = set()  # unique set of tags for the job
+        self.scheduler = scheduler  # scheduler to push the job to
 
     def __lt__(self, other):
         """
@@ -347,10 +498,10 @@ class Job(object):
         :param tags: A unique list of ``Hashable`` tags.
         :return: The invoked job instance
         """
-        if any([not isinstance(tag, collections.Hashable) for tag in tags]):
+        if any([not isinstance(tag, collections.abc.Hashable) for tag in tags]):
             raise TypeError("Every tag should be hashable")
 
-        if not all(isinstance(tag, collections.Hashable) for tag in tags):
+        if not all(isinstance(tag, collections.abc.Hashable) for tag in tags):
             raise TypeError("Tags must be hashable")
         self.tags.update(tags)
         return self
@@ -397,6 +548,8 @@ class Job(object):
             # call will fail.
             pass
         self._schedule_next_run()
+        if self.scheduler is not None:
+            self.scheduler._schedule_job(self)
         return self
 
     @property
@@ -476,7 +629,7 @@ class Job(object):
 #: Default :class:`Scheduler <Scheduler>` object
 default_scheduler = Scheduler()
 
-#: Default :class:`Jobs <Job>` list
+#: Default :class:`Jobs <Job>` (dict of job -> heap entry)
 jobs = default_scheduler.jobs  # todo: should this be a copy, e.g. jobs()?
 
 
@@ -491,18 +644,17 @@ def every(interval=1):
     return default_scheduler.every(interval)
 
 
-def run_continuously(interval=1):
-    """Continuously run, while executing pending jobs at each elapsed
-    time interval.
+def run_continuously(interval=Scheduler.MAX_IDLE_SECONDS):
+    """Continuously run, sleeping until the next job should run.
+    (at most `interval` seconds)
 
     @return cease_continuous_run: threading.Event which can be set to
     cease continuous run.
 
     Please note that it is *intended behavior that run_continuously()
     does not run missed jobs*. For example, if you've registered a job
-    that should run every minute and you set a continuous run interval
-    of one hour then your job won't be run 60 times at each interval but
-    only once.
+    that should run every minute and the machine was asleep for an hour
+    then your job won't be run 60 times but only once.
     """
     return default_scheduler.run_continuously(interval)
 
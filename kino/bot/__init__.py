@@ -1,9 +1,11 @@
 import asyncio
+import json
 import time
 import websockets
 
 from hbconfig import Config
 
+from kino.bot.leader import Leader
 from kino.bot.worker import Worker
 from kino.listener import MsgListener
 
@@ -11,55 +13,120 @@ from kino.slack.resource import MsgResource
 from kino.slack.slackbot import SlackerAdapter
 from kino.slack.slackbot import GiphyClient
 
+from kino.utils.backoff import Backoff
 from kino.utils.logger import Logger
+from kino.utils.metrics import Metrics
+from kino.utils.metrics import start_metrics_server
 
 
 class KinoBot:
+
+    PING_INTERVAL = 30  # Unit (Second)
+    STALE_TIMEOUT = 90  # Unit (Second), no message (or pong) from RTM
+    HEALTHY_SESSION_TIME = 600  # Unit (Second), reset backoff after this
+
     def __init__(self) -> None:
         self.slackbot = SlackerAdapter()
         self.logger = Logger().get_logger()
-        self.worker = Worker(slackbot=self.slackbot)
-
-        self.error_delay = 5  # Unit (Second)
+        self.leader = Leader()
+        self.worker = Worker(slackbot=self.slackbot, leader=self.leader)
+        self.said_hello = False
 
-        # Send a message to channel (init)
-        MASTER_NAME = Config.bot.MASTER_NAME
-        BOT_NAME = Config.bot.BOT_NAME
-        self.slackbot.send_message(
-            text=MsgResource.HELLO(master_name=MASTER_NAME, bot_name=BOT_NAME)
-        )
+        self.backoff = Backoff(base=1, max_delay=300)
+        self.reconnect_count = 0
 
-        giphy = GiphyClient()
-        giphy.search("Hello!")
+        metrics_port = Config.bot.get("METRICS_PORT", None)
+        if metrics_port:
+            start_metrics_server(int(metrics_port))
+            self.logger.info(
+                f"metrics endpoint: http://127.0.0.1:{metrics_port}/metrics"
+            )
 
-
-    def start_session(self, init: bool = False, nap: bool = False):
+    def start_session(self, nap: bool = False):
         if nap:
             pass
             # self.slackbot.send_message(text=MsgResource.NAP)
         else:
-            self.worker.stop(init=init)
-            self.worker.run(init=init)
+            # Only the leader runs schedules and handles messages.
+            # The other replicas keep RTM connected to take over fast.
+            self.leader.start(
+                on_elected=self.__on_elected, on_demoted=self.__on_demoted
+            )
+
+        listener = MsgListener()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        while True:
+            session_start_time = time.time()
+            try:
+                # Start RTM
+                endpoint = self.slackbot.start_real_time_messaging_session()
+                self.logger.info("start real time messaging session!")
+
+                loop.run_until_complete(self.__execute_bot(endpoint, listener))
+            except Exception:  # KeyboardInterrupt and SystemExit stop the bot
+                self.logger.error("Session Error.")
+                self.logger.exception("bot")
+
+            if time.time() - session_start_time > self.HEALTHY_SESSION_TIME:
+                self.backoff.reset()
+            delay = self.backoff.next()
 
+            self.reconnect_count += 1
+            Metrics().inc("kino_rtm_reconnects_total")
+            self.logger.error(
+                f"reconnect in {delay:.1f} seconds.. (reconnect count: {self.reconnect_count})"
+            )
+            time.sleep(delay)
+
+    def __on_elected(self):
+        first_election = not self.said_hello
+        if first_election:
+            # Send a message to channel (init)
+            MASTER_NAME = Config.bot.MASTER_NAME
+            BOT_NAME = Config.bot.BOT_NAME
+            self.slackbot.send_message(
+                text=MsgResource.HELLO(master_name=MASTER_NAME, bot_name=BOT_NAME)
+            )
+
+            giphy = GiphyClient()
+            giphy.search("Hello!")
+            self.said_hello = True
+
+        # WORKER_START only when this process takes over the schedules (failover)
+        self.worker.stop(init=True)
+        self.worker.run(init=first_election)
+
+    def __on_demoted(self):
+        self.worker.stop(init=True)
+
+    async def __execute_bot(self, endpoint, listener):
+        ws = await websockets.connect(endpoint)
         try:
-            # Start RTM
-            endpoint = self.slackbot.start_real_time_messaging_session()
-            listener = MsgListener()
-            self.logger.info("start real time messaging session!")
-
-            async def execute_bot():
-                ws = await websockets.connect(endpoint)
-                while True:
-                    receive_json = await ws.recv()
-                    listener.handle(receive_json)
+            ping_id = 0
+            last_received_time = time.time()
+            while True:
+                try:
+                    receive_json = await asyncio.wait_for(
+                        ws.recv(), timeout=self.PING_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    if time.time() - last_received_time > self.STALE_TIMEOUT:
+                        self.logger.error("RTM connection is stale.")
+                        return
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            asyncio.get_event_loop().run_until_complete(execute_bot())
-            asyncio.get_event_loop().run_forever()
+                    ping_id += 1
+                    await ws.send(json.dumps({"id": ping_id, "type": "ping"}))
+                    continue
 
-        except BaseException:
-            self.logger.error(f"Session Error. restart in {self.error_delay} seconds..")
-            self.logger.exception("bot")
-            time.sleep(self.error_delay)
-            self.start_session(nap=True)
+                last_received_time = time.time()
+                if json.loads(receive_json).get("type", None) == "goodbye":
+                    self.logger.info("RTM server said goodbye.")
+                    return
+
+                if self.leader.is_leader:
+                    listener.handle(receive_json)
+        finally:
+            await ws.close()
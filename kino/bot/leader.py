@@ -0,0 +1,226 @@
+import abc
+import fcntl
+import importlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from hbconfig import Config
+
+from ..utils.logger import Logger
+from ..utils.metrics import Metrics
+
+
+class LeaderElection(abc.ABC):
+    """ Backend of Leader. acquire() gets or renews the leadership. """
+
+    ttl = None  # Unit (Second), leadership is valid after acquire. None: until release
+
+    def __init__(self):
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @abc.abstractmethod
+    def acquire(self):
+        """ :return: True when this process is the leader """
+
+    def release(self):
+        pass
+
+
+class NoElection(LeaderElection):
+    """ Single process, always the leader """
+
+    def acquire(self):
+        return True
+
+
+class FileLockElection(LeaderElection):
+    """ The process holding the lock is the leader.
+    The OS releases the lock when the process dies. (one host) """
+
+    def __init__(self, path="data/leader.lock"):
+        super().__init__()
+        self.path = path
+        self.lock_file = None
+
+    def acquire(self):
+        if self.lock_file is not None:
+            return True
+
+        lock_file = open(self.path, "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(self.holder)
+        lock_file.flush()
+        self.lock_file = lock_file
+        return True
+
+    def release(self):
+        if self.lock_file is None:
+            return
+
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+        self.lock_file = None
+
+
+class SQLiteLeaseElection(LeaderElection):
+    """ The holder of an unexpired lease is the leader. (one host, or a shared disk) """
+
+    def __init__(self, path="data/leader.db", ttl=10, name="kino"):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.name = name
+
+        conn = self.__connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lease "
+                "(name TEXT PRIMARY KEY, holder TEXT, expires_at REAL)"
+            )
+        finally:
+            conn.close()
+
+    def acquire(self):
+        conn = self.__connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT holder, expires_at FROM lease WHERE name = ?", (self.name,)
+            ).fetchone()
+
+            now = time.time()
+            if row is not None and row[0] != self.holder and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+
+            conn.execute(
+                "INSERT OR REPLACE INTO lease (name, holder, expires_at) VALUES (?, ?, ?)",
+                (self.name, self.holder, now + self.ttl),
+            )
+            conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    def release(self):
+        conn = self.__connect()
+        try:
+            conn.execute(
+                "DELETE FROM lease WHERE name = ? AND holder = ?",
+                (self.name, self.holder),
+            )
+        finally:
+            conn.close()
+
+    def __connect(self):
+        return sqlite3.connect(self.path, timeout=self.ttl / 2, isolation_level=None)
+
+
+class Leader(object):
+    """ Keep checking the election, and call on_elected / on_demoted when it changes.
+
+    Config.bot.LEADER_ELECTION: 'file', 'sqlite' or 'package.module.ClassName'
+    (a LeaderElection). Without it, this process is always the leader.
+    """
+
+    BACKENDS = {"file": FileLockElection, "sqlite": SQLiteLeaseElection}
+    CHECK_INTERVAL = 2  # Unit (Second), without a ttl
+
+    def __init__(self, election=None):
+        self.logger = Logger().get_logger()
+        if election is None:
+            election = self.make_election()
+        self.election = election
+
+        if election.ttl is None:
+            self.check_interval = self.CHECK_INTERVAL
+        else:
+            self.check_interval = election.ttl / 3
+
+        self.elected = False
+        self.valid_until = 0  # monotonic time
+        self.on_elected = None
+        self.on_demoted = None
+        self.stopped = threading.Event()
+
+    @staticmethod
+    def make_election():
+        backend = Config.bot.get("LEADER_ELECTION", None)
+        if backend is None:
+            return NoElection()
+
+        if backend == "sqlite":
+            return SQLiteLeaseElection(ttl=Config.bot.get("LEADER_LEASE_TTL", 10))
+        if backend in Leader.BACKENDS:
+            return Leader.BACKENDS[backend]()
+
+        module_name, class_name = backend.rsplit(".", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+
+    @property
+    def is_leader(self):
+        return self.elected and time.monotonic() < self.valid_until
+
+    def start(self, on_elected=None, on_demoted=None):
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+
+        self.check()
+        if isinstance(self.election, NoElection):
+            return
+
+        def run():
+            while not self.stopped.wait(self.check_interval):
+                self.check()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def check(self):
+        check_time = time.monotonic()
+        try:
+            acquired = self.election.acquire()
+        except Exception:
+            # ex. 'database is locked', keep the leadership until the lease expires
+            self.logger.exception("leader election")
+            acquired = self.is_leader
+        else:
+            if acquired:
+                if self.election.ttl is None:
+                    self.valid_until = float("inf")
+                else:
+                    self.valid_until = check_time + self.election.ttl
+        Metrics().gauge("kino_leader", int(acquired))
+
+        if acquired and not self.elected:
+            self.elected = True
+            self.__changed("elected", self.on_elected)
+        elif not acquired and self.elected:
+            self.elected = False
+            self.__changed("demoted", self.on_demoted)
+
+    def stop(self):
+        self.stopped.set()
+        if self.elected:
+            self.elected = False
+            self.__changed("demoted", self.on_demoted)
+        self.election.release()
+
+    def __changed(self, state, callback):
+        self.logger.info(f"leader {state}. ({self.election.holder})")
+        Metrics().inc("kino_leader_changes_total", state=state)
+        if callback is not None:
+            try:
+                callback()
+            except BaseException:
+                self.logger.exception(f"leader {state}")
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import threading
-
 from hbconfig import Config
 
 from ..background import schedule
+from ..background.executor import JobExecutor
+from ..background.job_store import JobStore
 
 from ..functions import FunctionRunner
 
@@ -17,11 +17,17 @@ from ..slack.slackbot import SlackerAdapter
 
 from ..utils.data_handler import DataHandler
 from ..utils.logger import Logger
+from ..utils.metrics import Metrics
 
 
 class Worker(object):
-    def __init__(self, text=None, slackbot=None):
+
+    JOB_TIMEOUT = 10 * 60  # Unit (Second)
+    HEALTH_CHECK_TIMEOUT = 5 * 60  # Unit (Second)
+
+    def __init__(self, text=None, slackbot=None, leader=None):
         self.input = text
+        self.leader = leader  # jobs run only while it is the leader
         self.data_handler = DataHandler()
         self.logger = Logger().get_logger()
         self.ner = NamedEntitiyRecognizer()
@@ -39,6 +45,8 @@ class Worker(object):
         else:
             self.profile = None
 
+        self.scheduled_jobs = []  # (job, job_id, param, timeout, once)
+
     def create(self):
         ner_dict = {
             k: self.ner.parse(v, self.input) for k, v in self.ner.schedule.items()
@@ -54,8 +62,7 @@ class Worker(object):
         )
         ner_dict["time_unit"] = time_unit
 
-        skill_keywords = {k: v["keyword"] for k, v in self.ner.skills.items()}
-        func_name = self.ner.parse(skill_keywords, self.input)
+        func_name = self.ner.parse_skill(self.input)
         ner_dict["skills"] = func_name
 
         params = {k: self.ner.parse(v, self.input) for k, v in self.ner.params.items()}
@@ -69,7 +76,7 @@ class Worker(object):
             return
 
         self.set_schedules()
-        schedule.run_continuously(interval=1)
+        schedule.run_continuously()
 
         if not init:
             self.slackbot.send_message(text=MsgResource.WORKER_START)
@@ -81,9 +88,19 @@ class Worker(object):
             return False
 
     def set_schedules(self):
+        self.scheduled_jobs = []  # the jobs of a previous run were cleared by stop
         if self.profile:
             self.__set_profile_schedule()
         self.__set_custom_schedule()
+        self.__run_misfired_jobs()
+
+    def __run_misfired_jobs(self):
+        # jobs that were due while the bot was not running (run once)
+        job_store = JobStore()
+        for job, job_id, param, timeout, once in self.scheduled_jobs:
+            if job_store.is_misfired(job_id, job):
+                self.logger.info(f"run misfired job: {job_id}")
+                self.__submit_job(job, job_id, param, timeout, once)
 
     def __set_profile_schedule(self):
 
@@ -138,9 +155,9 @@ class Worker(object):
         self.__excute_health_check()
 
     def __excute_profile_schedule(self, time, repeat, func_name, params, not_holiday):
-        schedule.every().day.at(time).do(
-            self.__run_threaded,
-            self.function_runner,
+        self.__schedule(
+            schedule.every().day.at(time),
+            f"profile:{func_name}:{time}",
             {
                 "repeat": repeat,
                 "func_name": func_name,
@@ -148,12 +165,13 @@ class Worker(object):
                 "day_of_week": [0],
                 "not_holiday": not_holiday,
             },
+            self.JOB_TIMEOUT,
         )
 
     def __excute_feed_schedule(self, interval):
-        schedule.every(interval).minutes.do(
-            self.__run_threaded,
-            self.function_runner,
+        self.__schedule(
+            schedule.every(interval).minutes,
+            "feed_notify",
             {
                 "repeat": True,
                 "func_name": "feed_notify",
@@ -161,12 +179,13 @@ class Worker(object):
                 "day_of_week": [0],
                 "not_holiday": False,
             },
+            interval * 60,  # a slow run is skipped by the next one
         )
 
     def __excute_health_check(self):
-        schedule.every(30).minutes.do(
-            self.__run_threaded,
-            self.function_runner,
+        self.__schedule(
+            schedule.every(30).minutes,
+            "health_check",
             {
                 "repeat": True,
                 "func_name": "health_check",
@@ -174,6 +193,7 @@ class Worker(object):
                 "day_of_week": [0],
                 "not_holiday": False,
             },
+            self.HEALTH_CHECK_TIMEOUT,
         )
 
     def __set_custom_schedule(self):
@@ -182,7 +202,7 @@ class Worker(object):
         alarm_data = schedule_data.get("alarm", {})
         between_data = schedule_data.get("between", {})
 
-        for _, v in alarm_data.items():
+        for alarm_id, v in alarm_data.items():
             if not isinstance(v, type({})):
                 continue
 
@@ -199,8 +219,12 @@ class Worker(object):
                 }
 
                 try:
-                    schedule.every().day.at(time).do(
-                        self.__run_threaded, self.function_runner, param
+                    self.__schedule(
+                        schedule.every().day.at(time),
+                        f"alarm:{alarm_id}:time",
+                        param,
+                        self.JOB_TIMEOUT,
+                        once=True,
                     )
                 except Exception as e:
                     print("Function Schedule Error: ", e)
@@ -226,8 +250,11 @@ class Worker(object):
                 }
 
                 try:
-                    getattr(schedule.every(number), datetime_unit).do(
-                        self.__run_threaded, self.function_runner, param
+                    self.__schedule(
+                        getattr(schedule.every(number), datetime_unit),
+                        f"alarm:{alarm_id}:between",
+                        param,
+                        self.JOB_TIMEOUT,
                     )
                 except Exception as e:
                     print("Error: " + e)
@@ -252,9 +279,39 @@ class Worker(object):
             end_time = None
         return start_time, end_time
 
-    def __run_threaded(self, job_func, param):
-        job_thread = threading.Thread(target=job_func, kwargs=param)
-        job_thread.start()
+    def __schedule(self, job, job_id, param, timeout, once=False):
+        """ once: cancel the job after its first run (custom 'time' alarms).
+        The daily profile jobs are also 'repeat: False', but run every day. """
+        job.do(self.__submit_job, job, job_id, param, timeout, once)
+        self.scheduled_jobs.append((job, job_id, param, timeout, once))
+
+    def __submit_job(self, job, job_id, param, timeout, once):
+        if self.leader is not None and not self.leader.is_leader:
+            # the lease is lost, before the leader check stops the schedules
+            self.logger.info(f"skip job {job_id}: not the leader")
+            Metrics().inc(
+                "kino_job_skips_total", job=param["func_name"], reason="not_leader"
+            )
+            return None
+
+        def cancel_job(result):
+            # load_function returns CancelJob after a run of a non-repeat job
+            if once and result is schedule.CancelJob:
+                schedule.cancel_job(job)
+
+        future = JobExecutor().submit(
+            job,
+            self.function_runner,
+            kwargs=param,
+            name=param["func_name"],
+            max_instances=1,
+            coalesce=True,
+            timeout=timeout,
+            callback=cancel_job,
+        )
+        if future is not None:
+            JobStore().set_last_run(job_id)
+        return future
 
     def stop(self, init=False):
         schedule.clear()
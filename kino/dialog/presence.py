@@ -5,10 +5,9 @@ from .dialog_manager import DialogManager
 from .dnd import DoNotDisturbManager
 
 from ..functions import Functions
-
-from ..skills.predictor import Predictor
-from ..skills.trello import TrelloManager
-from ..skills.weather import Weather
+from ..functions import Predictor
+from ..functions import TrelloManager
+from ..functions import Weather
 
 from ..slack.resource import MsgResource
 from ..slack.slackbot import SlackerAdapter
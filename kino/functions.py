@@ -9,22 +9,7 @@ from .background import schedule
 
 from .nlp.ner import NamedEntitiyRecognizer
 
-from .skills.bus import Bus
-from .skills.feed import FeedNotifier
-from .skills.github import GithubManager
-from .skills.humor import Humor
-from .skills.maxim import Maxim
-from .skills.naver import Naver
-from .skills.question import AttentionQuestion
-from .skills.question import HappyQuestion
-from .skills.rescue_time import RescueTime
-from .skills.samhangsi.generator import SamhangSiGenerator
-from .skills.summary import Summary
-from .skills.todoist import TodoistManager
-from .skills.toggl import TogglManager
-from .skills.trello import TrelloManager
-from .skills.twitter import TwitterManager
-from .skills.weather import Weather
+from .skills import LazySkill
 
 from .slack.slackbot import SlackerAdapter
 from .slack.resource import MsgResource
@@ -32,9 +17,33 @@ from .slack.resource import MsgResource
 from .utils.arrow import ArrowUtil
 from .utils.data_handler import DataHandler
 from .utils.data_loader import SkillData
-from .utils.data_loader import FeedData
 from .utils.logger import Logger
 from .utils.member import Member
+from .utils.metrics import Metrics
+from .utils.registry import SkillRegistry
+from .utils.tracer import Tracer
+
+
+# Skill modules pull in heavy clients (TensorFlow, sklearn, todoist, github ..),
+# so they are imported when a skill is called for the first time.
+Bus = LazySkill("bus", "Bus")
+FeedNotifier = LazySkill("feed", "FeedNotifier")
+GithubManager = LazySkill("github", "GithubManager")
+Humor = LazySkill("humor", "Humor")
+JenkinsClient = LazySkill("jenkins", "JenkinsClient")
+Maxim = LazySkill("maxim", "Maxim")
+Naver = LazySkill("naver", "Naver")
+Predictor = LazySkill("predictor", "Predictor")
+AttentionQuestion = LazySkill("question", "AttentionQuestion")
+HappyQuestion = LazySkill("question", "HappyQuestion")
+RescueTime = LazySkill("rescue_time", "RescueTime")
+SamhangSiGenerator = LazySkill("samhangsi.generator", "SamhangSiGenerator")
+Summary = LazySkill("summary", "Summary")
+TodoistManager = LazySkill("todoist", "TodoistManager")
+TogglManager = LazySkill("toggl", "TogglManager")
+TrelloManager = LazySkill("trello", "TrelloManager")
+TwitterManager = LazySkill("twitter", "TwitterManager")
+Weather = LazySkill("weather", "Weather")
 
 
 class Functions(object):
@@ -47,7 +56,7 @@ class Functions(object):
 
     def __init__(self, slackbot=None):
         self.data_handler = DataHandler()
-        self.registered = RegisteredFuctions().list
+        self.registered = SkillRegistry().list
         self.logger = Logger().get_logger()
 
         if slackbot is None:
@@ -63,10 +72,6 @@ class Functions(object):
         self._reset_data()
 
     def _reset_data(self):
-        self.data_handler.edit_cache(("feed_links", []), fname="cache_feed.json")  # NOTE: hard-code
-        self.data_handler.edit_cache(("tweet_ids", []), fname="cache_feed.json")
-
-        FeedData().reset()
         SkillData().reset()
 
     def feed_notify(self):
@@ -267,6 +272,20 @@ class Functions(object):
         jenkins = JenkinsClient()
         jenkins.build(job_name, branch)
 
+    def kino_stats(self):
+        """
+        keyword: [["kino", "stats"], ["키노", "통계"], ["latency", "stats"]]
+        description: "Latency of each stage (preprocessing, flow_check, ner, skill, send_message) - count / p50 / p90 / p99 / max (ms)"
+        icon: ":stopwatch: "
+        """
+
+        summary = Tracer().format_summary()
+        if summary == "":
+            summary = " - no traces yet."
+        self.slackbot.send_message(
+            text="*Latency* (count / p50 / p90 / p99 / max ms)\n" + summary, giphy=False
+        )
+
     def kanban_sync(self):
         """
         keyword: [["칸반", "싱크"], ["kanban", "sync"]]
@@ -484,21 +503,6 @@ class Functions(object):
         naver.translate(english, source=source, target=target)
 
 
-class RegisteredFuctions(object):
-    class __List:
-        def __init__(self):
-            self.list = DataHandler().read_file("skills.json")
-
-    instance = None
-
-    def __init__(self):
-        if not RegisteredFuctions.instance:
-            RegisteredFuctions.instance = RegisteredFuctions.__List()
-
-    def __getattr__(self, name):
-        return getattr(self.instance, name)
-
-
 class FunctionRunner(object):
     def __init__(self, text=None):
         self.input = text
@@ -516,21 +520,36 @@ class FunctionRunner(object):
         not_holiday=False,
     ):
 
-        if not_holiday and Summary().is_holiday():
-            return
+        tracer = Tracer()
+        with tracer.trace("load_function"):
+            with tracer.stage("holiday_check"):
+                if not_holiday and Summary().is_holiday():
+                    return
 
-        if not ArrowUtil.is_today_day_of_week(day_of_week):
-            return
+            if not ArrowUtil.is_today_day_of_week(day_of_week):
+                return
 
-        if not repeat:
-            self.__excute(func_name, params)
-            return schedule.CancelJob
-        elif (repeat) and (ArrowUtil.is_between(start_time, end_time)):
-            self.__excute(func_name, params)
+            if not repeat:
+                self.__excute(func_name, params)
+                return schedule.CancelJob
+            elif (repeat) and (ArrowUtil.is_between(start_time, end_time)):
+                self.__excute(func_name, params)
 
     def __excute(self, func_name, params):
         self.logger.info("load_function: " + str(func_name) + ", " + str(params))
-        getattr(Functions(), func_name)(**params)
+        with Tracer().stage("skill"):
+            self.call(func_name, params)
+
+    def call(self, func_name, params, slackbot=None):
+        metrics = Metrics()
+        try:
+            with metrics.timer("kino_skill_duration_seconds", skill=func_name):
+                result = getattr(Functions(slackbot=slackbot), func_name)(**params)
+        except BaseException:
+            metrics.inc("kino_skill_invocations_total", skill=func_name, status="error")
+            raise
+        metrics.inc("kino_skill_invocations_total", skill=func_name, status="success")
+        return result
 
     def filter_f_params(self, text, func_name):
         ner = NamedEntitiyRecognizer()
@@ -8,6 +8,8 @@ from .slack.resource import MsgResource
 from .slack.slackbot import SlackerAdapter
 
 from .utils.logger import Logger
+from .utils.member import Member
+from .utils.metrics import Metrics
 
 
 class MsgListener(object):
@@ -18,9 +20,11 @@ class MsgListener(object):
 
     def handle(self, msg: str) -> None:
         self.msg = json.loads(msg)
+        Metrics().inc("kino_rtm_events_total", type=self.msg.get("type", "unknown"))
         self.handle_message()
         self.handle_presence_change()
         self.handle_dnd_change()
+        self.handle_user_change()
 
     def handle_message(self) -> MsgRouter.message_route:
         if self.is_message():
@@ -176,4 +180,22 @@ class MsgListener(object):
         else:
             return False
 
+    def handle_user_change(self) -> None:
+        if self.is_user_change():
+            try:
+                Member().update(self.msg["user"])
+            except Exception as e:
+                self.logger.error(f"user_change Listener Error: {e}")
+                self.logger.exception("user_change")
+
+    def is_user_change(self, msg=None) -> bool:
+        if msg is None:
+            msg = self.msg
+
+        msg_type = msg.get("type", None)
+        if msg_type in ("user_change", "team_join"):
+            return True
+        else:
+            return False
+
     # TODO : user_change  ex) 'status_text': 'In a meeting'
@@ -1,18 +1,51 @@
+import hashlib
 import inspect
 import json
+import subprocess
+import sys
 
 from ..functions import Functions
-from ..utils.data_handler import DataHandler
 from ..utils.data_loader import SkillData
-from ..utils.data_loader import FeedData
+from ..utils.registry import SkillRegistry
 
+from .benchmark import PredictorBenchmark
+from .benchmark import SkillDataBenchmark
+from .benchmark import TemplateBenchmark
 
-def register_skills():
+
+def register_skills(force=False):
+    registry = SkillRegistry()
+    fingerprint = make_skills_fingerprint()
+
+    if registry.fingerprint == fingerprint and not force:
+        print(f"skills are up to date. (fingerprint: {fingerprint})")
+    else:
+        print("start register skills")
+        registry.save(fingerprint, parse_skills())
+
+    skill_dict = registry.list
+    print(f"kino-bot has **{len(skill_dict)}** skills.")
+    for k, v in skill_dict.items():
+        print(
+            f" - {v.get('icon', ':white_small_square: ')}**{k}** : {v.get('description', '')}"
+        )
+
+
+def make_skills_fingerprint():
+    """ Hash of the raw docstrings and params of the Functions methods. (cheap to
+    compute, so parse_skills runs only when a skill doc or its params change) """
+    functions = inspect.getmembers(Functions, predicate=inspect.isfunction)
+    data = json.dumps(
+        [(k, v.__doc__, list(v.__annotations__.keys())) for k, v in functions],
+        ensure_ascii=False,
+    )
+    return hashlib.md5(data.encode("utf-8")).hexdigest()
+
+
+def parse_skills():
     skills = inspect.getmembers(Functions, predicate=inspect.isfunction)
     del skills[0]  # del __init__
 
-    print("start register skills")
-
     skill_dict = {}
     try:
         for k, v in skills:
@@ -25,15 +58,7 @@ def register_skills():
             skill_dict[k] = parsed_doc
     except BaseException as e:
         print(v.__doc__)
-
-    data_handler = DataHandler()
-    data_handler.write_file("skills.json", skill_dict)
-
-    print(f"kino-bot has **{len(skill_dict)}** skills.")
-    for k, v in skill_dict.items():
-        print(
-            f" - {v.get('icon', ':white_small_square: ')}**{k}** : {v.get('description', '')}"
-        )
+    return skill_dict
 
 
 def parse_doc(doc_string):
@@ -59,5 +84,81 @@ def prepare_skill_data():
 
 
 def prepare_feed_data():
-    print("setting feed and pocket logs for Feed Classifier ...")
-    FeedData()
+    from ..skills.feed import FeedClassifier  # sklearn is imported with the skill
+
+    print("learning feed and pocket logs for Feed Classifier ...")
+    FeedClassifier()
+
+
+def replay_messages(pattern=None, synthetic=0, speed=0, skill_cost=0.0):
+    """ Benchmark the router offline with message logs or synthetic messages """
+    from .replay import MessageReplay  # imports the listener and the router
+
+    replay = MessageReplay(speed=speed, skill_cost=skill_cost)
+    if synthetic > 0:
+        events = replay.make_synthetic(synthetic)
+    else:
+        events = replay.load_logs(pattern or "log/message/*.log")
+
+    print(f"replay {len(events)} messages ...")
+    report = replay.run(events)
+    replay.print_report(report)
+    return report
+
+
+def benchmark_templates(threads=8, count=10000):
+    """ Rendering throughput of MsgResource templates, with one and many threads """
+    benchmark = TemplateBenchmark(threads=threads)
+    report = benchmark.run(count)
+    benchmark.print_report(report)
+    return report
+
+
+def benchmark_predictor(samples=400, count=1000):
+    """ predict_skill model latency: a KNN fitted per call vs the kept SkillModel """
+    benchmark = PredictorBenchmark(samples=samples)
+    report = benchmark.run(count)
+    benchmark.print_report(report)
+    return report
+
+
+def benchmark_skill_data(lines=200000):
+    """ Loading speed of a synthetic raw_data log for the Skill Predictor """
+    benchmark = SkillDataBenchmark(lines=lines)
+    report = benchmark.run()
+    benchmark.print_report(report)
+    return report
+
+
+def profile_import_time(module_name="kino", limit=20):
+    """ Summary of `python -X importtime -c 'import <module_name>'` """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module_name}"]
+    result = subprocess.run(command, stderr=subprocess.PIPE, universal_newlines=True)
+
+    import_times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():  # header
+            continue
+        import_times.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    if result.returncode != 0:
+        print(f"import {module_name} failed. (returncode: {result.returncode})")
+        error_lines = result.stderr.strip().splitlines()
+        if error_lines:
+            print(error_lines[-1])
+
+    total_us = sum(self_us for _, self_us, _ in import_times)
+    print(
+        f"import {module_name} : {total_us / 1000:.1f} ms, {len(import_times)} modules"
+    )
+
+    import_times = sorted(import_times, key=lambda x: x[2], reverse=True)
+    for name, self_us, cumulative_us in import_times[:limit]:
+        print(
+            f" - {cumulative_us / 1000:8.1f} ms (self {self_us / 1000:6.1f} ms) {name}"
+        )
+    return import_times
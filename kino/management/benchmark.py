@@ -0,0 +1,332 @@
+import os
+import random
+import re
+import string
+import tempfile
+import threading
+import time
+
+import arrow
+from dateutil import tz
+import numpy as np
+
+from ..slack.resource import MsgResource
+from ..utils.classes import Skill
+from ..utils.data_loader import LogReader
+from ..utils.data_loader import SampleRingBuffer
+from ..utils.data_loader import SkillDataLoader
+
+
+class TemplateBenchmark(object):
+    """ Render every MsgResource template from threads at once.
+    Each thread renders its own arguments, so a result with another thread's
+    argument means the arguments were shared between threads. """
+
+    def __init__(self, threads=8):
+        self.threads = threads
+
+    def make_calls(self, thread_index):
+        calls = []
+        for name, formatter in MsgResource.get_formatters().items():
+            if not formatter.has_fields:
+                calls.append((name, (), {}, None))
+            elif hasattr(formatter, "table"):
+                calls.append((name, (next(iter(formatter.table)),), {}, None))
+            else:
+                value = f"<thread-{thread_index}>"
+                kwargs = {field: value for field in self.__fields(formatter)}
+                formatters = getattr(formatter, "formatters", [formatter])
+                if not all(f.has_fields for f in formatters):
+                    value = None
+                calls.append((name, (), kwargs, value))
+        return [call for call in calls if self.__is_renderable(*call)]
+
+    def run(self, count=10000):
+        report = {"threads": self.threads, "count": count}
+        report["single"] = self.__run(1, count)
+        report["concurrent"] = self.__run(self.threads, count)
+        return report
+
+    def __run(self, threads, count):
+        errors = []
+        barrier = threading.Barrier(threads + 1)
+
+        def worker(thread_index):
+            calls = self.make_calls(thread_index)
+            barrier.wait()
+            for i in range(count):
+                name, args, kwargs, expected = calls[i % len(calls)]
+                text = MsgResource.render(name, args, kwargs)
+                if expected is not None and expected not in text:
+                    errors.append((name, text))
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for w in workers:
+            w.start()
+        barrier.wait()
+        start_time = time.perf_counter()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start_time
+
+        return {
+            "renders": threads * count,
+            "elapsed": elapsed,
+            "throughput": threads * count / elapsed if elapsed else 0,
+            "errors": len(errors),
+        }
+
+    def __is_renderable(self, name, args, kwargs, expected):
+        try:
+            MsgResource.render(name, args, kwargs)
+            return True
+        except (
+            KeyError,
+            IndexError,
+            ValueError,
+        ):  # ex. text with '{' that is not a field
+            return False
+
+    def __fields(self, formatter):
+        fields = set()
+        for text_formatter in getattr(formatter, "formatters", [formatter]):
+            try:
+                parsed = string.Formatter().parse(text_formatter.text)
+                fields.update(field for _, field, _, _ in parsed if field)
+            except ValueError:
+                pass
+        return fields
+
+    def print_report(self, report):
+        print(f"render MsgResource templates ({report['count']} renders per thread)")
+        for key in ("single", "concurrent"):
+            stats = report[key]
+            threads = 1 if key == "single" else report["threads"]
+            print(
+                f" - {threads} thread(s) : {stats['renders']} renders in "
+                f"{stats['elapsed']:.2f}s ({stats['throughput']:.0f} renders/s), "
+                f"{stats['errors']} mixed-up renders"
+            )
+
+
+class PredictorBenchmark(object):
+    """ Latency of the Skill Predictor model with synthetic samples:
+    - rebuild: a KNN fitted for every call (a new Predictor per presence event)
+    - cached: the kept SkillModel
+    - updated: a sample is added before every call, so the SkillModel is fitted again
+    """
+
+    def __init__(self, samples=400, n_neighbors=8):
+        self.samples = samples
+        self.n_neighbors = n_neighbors
+
+    def make_sample(self):
+        day_of_week = random.randint(1, 7)
+        x = np.array(
+            [
+                day_of_week,
+                random.randint(0, 23),
+                random.randint(0, 59),
+                random.randint(0, len(Skill.classes)),
+                int(day_of_week >= 6),
+            ],
+            dtype=np.int32,
+        )
+        return x, random.randrange(len(Skill.classes))
+
+    def run(self, count=1000):
+        from sklearn.neighbors import KNeighborsClassifier
+        from ..skills.predictor import SkillModel
+
+        skill_data = _SkillSamples(self.samples)
+        for _ in range(self.samples):
+            skill_data.add(*self.make_sample())
+        test_xs = [self.make_sample()[0].reshape(1, -1) for _ in range(count)]
+
+        def rebuild(test_x):
+            _, data_X, data_y = skill_data.make_data_set()
+            knn = KNeighborsClassifier(n_neighbors=self.n_neighbors, weights="distance")
+            knn.fit(data_X, data_y)
+            return knn.predict(test_x)[0], max(knn.predict_proba(test_x)[0])
+
+        model = SkillModel(n_neighbors=self.n_neighbors, skill_data=skill_data)
+
+        def update(test_x):
+            skill_data.add(*self.make_sample())
+            return model.predict(test_x)
+
+        report = {"samples": self.samples, "count": count}
+        report["rebuild"] = self.__measure(rebuild, test_xs)
+        model.predict(test_xs[0])
+        report["cached"] = self.__measure(model.predict, test_xs)
+        report["updated"] = self.__measure(update, test_xs)
+        return report
+
+    def __measure(self, predict, test_xs):
+        latencies = []
+        for test_x in test_xs:
+            start_time = time.perf_counter()
+            predict(test_x)
+            latencies.append(time.perf_counter() - start_time)
+
+        latencies.sort()
+        return {
+            "mean": sum(latencies) / len(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[int(len(latencies) * 0.95)],
+        }
+
+    def print_report(self, report):
+        print(
+            f"predict skill with {report['samples']} samples ({report['count']} calls)"
+        )
+        for key in ("rebuild", "cached", "updated"):
+            stats = report[key]
+            print(
+                f" - {key:8}: mean {stats['mean'] * 1000:.2f}ms, "
+                f"p50 {stats['p50'] * 1000:.2f}ms, p95 {stats['p95'] * 1000:.2f}ms"
+            )
+
+
+class SkillDataBenchmark(object):
+    """ Loading a synthetic raw_data log for the Skill Predictor:
+    - previous: every keyword list tested against the line and the previous line,
+      and the datetime parsed with arrow
+    - current: SkillDataLoader (one KeywordMatcher scan per line, a compiled
+      datetime pattern)
+    """
+
+    NOISE_WORDS = ["오늘", "내일", "알려줘", "hello", "kino", "please", "지금"]
+
+    def __init__(self, lines=200000, raw_input_ratio=0.7):
+        self.lines = lines
+        self.raw_input_ratio = raw_input_ratio
+
+    def make_log(self, path):
+        keywords = [k for keyword_list, _ in Skill.classes for k in keyword_list]
+        start_time = time.mktime((2015, 1, 1, 0, 0, 0, 0, 0, -1))
+        step = 3 * 365 * 24 * 60 * 60 / self.lines  # three years of logs
+
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(self.lines):
+                asctime = time.strftime(
+                    "%Y-%m-%d %H:%M:%S,000", time.localtime(start_time + i * step)
+                )
+                if random.random() < self.raw_input_ratio:
+                    words = random.sample(keywords, random.randint(0, 3))
+                    words += random.sample(self.NOISE_WORDS, 2)
+                    random.shuffle(words)
+                    message = "raw input: " + " ".join(words)
+                else:
+                    message = "From call skills - route to: send_message, {}"
+                f.write(f"[INFO|route.py:100] {asctime} > {message}\n")
+
+    def run(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "raw_data")
+            self.make_log(path)
+            report = {"lines": self.lines, "bytes": os.path.getsize(path)}
+
+            previous_samples = _SampleList()
+            report["previous"] = self.__measure(
+                lambda: self.__previous_load(path, previous_samples)
+            )
+
+            current_samples = _SampleList()
+
+            def current_load():
+                data_loader = SkillDataLoader()
+                data_loader.reader = LogReader(path)
+                data_loader.load_samples(samples=current_samples)
+
+            report["current"] = self.__measure(current_load)
+
+        report["samples"] = len(current_samples.y)
+        report["same_samples"] = (
+            previous_samples.y == current_samples.y
+            and np.array_equal(previous_samples.X, current_samples.X)
+        )
+        return report
+
+    def __measure(self, load):
+        start_time = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - start_time
+        return {
+            "elapsed": elapsed,
+            "throughput": self.lines / elapsed if elapsed else 0,
+        }
+
+    def __previous_load(self, path, samples):
+        skill_list = list(map(lambda x: x[0], Skill.classes))
+        prev_line = ""
+        for line in LogReader(path).read_lines():
+            if "raw input:" not in line:
+                continue
+
+            prev_func = len(Skill.classes)
+            for idx, keyword_list in enumerate(skill_list):
+                if all(k in prev_line for k in keyword_list):
+                    prev_func = idx
+
+            for idx, keyword_list in enumerate(skill_list):
+                if all(k in line for k in keyword_list):
+                    r = re.findall(r"\d+-\d+-\d+ \d+:\d+", line)
+                    if len(r) == 0:
+                        continue
+
+                    t = arrow.get(r[0], tzinfo=tz.tzlocal())
+                    day_of_week = t.isoweekday()
+                    x = np.array(
+                        [
+                            day_of_week,
+                            int(t.format("HH")),
+                            int(t.format("mm")),
+                            prev_func,
+                            int(day_of_week >= 6),
+                        ],
+                        dtype=np.int32,
+                    )
+                    samples.append(x, idx)
+            prev_line = line
+
+    def print_report(self, report):
+        print(
+            f"load raw_data for the Skill Predictor ({report['lines']} lines, "
+            f"{report['bytes'] / 1024 / 1024:.1f}MB, {report['samples']} samples)"
+        )
+        for key in ("previous", "current"):
+            stats = report[key]
+            print(
+                f" - {key:8}: {stats['elapsed']:.2f}s "
+                f"({stats['throughput']:.0f} lines/s)"
+            )
+        print(f" - same samples: {report['same_samples']}")
+
+
+class _SampleList(object):
+    """ Every sample, in a list (for comparing the loaders) """
+
+    def __init__(self):
+        self.X = []
+        self.y = []
+
+    def append(self, x, y):
+        self.X.append(x)
+        self.y.append(y)
+
+
+class _SkillSamples(object):
+    """ In-memory SkillData for the benchmark """
+
+    def __init__(self, max_size):
+        self.samples = SampleRingBuffer(max_size, SkillDataLoader.N_FEATURES)
+        self.version = 0
+
+    def add(self, x, y):
+        self.samples.append(x, y)
+        self.version += 1
+
+    def make_data_set(self):
+        data_X, data_y = self.samples.make_data_set()
+        return self.version, data_X, data_y
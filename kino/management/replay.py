@@ -0,0 +1,256 @@
+import collections
+import contextlib
+import datetime
+import glob
+import json
+import logging
+import os
+import random
+import time
+
+from hbconfig import Config
+
+from ..functions import Functions
+from ..listener import MsgListener
+from ..slack import slackbot
+from ..utils.data_handler import DataHandler
+from ..utils.registry import SkillRegistry
+from ..utils.tracer import Tracer
+
+
+@contextlib.contextmanager
+def replace_attr(obj, name, value):
+    """ Set obj.name to value, and put the original back after the context """
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+
+@contextlib.contextmanager
+def keep_data_files(data_path):
+    """ Put every file under data_path back as it was after the context.
+    (files written by the flows are restored, and new files are removed) """
+    snapshot = {}
+    for root, _, fnames in os.walk(data_path):
+        for fname in fnames:
+            path = os.path.join(root, fname)
+            with open(path, "rb") as infile:
+                snapshot[path] = infile.read()
+    try:
+        yield
+    finally:
+        for root, _, fnames in os.walk(data_path):
+            for fname in fnames:
+                path = os.path.join(root, fname)
+                if path not in snapshot:
+                    os.remove(path)
+        for path, data in snapshot.items():
+            with open(path, "wb") as outfile:
+                outfile.write(data)
+
+
+class FakeResponse(object):
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeAPI(object):
+    def __init__(self, transport, name, responses):
+        self.transport = transport
+        self.name = name
+        self.responses = responses
+
+    def __getattr__(self, method):
+        body = self.responses.get(method, {"ok": True})
+
+        def call(*args, **kwargs):
+            self.transport.calls[f"{self.name}.{method}"] += 1
+            return FakeResponse(body)
+
+        return call
+
+
+class FakeSlacker(object):
+    """ Slack transport for replay. Web API calls are answered locally. """
+
+    calls = None
+
+    BOT_ID = "B0REPLAY"
+
+    def __init__(self, token=None):
+        # the bot (found by get_bot_id) and the user of the replayed messages
+        members = [
+            {"id": self.BOT_ID, "name": Config.bot.BOT_NAME.lower()},
+            {"id": "U0REPLAY", "name": "replay", "profile": {"real_name": "replay"}},
+        ]
+
+        self.chat = FakeAPI(
+            self, "chat", {"post_message": {"ok": True, "ts": "0", "channel": "C0"}}
+        )
+        self.files = FakeAPI(self, "files", {})
+        self.rtm = FakeAPI(self, "rtm", {"start": {"url": ""}})
+        self.users = FakeAPI(
+            self,
+            "users",
+            {"list": {"members": members}, "get_presence": {"presence": "active"}},
+        )
+
+
+class MessageReplay(object):
+    """ Feed message logs (or synthetic traffic) through MsgListener.handle
+    with a fake Slack transport and stubbed skills.
+    The files in the data directory are restored after the replay.
+    """
+
+    def __init__(self, speed=0, skill_cost=0.0):
+        self.speed = speed  # 0: as fast as possible, N: N times faster than logged
+        self.skill_cost = skill_cost  # Unit (Second), sleep of each stubbed skill
+
+        self.skill_calls = []
+
+    def load_logs(self, pattern="log/message/*.log"):
+        events = []
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as infile:
+                for line in infile:
+                    if " > " not in line:
+                        continue
+
+                    asctime, message = line.split(" > ", 1)
+                    try:
+                        timestamp = datetime.datetime.strptime(
+                            asctime, "%Y-%m-%d %H:%M:%S,%f"
+                        ).timestamp()
+                        message = json.loads(message)
+                    except ValueError:
+                        continue
+
+                    if message.get("text", None) is None:
+                        continue
+                    event = self.make_event(
+                        channel=message.get("channel", None) or "D0REPLAY",
+                        user=message.get("user", None) or "U0REPLAY",
+                        text=message["text"],
+                    )
+                    events.append((timestamp, event))
+        return events
+
+    def make_synthetic(self, count, interval=1.0):
+        keywords = [k for k in SkillRegistry().keywords.values() if k]
+
+        events = []
+        for i in range(count):
+            keyword = random.choice(random.choice(keywords))
+            if isinstance(keyword, list):
+                keyword = " ".join(keyword)
+            events.append((i * interval, self.make_event(text=keyword)))
+        return events
+
+    def make_event(self, channel="D0REPLAY", user="U0REPLAY", text=""):
+        return {"type": "message", "channel": channel, "user": user, "text": text}
+
+    def run(self, events):
+        FakeSlacker.calls = collections.Counter()
+        Tracer().reset()
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(keep_data_files(DataHandler().data_path))
+            stack.enter_context(replace_attr(slackbot, "Slacker", FakeSlacker))
+            stack.enter_context(
+                replace_attr(slackbot.GiphyClient, "search_urls", lambda s, q: [])
+            )
+            for skill_name in SkillRegistry().list:
+                if hasattr(Functions, skill_name):
+                    stub = self.__make_stub(skill_name)
+                    stack.enter_context(replace_attr(Functions, skill_name, stub))
+            return self.__run(events)
+
+    def __run(self, events):
+        listener = MsgListener()
+        listener.router.msg_logger = logging.getLogger("replay")
+        listener.router.msg_logger.disabled = True
+
+        latencies = []
+        skill_latencies = {}
+
+        start_time = time.perf_counter()
+        prev_timestamp = None
+        for timestamp, event in events:
+            if self.speed and prev_timestamp is not None:
+                time.sleep(max(0, timestamp - prev_timestamp) / self.speed)
+            prev_timestamp = timestamp
+
+            del self.skill_calls[:]
+            event_start_time = time.perf_counter()
+            listener.handle(json.dumps(event))
+            latency = time.perf_counter() - event_start_time
+
+            latencies.append(latency)
+            skill_name = self.skill_calls[0] if self.skill_calls else "(no skill)"
+            skill_latencies.setdefault(skill_name, []).append(latency)
+        elapsed = time.perf_counter() - start_time
+
+        return {
+            "count": len(latencies),
+            "elapsed": elapsed,
+            "throughput": len(latencies) / elapsed if elapsed else 0,
+            "latency": self.__percentiles(latencies),
+            "skills": {k: self.__percentiles(v) for k, v in skill_latencies.items()},
+            "slack_api_calls": dict(FakeSlacker.calls),
+            "stages": Tracer().summary(),
+        }
+
+    def __make_stub(self, skill_name):
+        replay = self
+
+        def stub(self, *args, **kwargs):
+            replay.skill_calls.append(skill_name)
+            if replay.skill_cost:
+                time.sleep(replay.skill_cost)
+            self.slackbot.send_message(text=f"[replay] {skill_name}", giphy=False)
+
+        return stub
+
+    def __percentiles(self, values):
+        values = sorted(values)
+        if not values:
+            return {"count": 0}
+
+        stats = {"count": len(values)}
+        for p in (50, 90, 99):
+            rank = max(0, int(round(p / 100 * len(values))) - 1)
+            stats[f"p{p}"] = values[rank] * 1000
+        stats["mean"] = sum(values) / len(values) * 1000
+        stats["max"] = values[-1] * 1000
+        return stats
+
+    def print_report(self, report):
+        def format_stats(stats):
+            if stats["count"] == 0:
+                return "0"
+            return (
+                f"{stats['count']} / {stats['mean']:.1f} / {stats['p50']:.1f} / "
+                f"{stats['p90']:.1f} / {stats['p99']:.1f} / {stats['max']:.1f}"
+            )
+
+        print(
+            f"replayed {report['count']} messages in {report['elapsed']:.2f}s "
+            f"({report['throughput']:.1f} msg/s)"
+        )
+        print("latency (count / mean / p50 / p90 / p99 / max ms)")
+        print(f" - total : {format_stats(report['latency'])}")
+        for skill_name, stats in sorted(report["skills"].items()):
+            print(f" - {skill_name} : {format_stats(stats)}")
+
+        print("stages (count / p50 / p90 / p99 / max ms)")
+        for key, stats in report["stages"].items():
+            print(
+                f" - {key} : {stats['count']} / {stats['p50']:.1f} / "
+                f"{stats['p90']:.1f} / {stats['p99']:.1f} / {stats['max']:.1f}"
+            )
+
+        print("slack api calls")
+        for method, count in sorted(report["slack_api_calls"].items()):
+            print(f" - {method} : {count}")
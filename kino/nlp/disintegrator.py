@@ -1,14 +1,6 @@
 import re
 import string
 
-from konlpy.tag import Twitter
-
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.corpus import wordnet
-from nltk.stem.wordnet import WordNetLemmatizer
-
 from .lang_code import LangCode
 
 
@@ -35,6 +27,9 @@ class Disintegrator:
 
 class KorDisintegrator:
     def __init__(self):
+        # konlpy boots a JVM (JPype). import it on demand, not at kino startup.
+        from konlpy.tag import Twitter
+
         self.ko_twitter = Twitter()
 
     def convert2simple(self, sentence="", norm=True, stem=True):
@@ -49,11 +44,22 @@ class KorDisintegrator:
 
 class EngDisintegrator:
     def __init__(self):
+        # nltk is also imported on demand.
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.corpus import wordnet
+        from nltk.stem.wordnet import WordNetLemmatizer
+        from nltk.tokenize import word_tokenize
+
+        self.nltk = nltk
+        self.wordnet = wordnet
+        self.word_tokenize = word_tokenize
+
         self.stopwords = set(stopwords.words("english"))
         self.lemmatizer = WordNetLemmatizer()
 
     def convert2simple(self, sentence=""):
-        tokenized = word_tokenize(sentence)
+        tokenized = self.word_tokenize(sentence)
         tokenized = self.__filter_punctuation(tokenized)
         tokenized = self.__filter_stopwords(tokenized)
         return " ".join(self.__lemmatize(tokenized))
@@ -74,7 +80,7 @@ class EngDisintegrator:
 
     def __lemmatize(self, tokenized):
         lemmatized_tokens = []
-        for tag in nltk.pos_tag(tokenized):
+        for tag in self.nltk.pos_tag(tokenized):
             lemmatized_tokens.append(
                 self.lemmatizer.lemmatize(tag[0], self.__get_wordnet_pos(tag[1]))
             )
@@ -83,12 +89,12 @@ class EngDisintegrator:
     def __get_wordnet_pos(self, treebank_tag):
 
         if treebank_tag.startswith("J"):
-            return wordnet.ADJ
+            return self.wordnet.ADJ
         elif treebank_tag.startswith("V"):
-            return wordnet.VERB
+            return self.wordnet.VERB
         elif treebank_tag.startswith("N"):
-            return wordnet.NOUN
+            return self.wordnet.NOUN
         elif treebank_tag.startswith("R"):
-            return wordnet.ADV
+            return self.wordnet.ADV
         else:
             return ""
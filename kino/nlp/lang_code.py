@@ -1,11 +1,20 @@
+import functools
 import re
 
 from hbconfig import Config
 import langid
 
+from ..utils.metrics import Metrics
+
 
 class LangCode:
 
+    CACHE_SIZE = 1024
+    HANGUL_RATIO = 0.5
+
+    HANGUL_PATTERN = re.compile("[ㄱ-ㅣ가-힣]")
+    LETTER_PATTERN = re.compile(r"[^\W\d_]")
+
     @staticmethod
     def classify(text):
         default_lang_code = Config.bot.get("LANG_CODE", "ko")
@@ -16,5 +25,35 @@ class LangCode:
         if cleaned_text == "":
             lang_code = default_lang_code
         else:
-            lang_code = langid.classify(cleaned_text)[0]
+            lang_code = LangCode.cached_classify(cleaned_text)
         return lang_code
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def cached_classify(text):
+        lang_code = LangCode.guess_by_script(text)
+        if lang_code is None:
+            lang_code = langid.classify(text)[0]
+        return lang_code
+
+    @staticmethod
+    def guess_by_script(text):
+        """ Fast-path for obvious Korean text, None when langid is needed.
+        (ASCII letters are not enough for 'en', ex. 'hola que tal') """
+        letter_count = len(LangCode.LETTER_PATTERN.findall(text))
+        if letter_count == 0:
+            return None
+
+        hangul_count = len(LangCode.HANGUL_PATTERN.findall(text))
+        if hangul_count / letter_count >= LangCode.HANGUL_RATIO:
+            return "ko"
+        return None
+
+    @staticmethod
+    def collect_metrics(metrics):
+        cache_info = LangCode.cached_classify.cache_info()
+        metrics.set("kino_cache_hits_total", cache_info.hits, cache="lang_code")
+        metrics.set("kino_cache_misses_total", cache_info.misses, cache="lang_code")
+
+
+Metrics().register_collector(LangCode.collect_metrics)
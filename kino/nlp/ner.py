@@ -3,6 +3,7 @@
 import re
 
 from ..utils.data_handler import DataHandler
+from ..utils.registry import SkillRegistry
 
 
 class NamedEntitiyRecognizer(object):
@@ -15,10 +16,22 @@ class NamedEntitiyRecognizer(object):
 
             self.ner = self.data_handler.read_file("ner.json")
             self.kino = self.ner["kino"]
+            self.kino_keywords = {k: v["keyword"] for k, v in self.kino.items()}
             self.schedule = self.ner["schedule"]
-            self.skills = self.data_handler.read_file("skills.json")
             self.params = self.ner["params"]
 
+        @property
+        def skills(self):
+            return SkillRegistry().list
+
+        @property
+        def skill_keywords(self):
+            return SkillRegistry().keywords
+
+        def parse_skill(self, text):
+            """ parse(skill_keywords, text) with the compiled keywords """
+            return SkillRegistry().match(text)
+
         def parse(self, item, text, get_all=False):
 
             ner_list = []
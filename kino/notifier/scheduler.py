@@ -7,14 +7,13 @@ from .skill_list import SkillList
 
 from .between import Between
 
-from ..functions import RegisteredFuctions
-
 from ..slack.resource import MsgResource
 from ..slack.slackbot import SlackerAdapter
 from ..slack.template import MsgTemplate
 
 from ..utils.arrow import ArrowUtil
 from ..utils.data_handler import DataHandler
+from ..utils.registry import SkillRegistry
 from ..utils.state import State
 
 
@@ -197,7 +196,7 @@ class Scheduler(object):
 
     def __alarm_in_between(self, between, a_index, alarm_data, repeat=False):
         f_name = alarm_data["f_name"]
-        f_detail = RegisteredFuctions().list[f_name]
+        f_detail = SkillRegistry().list[f_name]
 
         if repeat:
             key = "Alarm " + a_index + " (repeat: " + alarm_data["period"] + ")"
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from ..functions import RegisteredFuctions
-
 from ..slack.slackbot import SlackerAdapter
 from ..slack.template import MsgTemplate
 
+from ..utils.registry import SkillRegistry
+
 
 class SkillList(object):
     def __init__(self, text=None, slackbot=None):
@@ -14,5 +14,5 @@ class SkillList(object):
             self.slackbot = slackbot
 
     def read(self):
-        attachments = MsgTemplate.make_skill_template("", RegisteredFuctions().list)
+        attachments = MsgTemplate.make_skill_template("", SkillRegistry().list)
         self.slackbot.send_message(attachments=attachments)
@@ -4,8 +4,10 @@ import random
 
 from hbconfig import Config
 
+from .functions import AttentionQuestion
 from .functions import Functions
 from .functions import FunctionRunner
+from .functions import HappyQuestion
 from .webhook import Webhook
 
 from .dialog.dialog_manager import DialogManager
@@ -25,14 +27,12 @@ from .bot.worker import Worker
 from .slack.resource import MsgResource
 from .slack.slackbot import SlackerAdapter
 
-from .skills.question import AttentionQuestion
-from .skills.question import HappyQuestion
-
 from .utils.data_loader import SkillDataLoader
 from .utils.data_loader import SkillData
 from .utils.logger import Logger
 from .utils.logger import MessageLogger
 from .utils.state import State
+from .utils.tracer import Tracer
 
 
 class MsgRouter:
@@ -45,15 +45,21 @@ class MsgRouter:
         self.dnd_manager = DoNotDisturbManager()
 
         self.f_runner = FunctionRunner()
+        self.tracer = Tracer()
 
     def presence_route(self, user: str = None, presence: str = None):
         """ Check Presence (Slack Users active/away)"""
-        self.presence_manager.check_wake_up(presence)
-        self.presence_manager.check_flow(presence)
-        self.presence_manager.check_predictor(presence)
-
-        State().presence_log(user, presence)
-        self.logger.info(f"user: {user} presence: {presence}")
+        with self.tracer.trace("presence"):
+            with self.tracer.stage("wake_up"):
+                self.presence_manager.check_wake_up(presence)
+            with self.tracer.stage("flow_check"):
+                self.presence_manager.check_flow(presence)
+            with self.tracer.stage("predictor"):
+                self.presence_manager.check_predictor(presence)
+
+            with self.tracer.stage("state"):
+                State().presence_log(user, presence)
+            self.logger.info(f"user: {user} presence: {presence}")
 
     def __on_flow(self):
         flow_classes = self.__make_flow_classes()
@@ -97,17 +103,25 @@ class MsgRouter:
     ):
         """ Check Message"""
 
-        if text is not None:
-            self.msg_logger.info(
-                json.dumps({"channel": channel, "user": user, "text": text})
+        with self.tracer.trace("message"):
+            self.__route_message(
+                text=text, user=user, channel=channel, direct=direct, webhook=webhook
             )
-            self.preprocessing(text)
+
+    def __route_message(self, text, user, channel, direct, webhook):
+        if text is not None:
+            with self.tracer.stage("preprocessing"):
+                self.msg_logger.info(
+                    json.dumps({"channel": channel, "user": user, "text": text})
+                )
+                self.preprocessing(text)
 
         if Config.bot.ONLY_DIRECT is True and direct is False:
             # Skip
             return
 
-        self.slackbot = SlackerAdapter(channel=channel, input_text=text, user=user)
+        with self.tracer.stage("preprocessing"):
+            self.slackbot = SlackerAdapter(channel=channel, input_text=text, user=user)
 
         ner = NamedEntitiyRecognizer()
 
@@ -117,8 +131,11 @@ class MsgRouter:
             return
 
         # Check Flow
-        if self.dialog_manager.is_on_flow():
-            self.__on_flow()
+        with self.tracer.stage("flow_check"):
+            is_on_flow = self.dialog_manager.is_on_flow()
+        if is_on_flow:
+            with self.tracer.stage("skill"):
+                self.__on_flow()
             return
 
         # Check - help
@@ -127,23 +144,27 @@ class MsgRouter:
             return
 
         # Check - CRUD (Worker, Schedule, Between, FunctionManager)
-        kino_keywords = {k: v["keyword"] for k, v in ner.kino.items()}
-        classname = ner.parse(kino_keywords, self.parsed_text)
+        with self.tracer.stage("ner"):
+            classname = ner.parse(ner.kino_keywords, self.parsed_text)
 
         if classname is not None:
-            self.__call_CRUD(ner, classname)
+            with self.tracer.stage("skill"):
+                self.__call_CRUD(ner, classname)
             return
 
         # Check - skills
-        skill_keywords = {k: v["keyword"] for k, v in ner.skills.items()}
-        func_name = ner.parse(skill_keywords, self.parsed_text)
+        with self.tracer.stage("ner"):
+            func_name = ner.parse_skill(self.parsed_text)
         if func_name is not None:
             self.__call_skills(func_name)
-            self.__memory_predictor_skills()
+            with self.tracer.stage("predictor"):
+                self.__memory_predictor_skills()
             return
 
         # Check Memory
-        if self.check_memory_skill():
+        with self.tracer.stage("skill"):
+            is_memory_skill = self.check_memory_skill()
+        if is_memory_skill:
             return
 
         self.logger.info("not understanding")
@@ -219,22 +240,24 @@ class MsgRouter:
         }
 
     def __call_skills(self, func_name: str):
-        if self.dialog_manager.is_toggl_timer(func_name):
-            f_params = {"description": self.text[self.text.index("toggl") + 5 :]}
-        else:
-            f_params = self.f_runner.filter_f_params(self.parsed_text, func_name)
-
-        state = State()
-        state.memory_skill(self.text, func_name, f_params)
+        with self.tracer.stage("ner"):
+            if self.dialog_manager.is_toggl_timer(func_name):
+                f_params = {"description": self.text[self.text.index("toggl") + 5 :]}
+            else:
+                f_params = self.f_runner.filter_f_params(self.parsed_text, func_name)
+
+        with self.tracer.stage("state"):
+            state = State()
+            state.memory_skill(self.text, func_name, f_params)
         self.logger.info(
             "From call skills - route to: " + func_name + ", " + str(f_params)
         )
-        getattr(Functions(slackbot=self.slackbot), func_name)(**f_params)
+        with self.tracer.stage("skill"):
+            self.f_runner.call(func_name, f_params, slackbot=self.slackbot)
 
     def __memory_predictor_skills(self):
         data_loader = SkillDataLoader()
         X = data_loader.make_X()[0]
         y = data_loader.make_y(self.text)
         if y is not None:
-            skill_data = SkillData()
-            skill_data.q.put_nowait((X, y))
+            SkillData().add(X, y)
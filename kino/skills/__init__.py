@@ -1 +1,33 @@
 # -*- coding: utf-8 -*-
+
+import importlib
+
+
+class LazySkill(object):
+    """ Proxy of a skill class. The skill module is imported on first use. """
+
+    def __init__(self, module_name, class_name):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.skill = None
+
+    def load(self):
+        if self.skill is None:
+            module = importlib.import_module("." + self.module_name, package=__name__)
+            self.skill = getattr(module, self.class_name)
+        return self.skill
+
+    @property
+    def is_loaded(self):
+        return self.skill is not None
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return (
+            f"<LazySkill {self.module_name}.{self.class_name} loaded={self.is_loaded}>"
+        )
@@ -1,11 +1,19 @@
 import arrow
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import re
 import feedparser
 import json
+import os
+import pickle
+import requests
+import threading
 import time
+from urllib.parse import urlparse
 
 from hbconfig import Config
-from sklearn import tree
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
 
 from .pocket import Pocket
 
@@ -14,15 +22,23 @@ from ..slack.slackbot import SlackerAdapter
 from ..slack.template import MsgTemplate
 
 from ..utils.data_handler import DataHandler
-from ..utils.data_loader import FeedData
 from ..utils.data_loader import FeedDataLoader
 from ..utils.logger import Logger
 from ..utils.logger import DataLogger
+from ..utils.metrics import Metrics
+from ..utils.seen_store import SeenStore
 
 
 class FeedNotifier:
 
-    MAX_KEEP = 40
+    CACHE_FILE_NAME = "cache_feed.json"
+
+    FETCH_WORKERS = 8
+    MAX_FETCH_PER_HOST = 2
+    FETCH_TIMEOUT = 10  # Unit (Second)
+
+    SEEN_MAX_SIZE = 200000
+    SEEN_MAX_AGE = 180 * 24 * 60 * 60  # Unit (Second)
 
     def __init__(self, slackbot: SlackerAdapter = None) -> None:
         self.logger = Logger().get_logger()
@@ -30,6 +46,9 @@ class FeedNotifier:
 
         self.data_handler = DataHandler()
         self.feeds = self.data_handler.read_feeds()
+        self.seen_links = SeenStore(
+            "feed_links", max_size=self.SEEN_MAX_SIZE, max_age=self.SEEN_MAX_AGE
+        )
         self.feed_classifier = None
         if Config.bot.get("FEED_CLASSIFIER", False):
             self.feed_classifier = FeedClassifier()
@@ -43,21 +62,174 @@ class FeedNotifier:
 
     def notify_all(self) -> None:
         self.logger.info("Check feed_list")
-        for category, feeds in self.feeds.items():
-            for feed in feeds:
+        feeds = [
+            (category, feed) for category, feeds in self.feeds.items() for feed in feeds
+        ]
+
+        # Loaded once, updated in memory by every feed and written once
+        cache_data = self.data_handler.read_cache(fname=self.CACHE_FILE_NAME)
+        http_cache = cache_data.get(
+            "http_cache", {}
+        )  # feed_url -> {etag, modified, bytes} of the last downloaded response
+
+        # Fetch concurrently, then notify in the order of the feed list
+        fetched_feeds = self.fetch_all(
+            [feed_url for _, (_, feed_url, _) in feeds], http_cache=http_cache
+        )
+
+        downloaded_bytes, saved_bytes, not_modified_count = 0, 0, 0
+        try:
+            processed_feeds = []  # (category, feed, results, validators)
+            for (category, feed), (f, error) in zip(feeds, fetched_feeds):
+                feed_url = feed[1]
                 try:
-                    results = self.get_notify_list(category, feed)
-                    self.notify(category, feed, results)
+                    if error is not None:
+                        raise error
+
+                    validators = None
+                    if f.get("status", None) == 304:  # Not Modified, skip parsing
+                        not_modified_count += 1
+                        saved_bytes += http_cache.get(feed_url, {}).get("bytes", 0)
+                        results = []
+                    else:
+                        downloaded_bytes += f.get("bytes", 0)
+                        if f.get("etag", None) or f.get("modified", None):
+                            validators = {
+                                "etag": f.get("etag", None),
+                                "modified": f.get("modified", None),
+                                "bytes": f.get("bytes", 0),
+                            }
+                        results = self.get_notify_list(
+                            category, feed, f=f, cache_data=cache_data
+                        )
+                    processed_feeds.append((category, feed, results, validators))
                 except Exception as e:
                     self.logger.error(f"FEED Error: {e}")
                     self.logger.exception("feed")
 
-    def get_notify_list(self, category: str, feed: tuple) -> list:
-        CACHE_FILE_NAME = "cache_feed.json"
-        cache_data = self.data_handler.read_cache(fname=CACHE_FILE_NAME)
+            # The entries of every feed are scored once per run
+            predictions = self.predict(
+                [r for _, _, results, _ in processed_feeds for r in results]
+            )
+
+            offset = 0
+            for category, feed, results, validators in processed_feeds:
+                feed_predictions = predictions[offset : offset + len(results)]
+                offset += len(results)
+                try:
+                    self.notify(category, feed, results, predictions=feed_predictions)
+                except Exception as e:
+                    self.logger.error(f"FEED Error: {e}")
+                    self.logger.exception("feed")
+                    continue
+
+                # after notify, a failed feed is downloaded again (not a 304)
+                if validators is not None:
+                    http_cache[feed[1]] = validators
+        finally:
+            cache_data["http_cache"] = http_cache
+            self.data_handler.write_file(self.CACHE_FILE_NAME, cache_data)
+            self.seen_links.save()
+            if self.feed_classifier is not None:
+                self.feed_classifier.save_state()  # titles saved to Pocket
+
+        metrics = Metrics()
+        metrics.inc("kino_feed_bytes_total", downloaded_bytes, kind="downloaded")
+        metrics.inc("kino_feed_bytes_total", saved_bytes, kind="saved")
+        self.logger.info(
+            f"feed run: {len(feeds)} feeds, {not_modified_count} not modified, "
+            f"{downloaded_bytes} bytes downloaded, {saved_bytes} bytes saved"
+        )
 
+    def fetch_all(self, feed_urls: list, http_cache: dict = None) -> list:
+        """ [(parsed feed, None) or (None, exception)] in the order of feed_urls """
+        if http_cache is None:
+            http_cache = {}
+
+        host_semaphores = {
+            urlparse(feed_url).netloc: threading.Semaphore(self.MAX_FETCH_PER_HOST)
+            for feed_url in feed_urls
+        }
+
+        def fetch(feed_url):
+            start_time = time.perf_counter()
+            wait_time = 0
+            try:
+                with host_semaphores[urlparse(feed_url).netloc]:
+                    wait_time = time.perf_counter() - start_time
+                    validators = http_cache.get(feed_url, {})
+                    f = self.fetch(
+                        feed_url,
+                        etag=validators.get("etag", None),
+                        modified=validators.get("modified", None),
+                    )
+                    result = (f, None)
+            except Exception as e:
+                result = (None, e)
+
+            elapsed = time.perf_counter() - start_time
+            if result[1] is not None:
+                status = f"error ({result[1]})"
+            else:
+                status = result[0].get("status", "ok")
+            self.logger.info(
+                f"fetch feed {feed_url}: {elapsed:.2f}s (wait {wait_time:.2f}s) {status}"
+            )
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as executor:
+            return list(executor.map(fetch, feed_urls))
+
+    def fetch(
+        self, feed_url: str, etag: str = None, modified: str = None
+    ) -> feedparser.FeedParserDict:
+        """ Conditional GET with the etag/modified of the last response,
+        like feedparser.parse(feed_url, etag=etag, modified=modified).
+        (status 304: not modified, no entries) """
+        if not feed_url.startswith("http"):
+            return feedparser.parse(feed_url)
+
+        headers = {"User-Agent": feedparser.USER_AGENT}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+        response = requests.get(feed_url, headers=headers, timeout=self.FETCH_TIMEOUT)
+        if response.status_code == 304:
+            return feedparser.FeedParserDict(
+                status=304, entries=[], etag=etag, modified=modified, bytes=0
+            )
+        response.raise_for_status()
+
+        f = feedparser.parse(response.content, response_headers=response.headers)
+        f["status"] = response.status_code
+        f["etag"] = response.headers.get("ETag", None)
+        f["modified"] = response.headers.get("Last-Modified", None)
+        f["bytes"] = len(response.content)
+        return f
+
+    def get_notify_list(
+        self,
+        category: str,
+        feed: tuple,
+        f: feedparser.FeedParserDict = None,
+        cache_data: dict = None,
+    ) -> list:
+        """ cache_data: cache_feed.json loaded by the caller, updated in memory.
+        (read and written here when it is not given) """
+        if cache_data is None:
+            cache_data = self.data_handler.read_cache(fname=self.CACHE_FILE_NAME)
+            try:
+                return self.get_notify_list(category, feed, f=f, cache_data=cache_data)
+            finally:
+                self.data_handler.write_file(self.CACHE_FILE_NAME, cache_data)
+                self.seen_links.save()
+
+        is_empty_cache = len(cache_data) == 0
         feed_name, feed_url, save_pocket = feed
-        f = feedparser.parse(feed_url)
+        if f is None:
+            f = self.fetch(feed_url)
 
         def get_timestamp(x):
             update_time = x.get("updated_parsed", arrow.now().timestamp)
@@ -93,22 +265,21 @@ class FeedNotifier:
         if f.entries:
             last_e = f.entries[0]
             last_updated_date = arrow.get(last_e.get("updated_parsed", None))
-            self.data_handler.edit_cache((feed_url, str(last_updated_date)), fname=CACHE_FILE_NAME)
+            cache_data[feed_url] = str(last_updated_date)
+
+        # links kept in the cache file before the seen store
+        for entry_link in cache_data.pop("feed_links", []):
+            self.seen_links.add(entry_link)
 
         # filter feeded entry link
-        cache_entry_links = set(cache_data.get("feed_links", []))
-        noti_list = list(filter(lambda e: e[1] not in cache_entry_links, noti_list))
+        noti_list = list(filter(lambda e: e[1] not in self.seen_links, noti_list))
 
         # Cache entry link
         for entry in noti_list:
             _, entry_link, _ = entry
-            cache_entry_links.add(entry_link)
-
-        self.data_handler.edit_cache(
-            ("feed_links", list(cache_entry_links)[-self.MAX_KEEP :]), fname=CACHE_FILE_NAME
-        )
+            self.seen_links.add(entry_link)
 
-        if len(cache_data) == 0:  # cache_data is Empty. (Error)
+        if is_empty_cache:  # cache_data is Empty. (Error)
             return []
 
         # Append 'save_pocket' flags
@@ -129,18 +300,33 @@ class FeedNotifier:
         text = re.sub(entry_link, "", text)
         return text
 
-    def notify(self, category: str, feed: tuple, results: list):
+    def predict(self, results: list) -> list:
+        """ Classifier predictions of the results (get_notify_list), in one call """
+        if self.feed_classifier is None:
+            return [False] * len(results)
+        return self.feed_classifier.predict(
+            [self.__parse_result(parsed_feed)[:2] for parsed_feed, _ in results]
+        )
+
+    def __parse_result(self, parsed_feed: tuple) -> tuple:
+        """ (category, title, link) of an entry tuple """
+        feed_header = parsed_feed[0].split("\n")
+        return feed_header[0], feed_header[1], parsed_feed[1]
+
+    def notify(
+        self, category: str, feed: tuple, results: list, predictions: list = None
+    ):
+        """ predictions: of the results, scored here when they are not given """
         if len(results) == 0:
             feed_name = feed[0]
             self.slackbot.send_message(text=MsgResource.FEED_NO_NEW_POST(feed_name=feed_name))
             return
 
-        for (parsed_feed, save_pocket) in results:
-            feed_header = parsed_feed[0].split("\n")
+        if predictions is None:
+            predictions = self.predict(results)
 
-            category = feed_header[0]
-            title = feed_header[1]
-            link = parsed_feed[1]
+        for (parsed_feed, save_pocket), predict_result in zip(results, predictions):
+            category, title, link = self.__parse_result(parsed_feed)
 
             # Depense
             if not link.startswith("http"):
@@ -148,8 +334,10 @@ class FeedNotifier:
 
             self.feed_logger.info(json.dumps({"category": category, "title": title}))
 
-            if self.feed_classifier is not None and self.feed_classifier.predict(
-                link, category, force=save_pocket
+            if (
+                self.feed_classifier is not None
+                and (save_pocket or predict_result)
+                and self.feed_classifier.save_to_pocket(category, title, link)
             ):
                 self.slackbot.send_message(
                     text=MsgResource.PREDICT_FEED_TRUE(title=category + ": " + title)
@@ -161,45 +349,174 @@ class FeedNotifier:
 
 
 class FeedClassifier:
-    def __init__(self):
-        self.logger = Logger().get_logger()
+    """ Online classifier of feed entries that will be saved to Pocket.
 
-        train_X = FeedData().train_X
-        train_y = FeedData().train_y
-        self.category_ids = FeedData().category_ids
+    Hashed words of the title and the category are the features of a linear model,
+    trained with partial_fit on the feed.log / pocket.log lines added since the last
+    update. (kept in data/feed_classifier.pkl, with the byte offsets of the logs)
+    """
 
-        self.clf = tree.DecisionTreeClassifier()
-        self.clf = self.clf.fit(train_X, train_y)
+    MODEL_FILE_NAME = "feed_classifier.pkl"
 
-    def predict(self, link, category, force=False):
-        category_id = self.category_ids.get(category.strip(), None)
-        if category_id is None:
-            return False
+    N_FEATURES = 2 ** 18
+    MAX_RECENT_TITLES = 5000  # feed entries that a late pocket log line can label
+    CHUNK_SIZE = 10000  # log lines learned with one partial_fit
+    THRESHOLD = 0.5
+
+    def __init__(self):
+        self.logger = Logger().get_logger()
+        self.data_handler = DataHandler()
+        self.data_loader = FeedDataLoader()
 
-        if force is True:
-            save_result = self.save_to_pocket(category, link)
-            return save_result
+        self.vectorizer = HashingVectorizer(
+            n_features=self.N_FEATURES, ngram_range=(1, 2), alternate_sign=False
+        )
+        self.state = self.load_state()
+        self.update()
 
-        return False
+    def load_state(self):
+        path = self.data_handler.data_path + self.MODEL_FILE_NAME
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception:  # ex. a pickle of an older scikit-learn
+            self.logger.exception(f"can not load {path}")
+
+        # modified_huber has predict_proba, and the name is the same on every version
+        return {
+            "clf": SGDClassifier(loss="modified_huber", alpha=1e-5),
+            "trained": False,
+            "offsets": {"feed.log": 0, "pocket.log": 0},  # bytes of the logs learned
+            "recent_titles": collections.OrderedDict(),  # title -> category
+            "pocket_titles": collections.OrderedDict(),  # title -> None
+            "saved_titles": collections.OrderedDict(),  # saved by the bot, not learned
+        }
+
+    def save_state(self):
+        path = self.data_handler.data_path + self.MODEL_FILE_NAME
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(self.state, f)
+        os.replace(path + ".tmp", path)
+
+    def update(self):
+        """ Learn the log lines added since the last update, in CHUNK_SIZE lines """
+        offsets = dict(self.state["offsets"])
+        recent_titles = self.state["recent_titles"]
+        pocket_titles = self.state["pocket_titles"]
+        saved_titles = self.state.setdefault("saved_titles", collections.OrderedDict())
+
+        learned_count = 0
+        for pocket in self.__read_new_chunks("pocket.log"):
+            # the entries that save_to_pocket added are not a choice of the user
+            new_pocket_titles = [
+                p["title"].strip()
+                for p in self.data_loader.map_str_to_dict(pocket)
+                if p["title"].strip() not in saved_titles
+            ]
+            for title in new_pocket_titles:
+                pocket_titles[title] = None
+
+            # saved to Pocket after the entry was learned as a negative
+            learned_count += self.__learn(
+                [
+                    (recent_titles[title], title, FeedDataLoader.TRUE_LABEL)
+                    for title in new_pocket_titles
+                    if title in recent_titles
+                ]
+            )
 
-        # predict_result = self.clf.predict(category_id)[0]
-        # if predict_result == FeedDataLoader.TRUE_LABEL:
-            # self.logger.info("predict result is True, Save feed to Pocket ...")
-            # save_result = self.save_to_pocket(category, link)
-            # return save_result
-        # else:
-            # return False
+        for feed in self.__read_new_chunks("feed.log"):
+            samples = []
+            for f in self.data_loader.map_str_to_dict(feed):
+                category, title = f["category"].strip(), f["title"].strip()
+                if title in pocket_titles:
+                    label = FeedDataLoader.TRUE_LABEL
+                else:
+                    label = FeedDataLoader.FALSE_LABEL
+                samples.append((category, title, label))
+
+                recent_titles.pop(title, None)
+                recent_titles[title] = category
+            learned_count += self.__learn(samples)
+            self.__trim_titles(recent_titles)
+
+        for titles in (pocket_titles, saved_titles):
+            self.__trim_titles(titles)
+
+        if learned_count:
+            self.logger.info(f"feed classifier learned {learned_count} entries")
+        if learned_count or offsets != self.state["offsets"]:
+            self.save_state()
+
+    def __learn(self, samples):
+        """ samples: [(category, title, label)], learned with one partial_fit """
+        if not samples:
+            return 0
+
+        X = self.vectorize([(category, title) for category, title, _ in samples])
+        y = [label for _, _, label in samples]
+        self.state["clf"].partial_fit(
+            X, y, classes=[FeedDataLoader.FALSE_LABEL, FeedDataLoader.TRUE_LABEL]
+        )
+        self.state["trained"] = True
+        return len(samples)
+
+    def __trim_titles(self, titles):
+        while len(titles) > self.MAX_RECENT_TITLES:
+            titles.popitem(last=False)
+
+    def vectorize(self, entries):
+        """ entries: [(category, title)] """
+        return self.vectorizer.transform(
+            [
+                title + " category_" + re.sub(r"\W+", "_", category).strip("_")
+                for category, title in entries
+            ]
+        )
 
-    def save_to_pocket(self, category, link):
+    def predict_proba(self, entries):
+        """ entries: [(category, title)], scored in one call """
+        if not entries or not self.state["trained"]:
+            return [0.0] * len(entries)
+        return list(self.state["clf"].predict_proba(self.vectorize(entries))[:, 1])
+
+    def predict(self, entries):
+        return [score >= self.THRESHOLD for score in self.predict_proba(entries)]
+
+    def __read_new_chunks(self, fname):
+        """ The lines added to the log since the last update, in lists of
+        CHUNK_SIZE lines. (the offset moves with every chunk) """
+        reader = self.data_loader.reader(fname)
+        reader.offset = self.state["offsets"].get(fname, 0)
+
+        chunk = []
+        for line in reader.read_lines():
+            chunk.append(line)
+            if len(chunk) >= self.CHUNK_SIZE:
+                self.state["offsets"][fname] = reader.offset
+                yield chunk
+                chunk = []
+
+        self.state["offsets"][fname] = reader.offset
+        if chunk:
+            yield chunk
+
+    def save_to_pocket(self, category, title, link):
         try:
             pocket = Pocket()
             tags = self.extract_tags(category)
             pocket.add(link, tags=tags)
-            return True
         except BaseException as e:
             self.logger.exception(e)
             return False
 
+        # comes back in pocket.log, and is not learned as a positive
+        saved_titles = self.state.setdefault("saved_titles", collections.OrderedDict())
+        saved_titles[title.strip()] = None
+        return True
+
     def extract_tags(self, tags):
         tags = tags.strip()
         tags = tags.replace("[", "")
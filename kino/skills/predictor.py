@@ -1,3 +1,4 @@
+import threading
 
 from sklearn.neighbors import KNeighborsClassifier
 
@@ -12,13 +13,49 @@ from ..utils.data_loader import SkillData
 from ..utils.classes import Skill
 
 
+class SkillModel(object):
+    """ KNN classifier of the SkillData samples,
+    fitted again only after the samples are changed. """
+
+    def __init__(self, n_neighbors=8, skill_data=None):
+        self.n_neighbors = n_neighbors
+        self.skill_data = skill_data
+
+        self.lock = threading.Lock()
+        self.knn = None
+        self.version = None  # version of the samples that the knn is fitted with
+
+    def predict(self, test_x):
+        """ :return: (skill index, confidence) """
+        knn = self.get_knn()
+        predict = knn.predict(test_x)[0]
+        confidence = max(knn.predict_proba(test_x)[0])
+        return predict, confidence
+
+    def get_knn(self):
+        skill_data = self.skill_data
+        if skill_data is None:
+            skill_data = SkillData()
+
+        with self.lock:
+            if self.knn is None or self.version != skill_data.version:
+                version, data_X, data_y = skill_data.make_data_set()
+                knn = KNeighborsClassifier(
+                    n_neighbors=self.n_neighbors, weights="distance"
+                )
+                knn.fit(data_X, data_y)
+                self.knn, self.version = knn, version
+            return self.knn
+
+
 class Predictor(object):
-    def __init__(self, n_neighbors=8, slackbot=None):
-        self.knn = KNeighborsClassifier(n_neighbors=n_neighbors, weights="distance")
 
-        skill_data = SkillData()
-        data_X, data_y = SkillDataLoader().make_data_set(skill_data.q)
-        self.knn.fit(data_X, data_y)
+    models = {}  # n_neighbors -> SkillModel, kept while the bot is running
+
+    def __init__(self, n_neighbors=8, slackbot=None):
+        if n_neighbors not in Predictor.models:
+            Predictor.models[n_neighbors] = SkillModel(n_neighbors=n_neighbors)
+        self.model = Predictor.models[n_neighbors]
 
         if slackbot is None:
             self.slackbot = SlackerAdapter()
@@ -29,8 +66,7 @@ class Predictor(object):
         data_loader = SkillDataLoader()
         test_x = data_loader.make_X()
 
-        predict = self.knn.predict(test_x)[0]
-        confidence = max(self.knn.predict_proba(test_x)[0])
+        predict, confidence = self.model.predict(test_x)
         description = " ".join(Skill.classes[predict][0])
         func_name = Skill.classes[predict][1]
 
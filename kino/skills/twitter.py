@@ -6,11 +6,13 @@ from ..slack.slackbot import SlackerAdapter
 
 from ..utils.data_handler import DataHandler
 from ..utils.logger import Logger
+from ..utils.seen_store import SeenStore
 
 
 class TwitterManager:
 
-    MAX_KEEP = 200
+    SEEN_MAX_SIZE = 100000
+    SEEN_MAX_AGE = 30 * 24 * 60 * 60  # Unit (Second)
 
     MAX_TEXT_LENGTH = 135
     MAX_LINK_LENGTH = 80
@@ -22,6 +24,16 @@ class TwitterManager:
         self.logger = Logger().get_logger()
 
         self.data_handler = DataHandler()
+        self.seen_tweets = SeenStore(
+            "tweet_ids", max_size=self.SEEN_MAX_SIZE, max_age=self.SEEN_MAX_AGE
+        )
+        self.seen_reddit_links = SeenStore(
+            "reddit_links", max_size=self.SEEN_MAX_SIZE, max_age=self.SEEN_MAX_AGE
+        )
+        # ids kept in the cache file before the seen store
+        if len(self.seen_tweets) == 0:
+            for tweet_id in self.data_handler.read_cache().get("tweet_ids", []):
+                self.seen_tweets.add(tweet_id)
 
         self.api = twitter.Api(
             consumer_key=Config.open_api.twitter.CONSUMER_KEY,
@@ -39,28 +51,20 @@ class TwitterManager:
 
     def notify_popular_tweet(self):
         self.logger.info("Check popular tweet")
-        cache_data = self.data_handler.read_cache()
-        cache_tweet_ids = set(cache_data.get("tweet_ids", []))
-
         for tweet in self.get_popular_tweet():
             self.slackbot.send_message(
                 text=f"*Popular Tweet*\n - :+1: ({tweet[3]}) {tweet[1]}: {tweet[2]}",
                 giphy=False,
             )
-            cache_tweet_ids.add(tweet[0])
-        self.data_handler.edit_cache(
-            ("tweet_ids", list(cache_tweet_ids)[-self.MAX_KEEP:])
-        )
+            self.seen_tweets.add(tweet[0])
+        self.seen_tweets.save()
 
     def get_popular_tweet(self):
-        cache_data = self.data_handler.read_cache()
-        cache_tweet_ids = set(cache_data.get("tweet_ids", []))
-
         tweets = []
         for r in self.api.GetHomeTimeline(count=self.HOME_TIMELINE_COUNT):
             if r.retweeted_status is not None:
                 r = r.retweeted_status
-            if r.favorite_count > 50 and r.id not in cache_tweet_ids:
+            if r.favorite_count > 50 and r.id not in self.seen_tweets:
                 tweets.append((r.id, r.user.name, r.text, r.favorite_count))
         return tweets
 
@@ -92,11 +96,8 @@ class TwitterManager:
         self.tweet(f"{tweet_title}\n{title}\n{link}")
 
     def reddit_tweet(self, reddit: tuple) -> None:
-        cache_data = self.data_handler.read_cache()
-        cache_entry_links = set(cache_data.get("entry_links", []))
-
         subreddit, title, link = reddit
-        if link in cache_entry_links:
+        if link in self.seen_reddit_links:
             return
 
         subreddit = subreddit.replace("MachineLearning", "ml")
@@ -116,5 +117,5 @@ class TwitterManager:
 
         self.tweet(f"{tweet_title}\n{title}\n{link}")
 
-        cache_entry_links.add(link)
-        self.data_handler.edit_cache(("feed_links", list(cache_entry_links)))
+        self.seen_reddit_links.add(link)
+        self.seen_reddit_links.save()
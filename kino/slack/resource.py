@@ -5,61 +5,156 @@ from hbconfig import Config
 from ..utils.data_handler import DataHandler
 
 
+class TextFormatter(object):
+    def __init__(self, text):
+        self.text = text
+        self.has_fields = "{" in text and "}" in text
+
+    def render(self, args, kwargs):
+        if kwargs and self.has_fields:
+            return self.text.format(**kwargs)
+        return self.text
+
+
+class ChoiceFormatter(object):
+    """ Random one of the list """
+
+    def __init__(self, messages):
+        self.formatters = [compile_message(m) for m in messages]
+        self.has_fields = any(f.has_fields for f in self.formatters)
+
+    def render(self, args, kwargs):
+        return random.choice(self.formatters).render(args, kwargs)
+
+
+class LookupFormatter(object):
+    """ Value of the key, or of the nearest number key """
+
+    def __init__(self, table):
+        self.table = table
+        self.has_fields = True
+
+        self.numbers = []
+        for key in table.keys():
+            try:
+                self.numbers.append((int(key), key))
+            except ValueError:
+                pass
+
+    def render(self, args, kwargs):
+        if len(args) != 1:
+            return self.table
+
+        arg = args[0]
+        if arg in self.table:
+            return self.table[arg]
+
+        try:
+            num = int(arg)
+        except (TypeError, ValueError):
+            return ""  # ex. a weather icon that is not in the table
+        if not self.numbers:
+            return ""
+
+        _, key = min(self.numbers, key=lambda x: abs(x[0] - num))
+        return self.table[key]
+
+
+def compile_message(message):
+    if isinstance(message, dict):
+        return LookupFormatter(message)
+    if isinstance(message, list):
+        return ChoiceFormatter(message)
+    return TextFormatter(message)
+
+
+class Message(str):
+    """ Rendered text that remembers its templates, to render again in another language.
+    (kept through `+`, but not through format or join) """
+
+    def __new__(cls, text, parts):
+        message = super().__new__(cls, text)
+        message.parts = parts  # str or (name, args, kwargs)
+        return message
+
+    def __add__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Message(str(self) + str(other), self.parts + Message.parts_of(other))
+
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Message(str(other) + str(self), Message.parts_of(other) + self.parts)
+
+    @staticmethod
+    def parts_of(text):
+        if isinstance(text, Message):
+            return text.parts
+        return (str(text),)
+
+
 class MsgResourceType(type):
     class __MsgResource:
+
+        NOT_EXIST = TextFormatter("MsgResource not exist.")
+
         def __init__(self):
             data_handler = DataHandler()
 
             self.template = data_handler.read_template()
-            self.pool = {}
-
-        def set_lang_code(self, lang_code):
-            if lang_code in self.template.keys():
-                self.lang_code = lang_code
-            else:
-                self.lang_code = Config.bot.LANG_CODE
+            self.formatters = {
+                lang_code: {name: compile_message(m) for name, m in messages.items()}
+                for lang_code, messages in self.template.items()
+            }
 
         def __getattr__(self, name):
-            self.pool[name] = {}
+            if name.startswith("__"):
+                raise AttributeError(name)
 
-            message = self.template[Config.bot.LANG_CODE].get(name, "empty")
-            if isinstance(message, list):
-                message = random.choice(message)
+            formatter = self.get_formatter(name)
+            if formatter.has_fields:
 
-            def wrapper(*args, **kwargs):
-                self.pool[name] = {"args": args, "kwargs": kwargs}
-                return "{" + name + "}"
+                def wrapper(*args, **kwargs):
+                    return self.render(name, args, kwargs)
 
-            if isinstance(message, dict) or ("{" in message and "}" in message):
                 return wrapper
             else:
-                return "{" + name + "}"
-
-        def to_text(self, msg_name):
-            name = msg_name[1:-1]
-            m_args = self.pool[name].get("args", None)
-            m_kwargs = self.pool[name].get("kwargs", None)
-
-            message = self.template[self.lang_code].get(name, "MsgResource not exist.")
-            if isinstance(message, list):
-                message = random.choice(message)
-
-            def find_nearest_number(num_list, num):
-                num = int(num)
-                num_list = list(map(lambda x: int(x), num_list))
-                return str(min(num_list, key=lambda x: abs(x - num)))
-
-            if m_args is not None and len(m_args) == 1:
-                arg = m_args[0]
-                if arg in message:
-                    return message[arg]
-                else:
-                    return message[find_nearest_number(message.keys(), arg)]
-            elif m_kwargs is not None:
-                return message.format(**m_kwargs)
-            else:
+                return self.render(name)
+
+        def get_formatter(self, name, lang_code=None):
+            return self.get_formatters(lang_code).get(name, self.NOT_EXIST)
+
+        def get_formatters(self, lang_code=None):
+            if lang_code not in self.formatters:
+                lang_code = Config.bot.LANG_CODE
+            return self.formatters.get(lang_code, {})
+
+        def render(self, name, args=(), kwargs=None, lang_code=None):
+            kwargs = kwargs or {}
+            text = self.get_formatter(name, lang_code).render(args, kwargs)
+            if not isinstance(text, str):  # ex. list of GUIDE_DETAIL
+                return text
+            return Message(text, ((name, args, kwargs),))
+
+        def to_text(self, message, lang_code):
+            """ Render the message again in lang_code. (other text is returned as it is) """
+            if not isinstance(message, Message):
+                return message
+            if lang_code not in self.formatters or lang_code == Config.bot.LANG_CODE:
                 return message
 
+            texts = []
+            for part in message.parts:
+                if isinstance(part, str):
+                    texts.append(part)
+                else:
+                    name, args, kwargs = part
+                    texts.append(
+                        str(self.render(name, args, kwargs, lang_code=lang_code))
+                    )
+            return "".join(texts)
+
     instance = None
 
     def __new__(cls, *args, **kwargs):  # __new__ always a classmethod
@@ -1,11 +1,13 @@
 
+import collections
+from concurrent.futures import ThreadPoolExecutor
 import random
 import requests
-import re
+import threading
+import time
 from urllib.parse import urlencode, quote_plus
 
 from hbconfig import Config
-import langid
 from slacker import Slacker
 
 from .resource import MsgResource
@@ -13,6 +15,9 @@ from .template import MsgTemplate
 
 from ..nlp.lang_code import LangCode
 from ..utils.data_handler import DataHandler
+from ..utils.logger import Logger
+from ..utils.metrics import Metrics
+from ..utils.tracer import Tracer
 
 
 class SlackerAdapter(object):
@@ -31,27 +36,30 @@ class SlackerAdapter(object):
         if channel is not None:
             self.channel = channel
 
-        MsgResource.set_lang_code(self.lang_code)
         text = self.__message2text(text)
 
         if attachments is not None:
             attachments = self.attachment_message2text(attachments)
 
-        gihpy_result = None
+        with Tracer().stage("send_message"):
+            r = self.__call_api(
+                "chat.post_message",
+                channel=self.channel,
+                text=text,
+                attachments=attachments,
+                as_user=True,
+            )
+            self.data_handler.edit_cache(("message", r.body))
+
         random_num = random.randint(1, 100)
         if (
             giphy
             and (text is not None and attachments is None)
             and random_num > Config.bot.GIPHY_THRESHOLD
         ):
+            # The text is already sent. the gif is attached when it is found.
             gihpy_client = GiphyClient(slackbot=self)
-            gihpy_result = gihpy_client.search(text)
-
-        if gihpy_result is None:
-            r = self.slacker.chat.post_message(
-                channel=self.channel, text=text, attachments=attachments, as_user=True
-            )
-            self.data_handler.edit_cache(("message", r.body))
+            gihpy_client.attach_async(text, r.body)
 
     def attachment_message2text(self, d):
         if not isinstance(d, (dict, list)):
@@ -67,24 +75,35 @@ class SlackerAdapter(object):
         }
 
     def __message2text(self, msg_text):
-        if isinstance(msg_text, str):
-            result = re.findall(r"\{[A-Z][A-Z_0-9]+\}", msg_text)
-            if len(result) > 0:
-                for r in result:
-                    msg_text = msg_text.replace(r, MsgResource.to_text(r))
-        return msg_text
-
-    def update_message(self, channel=None, text=None, attachments=None):
+        return MsgResource.to_text(msg_text, self.lang_code)
+
+    def update_message(self, channel=None, text=None, attachments=None, ts=None):
         if text is None:
             text = ""
 
+        if ts is not None:
+            self.__call_api(
+                "chat.update",
+                ts=ts,
+                channel=channel,
+                text=text,
+                attachments=attachments,
+                as_user=True,
+            )
+            return
+
         cache = self.data_handler.read_cache()
         if "send_message" in cache:
             cache_message = cache["message"]
             ts = cache_message["ts"]
             channel = cache_message["channel"]
-            self.slacker.chat.update(
-                ts=ts, channel=channel, text=text, attachments=attachments, as_user=True
+            self.__call_api(
+                "chat.update",
+                ts=ts,
+                channel=channel,
+                text=text,
+                attachments=attachments,
+                as_user=True,
             )
         else:
             self.send_message(text="마지막 메시지에 대한 정보가 없습니다.", channel=channel)
@@ -97,12 +116,17 @@ class SlackerAdapter(object):
 
         comment = self.__message2text(comment)
 
-        self.slacker.files.upload(
-            f_name, channels=self.channel, title=title, initial_comment=comment
-        )
+        with Tracer().stage("send_message"):
+            self.__call_api(
+                "files.upload",
+                f_name,
+                channels=self.channel,
+                title=title,
+                initial_comment=comment,
+            )
 
     def start_real_time_messaging_session(self):
-        response = self.slacker.rtm.start()
+        response = self.__call_api("rtm.start")
         return response.body["url"]
 
     def get_bot_id(self):
@@ -110,7 +134,7 @@ class SlackerAdapter(object):
         if "bot_id" in cache:
             return cache["bot_id"]
 
-        users = self.slacker.users.list().body["members"]
+        users = self.__call_api("users.list").body["members"]
         for user in users:
             if user["name"] == Config.bot.BOT_NAME.lower():
                 bot_id = user["id"]
@@ -118,14 +142,36 @@ class SlackerAdapter(object):
                 return bot_id
 
     def get_users(self):
-        return self.slacker.users.list().body["members"]
+        return self.__call_api("users.list").body["members"]
 
     def is_active(self, user_id):
-        result = self.slacker.users.get_presence(user_id).body
+        result = self.__call_api("users.get_presence", user_id).body
         return result["presence"] == "active"
 
+    def __call_api(self, method, *args, **kwargs):
+        metrics = Metrics()
+        metrics.inc("kino_slack_api_calls_total", method=method)
+
+        api = self.slacker
+        for name in method.split("."):
+            api = getattr(api, name)
+        try:
+            return api(*args, **kwargs)
+        except BaseException:
+            metrics.inc("kino_slack_api_errors_total", method=method)
+            raise
+
 
 class GiphyClient:
+
+    CACHE_TTL = 6 * 60 * 60  # Unit (Second)
+    CACHE_SIZE = 256
+    TIMEOUT = 5  # Unit (Second)
+
+    cache = collections.OrderedDict()  # q -> (expire_time, gif urls)
+    cache_lock = threading.Lock()
+    executor = ThreadPoolExecutor(max_workers=2)
+
     def __init__(self, slackbot=None, limit=10):
         self.base_url = "http://api.giphy.com/v1/gifs/"
         self.api_key = Config.open_api.giphy.TOKEN
@@ -137,25 +183,69 @@ class GiphyClient:
             self.slackbot = slackbot
 
     def search(self, q):
+        urls = self.search_urls(q)
+        if len(urls) == 0:
+            return None
+
+        attachments = MsgTemplate.make_giphy_template(q, random.choice(urls))
+        self.slackbot.send_message(attachments=attachments)
+        return True
+
+    def attach_async(self, q, message):
+        """ Attach a gif to the posted message. (message: chat.post_message body) """
+
+        def attach():
+            urls = self.search_urls(q)
+            if len(urls) == 0:
+                return
+
+            attachments = MsgTemplate.make_giphy_template(q, random.choice(urls))
+            self.slackbot.update_message(
+                channel=message["channel"],
+                text=q,
+                attachments=attachments,
+                ts=message["ts"],
+            )
+
+        future = GiphyClient.executor.submit(attach)
+        future.add_done_callback(self.__log_error)
+        return future
+
+    def search_urls(self, q):
+        metrics = Metrics()
+        now = time.time()
+        with GiphyClient.cache_lock:
+            cached = GiphyClient.cache.get(q, None)
+            if cached is not None and cached[0] > now:
+                GiphyClient.cache.move_to_end(q)
+                metrics.cache_hit("giphy")
+                return cached[1]
+        metrics.cache_miss("giphy")
+
         payload = {
             "q": q,
             "api_key": self.api_key,
             "limit": self.limit,
-            "lang": langid.classify(q)[0],
+            "lang": LangCode.classify(q),
         }
         query = urlencode(payload, quote_via=quote_plus)
 
-        r = requests.get(f"{self.base_url}search?{query}")
-        if r.status_code == 200:
-            result = r.json()["data"]
-            if len(result) == 0:
-                return None
-
-            choiced_gif = random.choice(result)
-            url = choiced_gif["images"]["downsized"]["url"]
-            attachments = MsgTemplate.make_giphy_template(q, url)
-
-            self.slackbot.send_message(attachments=attachments)
-            return True
-        else:
-            return None
+        try:
+            r = requests.get(f"{self.base_url}search?{query}", timeout=self.TIMEOUT)
+        except requests.RequestException as e:
+            Logger().get_logger().error(f"Giphy Error: {e}")
+            return []
+        if r.status_code != 200:
+            return []  # do not cache errors
+
+        urls = [gif["images"]["downsized"]["url"] for gif in r.json()["data"]]
+        with GiphyClient.cache_lock:
+            GiphyClient.cache[q] = (now + self.CACHE_TTL, urls)
+            GiphyClient.cache.move_to_end(q)
+            while len(GiphyClient.cache) > self.CACHE_SIZE:
+                GiphyClient.cache.popitem(last=False)
+        return urls
+
+    def __log_error(self, future):
+        if future.exception() is not None:
+            Logger().get_logger().error(f"Giphy Error: {future.exception()}")
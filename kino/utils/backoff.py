@@ -0,0 +1,19 @@
+import random
+
+
+class Backoff(object):
+    """ Exponential backoff with jitter. (base * 2^attempt, capped by max_delay) """
+
+    def __init__(self, base=1, max_delay=300, jitter=0.5):
+        self.base = base  # Unit (Second)
+        self.max_delay = max_delay  # Unit (Second)
+        self.jitter = jitter  # ratio of the delay that is randomized
+        self.attempt = 0
+
+    def next(self):
+        delay = min(self.max_delay, self.base * (2 ** self.attempt))
+        self.attempt += 1
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def reset(self):
+        self.attempt = 0
@@ -2,6 +2,7 @@
 import collections
 import os
 import re
+import time
 
 import arrow
 import boto3
@@ -11,10 +12,15 @@ import requests
 from hbconfig import Config
 
 from kino.utils.arrow import ArrowUtil
+from kino.utils.metrics import Metrics
 
 
 class DataHandler(object):
 
+    AWESOME_FEEDS_CACHE_FILE_NAME = "cache_awesome_feeds.json"
+    AWESOME_FEEDS_TTL = 24 * 60 * 60  # Unit (Second)
+    AWESOME_FEEDS_TIMEOUT = 10  # Unit (Second)
+
     def __init__(self):
         self.data_path = "data/"
         self.record_path = "record/"
@@ -42,14 +48,25 @@ class DataHandler(object):
         path = os.path.join(fpath + fname)
         try:
             with open(path, "rb") as infile:
-                return infile.read().decode("utf-8")
+                raw = infile.read()
+                text = raw.decode("utf-8")
         except BaseException:
             return ""
 
+        metrics = Metrics()
+        metrics.inc("kino_data_reads_total")
+        metrics.inc("kino_data_read_bytes_total", len(raw))
+        return text
+
     def write_file(self, fname, data):
         path = os.path.join(self.data_path + fname)
         with open(path, "w", encoding="utf-8") as outfile:
             json.dump(data, outfile, indent=4)
+            write_bytes = outfile.tell()
+
+        metrics = Metrics()
+        metrics.inc("kino_data_writes_total")
+        metrics.inc("kino_data_write_bytes_total", write_bytes)
 
     def read_json_then_add_data(self, fname, category, input_data):
         total_data = self.read_file(fname)
@@ -214,8 +231,12 @@ class DataHandler(object):
             return {}
 
     def edit_cache(self, data, fname="cache.json"):
+        self.update_cache(dict([data]), fname=fname)
+
+    def update_cache(self, data, fname="cache.json"):
+        """ Set every key of data in one write of the cache file """
         cache = self.read_cache(fname=fname)
-        cache[data[0]] = data[1]
+        cache.update(data)
         self.write_file(fname, cache)
 
     def read_template(self):
@@ -228,14 +249,58 @@ class DataHandler(object):
                 templates[lang_code] = self.read_file(template_dir + f)
         return templates
 
-    def read_feeds(self):
+    def read_feeds(self, refresh=False):
+        """ Feed list of the awesome-feeds README, cached in data/cache_awesome_feeds.json.
+
+        Downloaded again (conditional GET) only after Config.profile.feed.AWESOME_FEEDS_TTL
+        seconds, and the last good copy is used when the download fails.
+        """
         awesome_feeds_url = Config.profile.feed.get(
             "AWESOME_FEEDS_URL",
             "https://raw.githubusercontent.com/DongjunLee/awesome-feeds/master/README.md",
         )
-        raw_awesome_feeds = requests.get(awesome_feeds_url).text
+        ttl = Config.profile.feed.get("AWESOME_FEEDS_TTL", self.AWESOME_FEEDS_TTL)
 
-        feeds = {"Github": [("Activity", Config.profile.feed.get("GITHUB", ""), False)]}
+        cache = self.read_file(self.AWESOME_FEEDS_CACHE_FILE_NAME)
+        if cache.get("url", None) != awesome_feeds_url:
+            cache = {}
+
+        now = time.time()
+        if cache and not refresh and now - cache.get("fetched_at", 0) < ttl:
+            Metrics().cache_hit("awesome_feeds")
+            return self.__make_feeds(cache["feeds"])
+        Metrics().cache_miss("awesome_feeds")
+
+        headers = {}
+        if cache.get("etag", None):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified", None):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+        try:
+            response = requests.get(
+                awesome_feeds_url, headers=headers, timeout=self.AWESOME_FEEDS_TIMEOUT
+            )
+            if response.status_code != 304 or not cache:
+                response.raise_for_status()
+                cache = {
+                    "url": awesome_feeds_url,
+                    "etag": response.headers.get("ETag", None),
+                    "last_modified": response.headers.get("Last-Modified", None),
+                    "feeds": self.parse_awesome_feeds(response.text),
+                }
+        except Exception:
+            if not cache:
+                raise
+            # Offline, keep the last good copy and try again on the next call
+            return self.__make_feeds(cache["feeds"])
+
+        cache["fetched_at"] = now
+        self.write_file(self.AWESOME_FEEDS_CACHE_FILE_NAME, cache)
+        return self.__make_feeds(cache["feeds"])
+
+    def parse_awesome_feeds(self, raw_awesome_feeds):
+        feeds = {}
         curr_category = None
         for line in raw_awesome_feeds.splitlines():
             if line.startswith("##"):
@@ -252,6 +317,15 @@ class DataHandler(object):
                     feed_name = feed_name.replace("**", "")
 
                 feeds[curr_category].append((feed_name, feed_link, save_pocket))
+
+        if not feeds:
+            raise ValueError("awesome feeds: no feed in the README")
+        return feeds
+
+    def __make_feeds(self, awesome_feeds):
+        feeds = {"Github": [("Activity", Config.profile.feed.get("GITHUB", ""), False)]}
+        for category, category_feeds in awesome_feeds.items():
+            feeds[category] = [tuple(feed) for feed in category_feeds]
         return feeds
 
     def read_log_data(self, fname):
@@ -1,74 +1,103 @@
-import arrow
+import datetime
 import json
 import os
 import numpy as np
+import pickle
 import re
-from dateutil import tz
-from queue import Queue
+import threading
 
 from ..dialog.dialog_manager import DialogManager
 
 from .arrow import ArrowUtil
 from .data_handler import DataHandler
 from .classes import Skill
+from .keyword_matcher import KeywordMatcher
+
+
+class LogReader(object):
+    """ Stream the complete lines of a log file, from the byte offset consumed last.
+
+    A line that is still being written is left for the next read, and the file is
+    read from the start again when it gets smaller than the offset. (rotated)
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+
+    def read_lines(self):
+        try:
+            if os.path.getsize(self.path) < self.offset:
+                self.offset = 0
+            f = open(self.path, "rb")
+        except OSError:
+            return
+
+        with f:
+            f.seek(self.offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                self.offset += len(raw)
+                yield raw.decode("utf-8", errors="replace").rstrip("\r\n")
 
 
 class SkillDataLoader(object):
-    def __init__(self):
-        pass
 
-    def load_skill_queue(self, max_qsize=400):
-        self.max_qsize = max_qsize
-        return self.__read_file_then_convert()
+    N_FEATURES = 5  # day_of_week, hour, minute, prev_func, is_holiday
 
-    def make_data_set(self, q):
-        data = list(q.queue)
+    DATETIME_PATTERN = re.compile(r"(\d+)-(\d+)-(\d+) (\d+):(\d+)")
 
-        data_x = []
-        data_y = []
-        for x, y in data:
-            data_x.append(x)
-            data_y.append(y)
-        return np.array(data_x), np.array(data_y)
+    def __init__(self, offset=0, prev_line=""):
+        self.reader = None
+        self.offset = offset  # bytes of raw_data loaded
+        self.prev_line = prev_line
 
-    def __read_file_then_convert(self):
-        data_handler = DataHandler()
-        raw_data = data_handler.read_text("raw_data")
+    def load_samples(self, max_size=400, samples=None):
+        """ Append the raw_data lines added since the last load to samples
+        (a new SampleRingBuffer by default) """
+        if samples is None:
+            samples = SampleRingBuffer(max_size, self.N_FEATURES)
+        if self.reader is None:
+            self.reader = LogReader(
+                os.path.join(DataHandler().data_path, "raw_data"), offset=self.offset
+            )
+        samples = self.__read_file_then_convert(samples)
+        self.offset = self.reader.offset
+        return samples
 
-        q = RemoveOldDataQueue(self.max_qsize)
+    def __read_file_then_convert(self, samples):
+        matcher = KeywordMatcher.for_skills()
+        default_func = len(Skill.classes)
 
-        skill_list = list(map(lambda x: x[0], Skill.classes))
-        prev_line = ""
-        for line in raw_data.split("\n"):
+        prev_matches = matcher.match(self.prev_line)
+        prev_line = self.prev_line
+        for line in self.reader.read_lines():
             if "raw input:" not in line:
                 continue
 
-            prev_func = len(Skill.classes)  # default value
-            for idx, keyword_list in enumerate(skill_list):
-                if all(k in prev_line for k in keyword_list):
-                    prev_func = idx
-
-            for idx, keyword_list in enumerate(skill_list):
-                if all(k in line for k in keyword_list):
-                    x = self.convert_data(line, prev_func)
-                    if x is None:
-                        continue
+            prev_func = prev_matches[-1] if prev_matches else default_func
+            matches = matcher.match(line)
+            if matches:
+                x = self.convert_data(line, prev_func)
+                if x is not None:
+                    for idx in matches:
+                        samples.append(x, idx)
 
-                    q.put_nowait((x, idx))
-            prev_line = line
-        return q
+            prev_line, prev_matches = line, matches
+        self.prev_line = prev_line
+        return samples
 
     def convert_data(self, line, prev_func):
-        datetime_pattern = "\d+-\d+-\d+ \d+:\d+"
-        r = re.findall(datetime_pattern, line)
-        if len(r) == 0:
+        r = self.DATETIME_PATTERN.search(line)
+        if r is None:
             return None
 
-        t = arrow.get(r[0], tzinfo=tz.tzlocal())
-
-        day_of_week = t.isoweekday()
-        hour = int(t.format("HH"))
-        minute = int(t.format("mm"))
+        year, month, day, hour, minute = map(int, r.groups())
+        try:
+            day_of_week = datetime.date(year, month, day).isoweekday()
+        except ValueError:
+            return None
 
         if day_of_week == 6 or day_of_week == 7:
             is_holiday = 1
@@ -88,39 +117,123 @@ class SkillDataLoader(object):
         if memory_text is None:
             pass
         else:
-            skill_list = list(map(lambda x: x[0], Skill.classes))
-            for idx, keyword_list in enumerate(skill_list):
-                if all(k in memory_text for k in keyword_list):
-                    prev_func = idx
+            matches = KeywordMatcher.for_skills().match(memory_text)
+            if matches:
+                prev_func = matches[-1]
 
         return np.array(
             [[day_of_week, hour, minute, prev_func, is_holiday]], dtype=np.int32
         )
 
     def make_y(self, text):
-        skill_list = list(map(lambda x: x[0], Skill.classes))
-        for idx, keyword_list in enumerate(skill_list):
-            if all(k in text for k in keyword_list):
-                return idx
+        matches = KeywordMatcher.for_skills().match(text)
+        if matches:
+            return matches[0]
         return None
 
 
-class RemoveOldDataQueue(Queue):
-    def put_nowait(self, *args, **kwargs):
-        if self.full():
-            try:
-                # oldest_data
-                self.get()
-            except Queue.Empty:
-                pass
-        Queue.put_nowait(self, *args, **kwargs)
+class SampleRingBuffer(object):
+    """ The latest `capacity` samples in fixed arrays. (X: int32 matrix, y: vector)
+    A new sample overwrites the oldest row, so the rows are not in insertion order. """
+
+    def __init__(self, capacity, n_features):
+        self.X = np.zeros((capacity, n_features), dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.capacity = capacity
+        self.size = 0
+        self.next_index = 0  # row of the next sample, the oldest one when full
+
+    def append(self, x, y):
+        self.X[self.next_index] = x
+        self.y[self.next_index] = y
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, X, y):
+        for x_row, y_value in zip(X, y):
+            self.append(x_row, y_value)
+
+    def make_data_set(self):
+        """ Views of the filled rows (not copied, they change with append) """
+        return self.X[: self.size], self.y[: self.size]
+
+    def ordered(self):
+        """ Copies of the samples, oldest first """
+        if self.size < self.capacity:
+            return self.X[: self.size].copy(), self.y[: self.size].copy()
+        order = np.roll(np.arange(self.capacity), -self.next_index)
+        return self.X[order], self.y[order]
+
+    def __len__(self):
+        return self.size
 
 
 class SkillData(object):
+    """ Samples of the Skill Predictor. (kept in data/skill_data.pkl with the
+    offset of raw_data, so only new lines are parsed at startup) """
+
     class __Singleton:
+
+        FNAME = "skill_data.pkl"
+        MAX_SIZE = 400
+
         def __init__(self):
-            data_loader = SkillDataLoader()
-            self.q = data_loader.load_skill_queue(max_qsize=400)
+            self.data_handler = DataHandler()
+            self.lock = threading.Lock()
+            self.version = 0  # changed with the samples
+
+            self.samples = SampleRingBuffer(self.MAX_SIZE, SkillDataLoader.N_FEATURES)
+            self.data_loader = self.__restore()
+            self.load()
+
+        def load(self):
+            with self.lock:
+                offset = self.data_loader.offset
+                self.data_loader.load_samples(samples=self.samples)
+                if self.data_loader.offset != offset:
+                    self.version += 1
+                    self.__save()
+
+        def add(self, x, y):
+            with self.lock:
+                self.samples.append(x, y)
+                self.version += 1
+                self.__save()
+
+        def make_data_set(self):
+            """ (version, X, y) of the samples. X and y are views of the ring buffer,
+            so fit them right away. (KNeighborsClassifier.fit copies int32 rows) """
+            with self.lock:
+                data_X, data_y = self.samples.make_data_set()
+                return self.version, data_X, data_y
+
+        def __restore(self):
+            path = self.data_handler.data_path + self.FNAME
+            try:
+                with open(path, "rb") as f:
+                    data = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                return SkillDataLoader()
+            if "X" not in data:  # saved as a list of samples, parse raw_data again
+                return SkillDataLoader()
+
+            self.samples.extend(data["X"], data["y"])
+            return SkillDataLoader(offset=data["offset"], prev_line=data["prev_line"])
+
+        def __save(self):
+            path = self.data_handler.data_path + self.FNAME
+            data_X, data_y = self.samples.ordered()
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(
+                    {
+                        "X": data_X,
+                        "y": data_y,
+                        "offset": self.data_loader.offset,
+                        "prev_line": self.data_loader.prev_line,
+                    },
+                    f,
+                )
+            os.replace(path + ".tmp", path)
 
     instance = None
 
@@ -132,7 +245,11 @@ class SkillData(object):
         return getattr(self.instance, name)
 
     def reset(self):
-        SkillData.instance = SkillData.__Singleton()
+        """ Load the log lines added since the last load """
+        if SkillData.instance is None:
+            SkillData.instance = SkillData.__Singleton()
+        else:
+            SkillData.instance.load()
 
 
 class FeedDataLoader:
@@ -142,70 +259,28 @@ class FeedDataLoader:
 
     def __init__(self):
         self.data_handler = DataHandler()
+        self.readers = {}  # fname -> LogReader
 
     def load_data(self, fname):
-        data = self.data_handler.read_log_data(fname)
-        return data.split("\n")
-
-    def make_train_set(self, feed, pocket):
-        feed = self.map_str_to_dict(feed)
-        pocket = self.map_str_to_dict(pocket)
-        pocket_title = set(map(lambda p: p["title"].strip(), pocket))
+        """ Log lines added since the last load of the fname (a generator) """
+        return self.reader(fname).read_lines()
 
-        train_y = []
-        for f in feed:
-            if f["title"].strip() in pocket_title:
-                train_y.append(self.TRUE_LABEL)
-            else:
-                train_y.append(self.FALSE_LABEL)
-
-        train_X, category_ids = self.map_category2id(feed)
-        train_X = np.array(train_X).reshape(len(feed), 1)
-
-        return train_X, train_y, category_ids
+    def reader(self, fname):
+        if fname not in self.readers:
+            self.readers[fname] = LogReader(
+                os.path.join(self.data_handler.log_data_path, fname)
+            )
+        return self.readers[fname]
 
     def map_str_to_dict(self, data):
         data_list = []
         for d in data:
+            # DataLogger format: '%(asctime)s > %(message)s'
+            _, _, message = d.partition(" > ")
+            if not message:
+                continue
             try:
-                data_list.append(json.loads(d[d.index("> {") + 2 :]))
-            except:
+                data_list.append(json.loads(message))
+            except ValueError:
                 print("Faild convert to dict", d)
         return data_list
-
-    def map_category2id(self, feed):
-        keys = set(map(lambda f: f["category"].strip(), feed))
-
-        category_ids = {}
-        for idx, key in enumerate(list(keys)):
-            category_ids[key] = idx
-
-        return (
-            list(map(lambda f: category_ids[f["category"].strip()], feed)),
-            category_ids,
-        )
-
-
-class FeedData(object):
-    class __Singleton:
-        def __init__(self):
-            data_loader = FeedDataLoader()
-
-            feed = data_loader.load_data("feed.log")
-            pocket = data_loader.load_data("pocket.log")
-
-            self.train_X, self.train_y, self.category_ids = data_loader.make_train_set(
-                feed, pocket
-            )
-
-    instance = None
-
-    def __init__(self):
-        if not FeedData.instance:
-            FeedData.instance = FeedData.__Singleton()
-
-    def __getattr__(self, name):
-        return getattr(self.instance, name)
-
-    def reset(self):
-        FeedData.instance = FeedData.__Singleton()
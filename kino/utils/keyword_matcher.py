@@ -0,0 +1,80 @@
+import re
+
+from .classes import Skill
+
+
+class KeywordMatcher(object):
+    """ Indices of the keyword lists that have all their keywords in a text,
+    found with one scan of a compiled pattern of every keyword. """
+
+    MAX_CACHE = 4096
+
+    def __init__(self, keyword_lists):
+        self.keyword_lists = [tuple(keyword_list) for keyword_list in keyword_lists]
+
+        keywords = sorted(
+            {k for keyword_list in self.keyword_lists for k in keyword_list},
+            key=len,
+            reverse=True,
+        )
+        self.pattern = None
+        if keywords:
+            self.pattern = re.compile("|".join(re.escape(k) for k in keywords))
+
+        # The scan finds the longest keyword at a position, and goes on after it.
+        # A found keyword contains the keywords that are substrings of it, and the
+        # keywords that start inside it and end after it are checked one by one.
+        self.contained = {
+            k: [other for other in keywords if other in k] for k in keywords
+        }
+        self.overlapping = {
+            k: [
+                other
+                for other in keywords
+                if other not in k
+                and any(
+                    k.endswith(other[:i]) for i in range(1, min(len(k), len(other)))
+                )
+            ]
+            for k in keywords
+        }
+
+        self.keyword_sets = [
+            frozenset(keyword_list) for keyword_list in self.keyword_lists
+        ]
+        self.matches = {}  # found keywords -> indices
+
+    def match(self, text):
+        """ :return: tuple of the indices, in order """
+        found = set()
+        if self.pattern is not None:
+            for keyword in set(self.pattern.findall(text)):
+                found.update(self.contained[keyword])
+                for other in self.overlapping[keyword]:
+                    if other not in found and other in text:
+                        found.update(self.contained[other])
+
+        found = frozenset(found)
+        matches = self.matches.get(found, None)
+        if matches is None:
+            if len(self.matches) >= self.MAX_CACHE:
+                self.matches.clear()
+            matches = tuple(
+                idx
+                for idx, keyword_set in enumerate(self.keyword_sets)
+                if keyword_set <= found
+            )
+            self.matches[found] = matches
+        return matches
+
+    skill_matcher = None  # of Skill.classes
+
+    @classmethod
+    def for_skills(cls):
+        keyword_lists = [tuple(keywords) for keywords, _ in Skill.classes]
+        if (
+            cls.skill_matcher is None
+            or cls.skill_matcher.keyword_lists != keyword_lists
+        ):
+            cls.skill_matcher = cls(keyword_lists)
+        return cls.skill_matcher
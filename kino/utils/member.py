@@ -1,22 +1,128 @@
 import re
+import threading
+import time
 
 from ..slack.slackbot import SlackerAdapter
 
 from ..utils.data_handler import DataHandler
+from ..utils.logger import Logger
+from ..utils.metrics import Metrics
 
 
 class Member(object):
+    class __Directory:
+
+        TTL = 6 * 60 * 60  # Unit (Second)
+        UNKNOWN_TTL = 10 * 60  # Unit (Second)
+
+        def __init__(self):
+            self.data_handler = DataHandler()
+            self.slackbot = SlackerAdapter()
+            self.logger = Logger().get_logger()
+
+            self.lock = threading.Lock()
+            self.refreshing = False
+
+            self.index = {}  # user_id -> member (users.list element)
+            self.unknown_ids = {}  # user_id -> expire time of negative cache
+            self.updated_time = 0
+
+            cache = self.data_handler.read_cache()
+            member_data = cache.get("member", None)
+            if member_data is None:
+                self.refresh()
+            else:
+                # an old cache.json without the time is refreshed on the first get
+                self.__build_index(member_data, cache.get("member_updated_time", 0))
+
+        def get(self, user_id):
+            if self.is_expired():
+                self.refresh_in_background()
+
+            metrics = Metrics()
+
+            now = time.time()
+            with self.lock:  # refresh threads rebuild the index and unknown_ids
+                member = self.index.get(user_id, None)
+                is_known_unknown = member is None and (
+                    self.unknown_ids.get(user_id, 0) > now
+                )
+                if member is None and not is_known_unknown:
+                    self.unknown_ids[user_id] = now + self.UNKNOWN_TTL
+
+            if member is not None or is_known_unknown:
+                metrics.cache_hit("member")
+                return member
+
+            # Unknown id: never block on users.list, check it in background.
+            metrics.cache_miss("member")
+            self.refresh_in_background()
+            return None
+
+        def is_expired(self):
+            return time.time() - self.updated_time > self.TTL
+
+        def refresh(self):
+            member_data = self.slackbot.get_users()
+            with self.lock:
+                self.__build_index(member_data)
+                self.__write_cache()
+
+        def refresh_in_background(self):
+            with self.lock:
+                if self.refreshing:
+                    return
+                self.refreshing = True
+
+            def run():
+                try:
+                    self.refresh()
+                except BaseException:
+                    self.logger.exception("member")
+                finally:
+                    self.refreshing = False
+
+            threading.Thread(target=run, daemon=True).start()
+
+        def update(self, member):
+            """ Apply RTM 'user_change' and 'team_join' events """
+            user_id = member.get("id", None)
+            if user_id is None:
+                return
+
+            with self.lock:
+                self.index[user_id] = member
+                self.unknown_ids.pop(user_id, None)
+                self.__write_cache()
+
+        def __build_index(self, member_data, updated_time=None):
+            self.index = {m["id"]: m for m in member_data if "id" in m}
+            # ids still unknown stay in the negative cache
+            for user_id in self.index:
+                self.unknown_ids.pop(user_id, None)
+
+            if updated_time is None:
+                updated_time = time.time()
+            self.updated_time = updated_time
+
+        def __write_cache(self):
+            self.data_handler.update_cache(
+                {
+                    "member": list(self.index.values()),
+                    "member_updated_time": self.updated_time,
+                }
+            )
+
+    instance = None
+
     def __init__(self):
-        self.data_handler = DataHandler()
-        self.slackbot = SlackerAdapter()
+        if not Member.instance:
+            Member.instance = Member.__Directory()
 
     def get_names(self, text):
         user_ids = self.__parse_user_ids(text)
-        member_data = self.__get_member_data()
 
-        user_names = list(
-            map(lambda x: self.get_name(x, member_data=member_data), user_ids)
-        )
+        user_names = list(map(lambda x: self.get_name(x), user_ids))
         user_names = list(
             filter(lambda x: x is not None and x.lower() != "no ki", user_names)
         )
@@ -27,26 +133,11 @@ class Member(object):
         result = re.findall(pattern, text)
         return list(map(lambda x: x[1:], result))
 
-    def __get_member_data(self, is_write=False):
-        cache_data = self.data_handler.read_cache()
-        member_data = cache_data.get("member", None)
+    def get_name(self, user_id):
+        member = self.instance.get(user_id)
+        if member is None:
+            return None
+        return member["profile"]["real_name"]
 
-        if member_data is None or is_write:
-            member_data = self.slackbot.get_users()
-            self.data_handler.edit_cache(("member", member_data))
-        return member_data
-
-    def get_name(self, user_id, member_data=None):
-        if member_data is None:
-            member_data = self.__get_member_data()
-
-        name = self.__get_name(user_id, member_data)
-        if name is None:
-            member_data = self.__get_member_data(is_write=True)
-        return self.__get_name(user_id, member_data)
-
-    def __get_name(self, user_id, member_data):
-        for member in member_data:
-            if user_id == member.get("id", ""):
-                return member["profile"]["real_name"]
-        return None
+    def update(self, member):
+        self.instance.update(member)
@@ -0,0 +1,206 @@
+import bisect
+import contextlib
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+import threading
+import time
+
+
+class Metrics(object):
+    """ In-process counters and histograms, rendered in Prometheus text format """
+
+    class __Metrics:
+
+        BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+        HELPS = {
+            "kino_rtm_events_total": "RTM events received, by type.",
+            "kino_rtm_reconnects_total": "RTM session reconnects.",
+            "kino_skill_invocations_total": "Skill calls, by skill and status.",
+            "kino_skill_duration_seconds": "Skill call duration, by skill.",
+            "kino_schedule_job_runs_total": "Scheduled job runs.",
+            "kino_schedule_job_misses_total": "Scheduled runs skipped by late jobs.",
+            "kino_schedule_wakeups_total": "Wakeups of the scheduler loop.",
+            "kino_slack_api_calls_total": "Slack Web API calls, by method.",
+            "kino_slack_api_errors_total": "Slack Web API errors, by method.",
+            "kino_data_reads_total": "DataHandler file reads.",
+            "kino_data_read_bytes_total": "DataHandler bytes read.",
+            "kino_data_writes_total": "DataHandler file writes.",
+            "kino_data_write_bytes_total": "DataHandler bytes written.",
+            "kino_cache_hits_total": "Cache hits, by cache.",
+            "kino_cache_misses_total": "Cache misses, by cache.",
+            "kino_cache_hit_ratio": "hits / (hits + misses), by cache.",
+            "kino_jobs_running": "Scheduled jobs running in the job executor.",
+            "kino_jobs_queued": "Scheduled jobs waiting for a job executor thread.",
+            "kino_job_skips_total": "Scheduled runs not started, by job and reason.",
+            "kino_job_timeouts_total": "Scheduled runs over their timeout, by job.",
+            "kino_job_duration_seconds": "Scheduled run duration, by job.",
+            "kino_leader": "1 when this process is the leader.",
+            "kino_leader_changes_total": "Leadership changes, by state.",
+            "kino_feed_bytes_total": "Feed bytes downloaded, and saved by 304 responses.",
+        }
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.counters = {}  # name -> {labels: value}
+            self.gauges = {}  # name -> {labels: value}
+            self.histograms = {}  # name -> {labels: [bucket counts.., sum, count]}
+            self.helps = dict(self.HELPS)
+            self.collectors = []
+
+        def describe(self, name, help_text):
+            self.helps[name] = help_text
+
+        def inc(self, name, value=1, **labels):
+            key = self.__labels_key(labels)
+            with self.lock:
+                counter = self.counters.setdefault(name, {})
+                counter[key] = counter.get(key, 0) + value
+
+        def set(self, name, value, **labels):
+            """ Mirror a value counted elsewhere (ex. functools.lru_cache info) """
+            key = self.__labels_key(labels)
+            with self.lock:
+                self.counters.setdefault(name, {})[key] = value
+
+        def gauge(self, name, value, **labels):
+            key = self.__labels_key(labels)
+            with self.lock:
+                self.gauges.setdefault(name, {})[key] = value
+
+        def observe(self, name, seconds, **labels):
+            key = self.__labels_key(labels)
+            with self.lock:
+                histogram = self.histograms.setdefault(name, {})
+                if key not in histogram:
+                    histogram[key] = [0] * (len(self.BUCKETS) + 3)  # +Inf, sum, count
+
+                values = histogram[key]
+                values[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+                values[-2] += seconds
+                values[-1] += 1
+
+        @contextlib.contextmanager
+        def timer(self, name, **labels):
+            start_time = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.observe(name, time.perf_counter() - start_time, **labels)
+
+        def cache_hit(self, cache):
+            self.inc("kino_cache_hits_total", cache=cache)
+
+        def cache_miss(self, cache):
+            self.inc("kino_cache_misses_total", cache=cache)
+
+        def register_collector(self, collector):
+            """ collector(metrics) is called right before rendering """
+            self.collectors.append(collector)
+
+        def render(self):
+            for collector in self.collectors:
+                collector(self)
+
+            with self.lock:
+                counters = {k: dict(v) for k, v in self.counters.items()}
+                gauges = {k: dict(v) for k, v in self.gauges.items()}
+                histograms = {
+                    k: {l: list(v) for l, v in h.items()}
+                    for k, h in self.histograms.items()
+                }
+
+            lines = []
+            for name in sorted(counters):
+                self.__render_header(lines, name, "counter")
+                for key, value in sorted(counters[name].items()):
+                    lines.append(f"{name}{self.__format_labels(key)} {value}")
+
+            for name in sorted(gauges):
+                self.__render_header(lines, name, "gauge")
+                for key, value in sorted(gauges[name].items()):
+                    lines.append(f"{name}{self.__format_labels(key)} {value}")
+
+            hit_ratio_name = "kino_cache_hit_ratio"
+            hits = counters.get("kino_cache_hits_total", {})
+            misses = counters.get("kino_cache_misses_total", {})
+            if hits or misses:
+                self.__render_header(lines, hit_ratio_name, "gauge")
+                for key in sorted(set(hits) | set(misses)):
+                    total = hits.get(key, 0) + misses.get(key, 0)
+                    ratio = hits.get(key, 0) / total if total else 0
+                    lines.append(f"{hit_ratio_name}{self.__format_labels(key)} {ratio}")
+
+            for name in sorted(histograms):
+                self.__render_header(lines, name, "histogram")
+                for key, values in sorted(histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.BUCKETS + ("+Inf",), values):
+                        cumulative += count
+                        bucket_key = key + (("le", str(bound)),)
+                        lines.append(
+                            f"{name}_bucket{self.__format_labels(bucket_key)} {cumulative}"
+                        )
+                    lines.append(f"{name}_sum{self.__format_labels(key)} {values[-2]}")
+                    lines.append(
+                        f"{name}_count{self.__format_labels(key)} {values[-1]}"
+                    )
+            return "\n".join(lines) + "\n"
+
+        def __render_header(self, lines, name, metric_type):
+            if name in self.helps:
+                lines.append(f"# HELP {name} {self.helps[name]}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        def __labels_key(self, labels):
+            return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+        def __format_labels(self, key):
+            if not key:
+                return ""
+            labels = ",".join(
+                '{}="{}"'.format(
+                    k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                )
+                for k, v in key
+            )
+            return "{" + labels + "}"
+
+    instance = None
+
+    def __init__(self):
+        if not Metrics.instance:
+            Metrics.instance = Metrics.__Metrics()
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = Metrics().render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scraping every few seconds would flood the activity log
+
+
+class MetricsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    server = MetricsServer((host, port), MetricsHandler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    return server
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from .data_handler import DataHandler
+from .keyword_matcher import KeywordMatcher
+
+
+class SkillRegistry(object):
+    class __Registry:
+
+        FNAME = "skills.json"
+
+        def __init__(self):
+            self.data_handler = DataHandler()
+            self.load()
+
+        def load(self):
+            registry = self.data_handler.read_file(self.FNAME)
+            if "fingerprint" not in registry:  # skills.json without fingerprint
+                registry = {"fingerprint": None, "skills": registry}
+
+            self.fingerprint = registry["fingerprint"]
+            self.list = registry.get("skills", {})
+            self.keywords = registry.get("keywords", None)
+            if self.keywords is None:
+                self.keywords = self.make_keywords(self.list)
+            self.compile_keywords()
+
+        def save(self, fingerprint, skills):
+            self.fingerprint = fingerprint
+            self.list = skills
+            self.keywords = self.make_keywords(skills)
+            self.compile_keywords()
+
+            self.data_handler.write_file(
+                self.FNAME,
+                {
+                    "fingerprint": self.fingerprint,
+                    "skills": self.list,
+                    "keywords": self.keywords,
+                },
+            )
+
+        def make_keywords(self, skills):
+            """ {func_name: keyword} - the pattern dict that NER.parse takes """
+            return {k: v.get("keyword", []) for k, v in skills.items()}
+
+        def compile_keywords(self):
+            """ One KeywordMatcher of every keyword pattern (a str, or a list of
+            keywords that must all be in the text), in the order of the skills """
+            keyword_lists = []
+            self.keyword_skills = []  # func_name of each keyword list
+            for func_name, patterns in self.keywords.items():
+                for pattern in patterns or []:
+                    if isinstance(pattern, str):
+                        pattern = [pattern]
+                    keyword_lists.append(pattern)
+                    self.keyword_skills.append(func_name)
+            self.matcher = KeywordMatcher(keyword_lists)
+
+        def match(self, text):
+            """ func_name of the first skill with a keyword pattern in the text.
+            (same as NER.parse(skill_keywords, text)) """
+            matches = self.matcher.match(text)
+            if not matches:
+                return None
+            return self.keyword_skills[matches[0]]
+
+    instance = None
+
+    def __init__(self):
+        if not SkillRegistry.instance:
+            SkillRegistry.instance = SkillRegistry.__Registry()
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
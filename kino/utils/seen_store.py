@@ -0,0 +1,129 @@
+import collections
+import os
+import threading
+import time
+
+from .data_handler import DataHandler
+
+
+class SeenStore(object):
+    """ Keys seen before (feed links, tweet ids), oldest first.
+
+    Bounded by max_size and max_age (Unit: Second), persisted as an append-only
+    log (data/seen/<name>.log: 'timestamp<TAB>key' lines) that is rewritten
+    when it grows past twice the kept keys. One store per name in a process.
+    """
+
+    class __Store:
+
+        DIR_NAME = "seen"
+        COMPACT_RATIO = 2
+        COMPACT_MIN_LINES = 1000
+
+        def __init__(self, name, max_size, max_age, path=None):
+            if path is None:
+                path = os.path.join(
+                    DataHandler().data_path, self.DIR_NAME, f"{name}.log"
+                )
+            self.path = path
+            self.max_size = max_size
+            self.max_age = max_age
+
+            self.lock = threading.Lock()
+            self.seen = collections.OrderedDict()  # key -> timestamp
+            self.pending = []  # (key, timestamp), added after the last save
+            self.log_lines = 0
+            self.__load()
+
+        def contains(self, key, now=None):
+            timestamp = self.seen.get(self.__key(key), None)
+            if timestamp is None:
+                return False
+            if now is None:
+                now = time.time()
+            return now - timestamp <= self.max_age
+
+        def add(self, key, now=None):
+            """ Add the key, or move it to the end when it is seen again """
+            key = self.__key(key)
+            if now is None:
+                now = time.time()
+
+            with self.lock:
+                self.seen.pop(key, None)
+                self.seen[key] = now
+                self.pending.append((key, now))
+                self.__evict(now)
+
+        def save(self):
+            with self.lock:
+                if self.log_lines + len(self.pending) > max(
+                    self.COMPACT_MIN_LINES, self.COMPACT_RATIO * len(self.seen)
+                ):
+                    self.__write(self.seen.items(), mode="w")
+                    self.log_lines = len(self.seen)
+                elif self.pending:
+                    self.__write(self.pending, mode="a")
+                    self.log_lines += len(self.pending)
+                self.pending = []
+
+        def __len__(self):
+            return len(self.seen)
+
+        def __load(self):
+            if not os.path.exists(self.path):
+                return
+
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    timestamp, _, key = line.rstrip("\n").partition("\t")
+                    try:
+                        timestamp = float(timestamp)
+                    except ValueError:
+                        continue
+
+                    self.log_lines += 1
+                    self.seen.pop(key, None)
+                    self.seen[key] = timestamp
+            self.__evict(time.time())
+
+        def __evict(self, now):
+            while self.seen:
+                key, timestamp = next(iter(self.seen.items()))
+                if len(self.seen) <= self.max_size and now - timestamp <= self.max_age:
+                    break
+                self.seen.popitem(last=False)
+
+        def __write(self, items, mode):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            path = self.path
+            if mode == "w":
+                path += ".tmp"
+            with open(path, mode, encoding="utf-8") as f:
+                f.writelines(f"{timestamp:.0f}\t{key}\n" for key, timestamp in items)
+            if mode == "w":
+                os.replace(path, self.path)
+
+        @staticmethod
+        def __key(key):
+            return str(key).replace("\n", " ")
+
+    MAX_SIZE = 100000
+    MAX_AGE = 90 * 24 * 60 * 60  # Unit (Second)
+
+    instances = {}
+
+    def __init__(self, name, max_size=MAX_SIZE, max_age=MAX_AGE, path=None):
+        if name not in SeenStore.instances:
+            SeenStore.instances[name] = SeenStore.__Store(name, max_size, max_age, path)
+        self.instance = SeenStore.instances[name]
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
+
+    def __contains__(self, key):
+        return self.instance.contains(key)
+
+    def __len__(self):
+        return len(self.instance)
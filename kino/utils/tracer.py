@@ -0,0 +1,131 @@
+import collections
+import contextlib
+import threading
+import time
+
+from .logger import Logger
+
+
+class Trace(object):
+    """ Stage durations of one event (a message, a presence change, a job ..) """
+
+    def __init__(self, name):
+        self.name = name
+        self.start_time = time.perf_counter()
+        self.stages = collections.OrderedDict()
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0) + seconds
+
+    @property
+    def total(self):
+        return time.perf_counter() - self.start_time
+
+    def __str__(self):
+        stages = ", ".join(f"{k}: {v * 1000:.1f}ms" for k, v in self.stages.items())
+        return f"{self.name} total: {self.total * 1000:.1f}ms ({stages})"
+
+
+class Tracer(object):
+    class __Tracer:
+
+        MAX_SAMPLES = 1000
+        LOG_EVERY = 100
+
+        def __init__(self):
+            self.logger = Logger().get_logger()
+            self.lock = threading.Lock()
+            self.local = threading.local()
+
+            self.samples = {}  # key -> deque of seconds
+            self.trace_count = 0
+
+        @contextlib.contextmanager
+        def trace(self, name):
+            trace = Trace(name)
+            prev_trace = getattr(self.local, "trace", None)
+            self.local.trace = trace
+            try:
+                yield trace
+            finally:
+                self.local.trace = prev_trace
+
+                self.record(f"{name}.total", trace.total)
+                for stage, seconds in trace.stages.items():
+                    self.record(f"{name}.{stage}", seconds)
+                self.logger.info(f"trace - {trace}")
+
+                with self.lock:
+                    self.trace_count += 1
+                    log_summary = self.trace_count % self.LOG_EVERY == 0
+                if log_summary:
+                    self.logger.info("trace summary\n" + self.format_summary())
+
+        @contextlib.contextmanager
+        def stage(self, name):
+            """ Nested stages are exclusive: the time of an inner stage
+            (ex. send_message in a skill) is not counted to the outer one. """
+            stages = getattr(self.local, "stages", None)
+            if stages is None:
+                stages = self.local.stages = []
+
+            start_time = time.perf_counter()
+            stages.append(0)  # seconds spent in inner stages
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - start_time
+                seconds = elapsed - stages.pop()
+                if stages:
+                    stages[-1] += elapsed
+
+                trace = getattr(self.local, "trace", None)
+                if trace is None:
+                    self.record(name, seconds)
+                else:
+                    trace.add(name, seconds)
+
+        def record(self, key, seconds):
+            with self.lock:
+                if key not in self.samples:
+                    self.samples[key] = collections.deque(maxlen=self.MAX_SAMPLES)
+                self.samples[key].append(seconds)
+
+        def summary(self, percentiles=(50, 90, 99)):
+            """ {key: {"count": n, "p50": ms, "p90": ms, "p99": ms, "max": ms}} """
+            with self.lock:
+                samples = {k: sorted(v) for k, v in self.samples.items()}
+
+            summary = collections.OrderedDict()
+            for key in sorted(samples):
+                values = samples[key]
+                stats = {"count": len(values)}
+                for p in percentiles:
+                    rank = max(0, int(round(p / 100 * len(values))) - 1)
+                    stats[f"p{p}"] = values[rank] * 1000
+                stats["max"] = values[-1] * 1000
+                summary[key] = stats
+            return summary
+
+        def format_summary(self):
+            lines = []
+            for key, stats in self.summary().items():
+                lines.append(
+                    f" - {key} : {stats['count']} / {stats['p50']:.1f} / "
+                    f"{stats['p90']:.1f} / {stats['p99']:.1f} / {stats['max']:.1f}"
+                )
+            return "\n".join(lines)
+
+        def reset(self):
+            with self.lock:
+                self.samples = {}
+                self.trace_count = 0
+
+    instance = None
+
+    def __init__(self):
+        if not Tracer.instance:
+            Tracer.instance = Tracer.__Tracer()
+
+    def __getattr__(self, name):
+        return getattr(self.instance, name)
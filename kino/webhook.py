@@ -4,13 +4,13 @@ import json
 
 from .dialog.dialog_manager import DialogManager
 
+from .functions import Summary
+from .functions import TogglManager
+from .functions import TwitterManager
+
 from .slack.slackbot import SlackerAdapter
 from .slack.template import MsgTemplate
 
-from .skills.toggl import TogglManager
-from .skills.twitter import TwitterManager
-from .skills.summary import Summary
-
 from .utils.arrow import ArrowUtil
 from .utils.data_handler import DataHandler
 from .utils.logger import DataLogger
@@ -1,20 +1,103 @@
 # coding: UTF-8
 
+import argparse
+import sys
+
 from hbconfig import Config
 
 from kino import KinoBot
+from kino import benchmark_predictor
+from kino import benchmark_skill_data
+from kino import benchmark_templates
 from kino import prepare_feed_data
 from kino import prepare_skill_data
+from kino import profile_import_time
 from kino import register_skills
+from kino import replay_messages
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--profile_import",
+        action="store_true",
+        help="print import time of kino modules (python -X importtime) and exit",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        help="replay message logs through the router (ex. 'log/message/*.log') and exit",
+    )
+    parser.add_argument(
+        "--replay_synthetic",
+        type=int,
+        default=0,
+        help="replay N synthetic messages made of skill keywords instead of logs",
+    )
+    parser.add_argument(
+        "--replay_speed",
+        type=float,
+        default=0,
+        help="speed-up of logged message intervals (0: as fast as possible)",
+    )
+    parser.add_argument(
+        "--replay_skill_cost",
+        type=float,
+        default=0,
+        help="seconds that each stubbed skill takes",
+    )
+    parser.add_argument(
+        "--benchmark_templates",
+        type=int,
+        default=0,
+        help="render MsgResource templates from N threads and print the throughput",
+    )
+    parser.add_argument(
+        "--benchmark_predictor",
+        type=int,
+        default=0,
+        help="time N skill predictions with a KNN fitted per call and with the kept model",
+    )
+    parser.add_argument(
+        "--benchmark_skill_data",
+        type=int,
+        default=0,
+        help="load a synthetic raw_data log of N lines for the Skill Predictor",
+    )
+    args = parser.parse_args()
+
+    if args.profile_import:
+        profile_import_time("kino")
+        sys.exit(0)
+
+    if args.benchmark_templates:
+        benchmark_templates(threads=args.benchmark_templates)
+        sys.exit(0)
+
+    if args.benchmark_predictor:
+        benchmark_predictor(count=args.benchmark_predictor)
+        sys.exit(0)
+
+    if args.benchmark_skill_data:
+        benchmark_skill_data(lines=args.benchmark_skill_data)
+        sys.exit(0)
+
     register_skills()
 
+    if args.replay or args.replay_synthetic:
+        replay_messages(
+            pattern=args.replay,
+            synthetic=args.replay_synthetic,
+            speed=args.replay_speed,
+            skill_cost=args.replay_skill_cost,
+        )
+        sys.exit(0)
+
     if Config.bot.get("SKILL_PREDICT", False):
         prepare_skill_data()
     if Config.bot.get("FEED_CLASSIFIER", False):
         prepare_feed_data()
 
     kino_bot = KinoBot()
-    kino_bot.start_session(init=True)
+    kino_bot.start_session()
@@ -0,0 +1,24 @@
+import unittest
+
+from kino.utils.backoff import Backoff
+
+
+class BackoffTest(unittest.TestCase):
+    def test_exponential(self):
+        backoff = Backoff(base=1, max_delay=300, jitter=0)
+        delays = [backoff.next() for _ in range(10)]
+        self.assertEqual(delays, [1, 2, 4, 8, 16, 32, 64, 128, 256, 300])
+
+    def test_jitter(self):
+        backoff = Backoff(base=10, max_delay=300, jitter=0.5)
+        for _ in range(100):
+            backoff.reset()
+            delay = backoff.next()
+            self.assertEqual(5 <= delay <= 10, True)
+
+    def test_reset(self):
+        backoff = Backoff(base=1, jitter=0)
+        backoff.next()
+        backoff.next()
+        backoff.reset()
+        self.assertEqual(backoff.next(), 1)
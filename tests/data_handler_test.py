@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+from hbconfig import Config
+from kino.utils.data_handler import DataHandler
+
+
+AWESOME_FEEDS = """# Awesome Feeds
+
+## Tech
+- [**Blog**](https://blog.com): https://blog.com/feed
+- [News](https://news.com): https://news.com/rss
+"""
+
+
+class DataHandlerTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_handler = DataHandler()
+        self.data_handler.data_path = self.tmp_dir.name + "/"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_feeds(self, response=None, error=None, refresh=False):
+        with mock.patch(
+            "kino.utils.data_handler.requests.get",
+            return_value=response,
+            side_effect=error,
+        ) as get:
+            feeds = self.data_handler.read_feeds(refresh=refresh)
+        return feeds, get
+
+    def test_read_feeds_cached(self):
+        response = mock.Mock(
+            status_code=200, text=AWESOME_FEEDS, headers={"ETag": '"v1"'}
+        )
+        feeds, get = self.read_feeds(response)
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(
+            feeds["Tech"],
+            [
+                ("Blog", "https://blog.com/feed", True),
+                ("News", "https://news.com/rss", False),
+            ],
+        )
+
+        cached_feeds, get = self.read_feeds(response)
+        self.assertEqual(get.call_count, 0)
+        self.assertEqual(cached_feeds, feeds)
+
+        not_modified = mock.Mock(status_code=304, text="", headers={})
+        refreshed_feeds, get = self.read_feeds(not_modified, refresh=True)
+        self.assertEqual(get.call_args[1]["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(refreshed_feeds, feeds)
+
+    def test_read_feeds_offline(self):
+        response = mock.Mock(status_code=200, text=AWESOME_FEEDS, headers={})
+        feeds, _ = self.read_feeds(response)
+
+        offline_feeds, get = self.read_feeds(
+            error=requests.ConnectionError("offline"), refresh=True
+        )
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(offline_feeds, feeds)
+
+        self.tmp_dir.cleanup()
+        with self.assertRaises(requests.ConnectionError):
+            self.read_feeds(error=requests.ConnectionError("offline"))
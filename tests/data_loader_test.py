@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+
+import numpy as np
+from kino.utils.data_loader import LogReader
+from kino.utils.data_loader import SampleRingBuffer
+from kino.utils.data_loader import SkillDataLoader
+from kino.utils.keyword_matcher import KeywordMatcher
+
+
+class LogReaderTest(unittest.TestCase):
+    def test_read_new_lines(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = tmp_dir + "/feed.log"
+            reader = LogReader(path)
+            self.assertEqual(list(reader.read_lines()), [])
+
+            with open(path, "a") as f:
+                f.write("line 1\nline 2\nline")
+            self.assertEqual(list(reader.read_lines()), ["line 1", "line 2"])
+
+            with open(path, "a") as f:
+                f.write(" 3\n")
+            self.assertEqual(list(reader.read_lines()), ["line 3"])
+            self.assertEqual(list(reader.read_lines()), [])
+
+            with open(path, "w") as f:  # rotated
+                f.write("new\n")
+            self.assertEqual(list(reader.read_lines()), ["new"])
+
+
+class SampleRingBufferTest(unittest.TestCase):
+    def test_keep_latest_samples(self):
+        samples = SampleRingBuffer(3, 2)
+        samples.append([1, 1], 1)
+        samples.append([2, 2], 2)
+
+        data_X, data_y = samples.make_data_set()
+        self.assertEqual(data_X.tolist(), [[1, 1], [2, 2]])
+        self.assertEqual(data_y.tolist(), [1, 2])
+
+        samples.extend([[3, 3], [4, 4]], [3, 4])
+        self.assertEqual(len(samples), 3)
+        data_X, data_y = samples.make_data_set()
+        self.assertEqual(sorted(data_y.tolist()), [2, 3, 4])
+
+        ordered_X, ordered_y = samples.ordered()
+        self.assertEqual(ordered_X.tolist(), [[2, 2], [3, 3], [4, 4]])
+        self.assertEqual(ordered_y.tolist(), [2, 3, 4])
+
+    def test_views_are_not_copied(self):
+        samples = SampleRingBuffer(400, 5)
+        for i in range(1000):
+            samples.append(
+                np.array([i % 7, i % 24, i % 60, i % 5, 0], dtype=np.int32), i % 5
+            )
+
+        data_X, data_y = samples.make_data_set()
+        self.assertEqual(data_X.shape, (400, 5))
+        self.assertEqual(data_X.dtype, np.int32)
+        self.assertIs(data_X.base, samples.X)
+        self.assertIs(data_y.base, samples.y)
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_match(self):
+        matcher = KeywordMatcher([["집앞", "버스"], ["주간", "커밋"], ["미세먼지"]])
+
+        self.assertEqual(matcher.match("집앞 버스 언제 와?"), (0,))
+        self.assertEqual(matcher.match("버스 언제 와?"), ())
+        self.assertEqual(matcher.match("주간 커밋이랑 미세먼지"), (1, 2))
+        self.assertEqual(matcher.match(""), ())
+
+    def test_overlapping_keywords(self):
+        keyword_lists = [["ab", "bc"], ["abc"], ["b", "cd"], ["bcd", "a"]]
+        matcher = KeywordMatcher(keyword_lists)
+
+        for text in ["abcd", "abc", "xbcdxa", "ab bc", "abd", "cab"]:
+            expected = tuple(
+                idx
+                for idx, keyword_list in enumerate(keyword_lists)
+                if all(k in text for k in keyword_list)
+            )
+            self.assertEqual(matcher.match(text), expected)
+
+
+class SkillDataLoaderTest(unittest.TestCase):
+    def test_convert_data(self):
+        data_loader = SkillDataLoader()
+        line = "[INFO|route.py:100] 2018-03-10 09:05:00,000 > raw input: 미세먼지"
+
+        x = data_loader.convert_data(line, 3)
+        self.assertEqual(x.tolist(), [6, 9, 5, 3, 1])
+        self.assertIsNone(data_loader.convert_data("raw input: 미세먼지", 3))
@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from hbconfig import Config
+from kino.skills.feed import FeedClassifier
+
+
+def write_log(path, data):
+    with open(path, "a") as f:
+        for d in data:
+            f.write(f"2018-03-05 12:00:00,000 > {json.dumps(d)}\n")
+
+
+class FeedClassifierTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.feed_log = self.tmp_dir.name + "/feed.log"
+        self.pocket_log = self.tmp_dir.name + "/pocket.log"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_classifier(self):
+        data_handler = types.SimpleNamespace(
+            data_path=self.tmp_dir.name + "/", log_data_path=self.tmp_dir.name + "/"
+        )
+        with mock.patch(
+            "kino.skills.feed.DataHandler", return_value=data_handler
+        ), mock.patch("kino.utils.data_loader.DataHandler", return_value=data_handler):
+            return FeedClassifier()
+
+    def test_learn_incrementally(self):
+        feed = [
+            {"category": "[ML] - Blog", "title": f"deep learning paper {i}"}
+            for i in range(50)
+        ] + [
+            {"category": "[News] - Daily", "title": f"celebrity gossip {i}"}
+            for i in range(50)
+        ]
+        write_log(self.feed_log, feed)
+        write_log(self.pocket_log, [{"title": f["title"]} for f in feed[:50]])
+
+        classifier = self.make_classifier()
+        self.assertEqual(
+            classifier.state["offsets"]["feed.log"], os.path.getsize(self.feed_log)
+        )
+
+        scores = classifier.predict_proba(
+            [
+                ("[ML] - Blog", "new deep learning paper"),
+                ("[News] - Daily", "new celebrity gossip"),
+            ]
+        )
+        self.assertGreater(scores[0], scores[1])
+
+        # saved after it was learned, and only the new lines are read
+        write_log(self.pocket_log, [{"title": "celebrity gossip 0"}])
+        with mock.patch("kino.skills.feed.SGDClassifier.partial_fit") as partial_fit:
+            classifier = self.make_classifier()
+        self.assertEqual(partial_fit.call_args[0][1], [1])
+
+    def test_not_trained(self):
+        classifier = self.make_classifier()
+        self.assertEqual(classifier.predict([("[ML] - Blog", "paper")]), [False])
+
+    def test_stale_model_file(self):
+        # a class that is not in the installed version, ex. after an upgrade
+        with open(self.tmp_dir.name + "/" + FeedClassifier.MODEL_FILE_NAME, "wb") as f:
+            f.write(b"ckino.skills.feed\nRemovedClassifier\n.")
+
+        classifier = self.make_classifier()
+        self.assertEqual(classifier.state["trained"], False)
+
+    def test_skip_titles_saved_by_bot(self):
+        feed = [
+            {"category": "[News] - Daily", "title": f"gossip {i}"} for i in range(5)
+        ]
+        write_log(self.feed_log, feed)
+
+        classifier = self.make_classifier()
+        with mock.patch("kino.skills.feed.Pocket"):
+            saved = classifier.save_to_pocket("[News] - Daily", "gossip 0", "http://a")
+        self.assertEqual(saved, True)
+        classifier.save_state()
+
+        # the Pocket webhook logs the entry that the bot saved
+        write_log(self.pocket_log, [{"title": "gossip 0"}])
+        with mock.patch("kino.skills.feed.SGDClassifier.partial_fit") as partial_fit:
+            classifier = self.make_classifier()
+        self.assertEqual(partial_fit.call_count, 0)
+        self.assertNotIn("gossip 0", classifier.state["pocket_titles"])
+
+    def test_learn_in_chunks(self):
+        feed = [{"category": "[ML] - Blog", "title": f"paper {i}"} for i in range(25)]
+        write_log(self.feed_log, feed)
+        write_log(self.pocket_log, [{"title": "paper 0"}])
+
+        with mock.patch.object(FeedClassifier, "CHUNK_SIZE", 10), mock.patch(
+            "kino.skills.feed.SGDClassifier.partial_fit"
+        ) as partial_fit:
+            classifier = self.make_classifier()
+
+        self.assertEqual(
+            [len(c[0][1]) for c in partial_fit.call_args_list], [10, 10, 5]
+        )
+        self.assertEqual(partial_fit.call_args_list[0][0][1][0], 1)  # 'paper 0'
+        self.assertEqual(
+            classifier.state["offsets"]["feed.log"], os.path.getsize(self.feed_log)
+        )
@@ -1,6 +1,9 @@
-
+import threading
+import time
 import unittest
+from unittest import mock
 
+import feedparser
 from hbconfig import Config
 from kino.skills.feed import FeedNotifier
 
@@ -16,3 +19,133 @@ class FeedNotifierTest(unittest.TestCase):
             "News", ("NewsPeppermint", "http://newspeppermint.com/feed/")
         )
         print(notify_data)
+
+    def test_fetch_all(self):
+        lock = threading.Lock()
+        running = {}
+        max_running = {}
+
+        def fetch(feed_url, etag=None, modified=None):
+            host = feed_url.split("/")[2]
+            with lock:
+                running[host] = running.get(host, 0) + 1
+                max_running[host] = max(max_running.get(host, 0), running[host])
+            time.sleep(0.05)
+            with lock:
+                running[host] -= 1
+            if feed_url.endswith("error"):
+                raise ValueError(feed_url)
+            return {"url": feed_url}
+
+        feed_urls = [f"http://a.com/{i}" for i in range(6)] + [
+            "http://b.com/0",
+            "http://b.com/error",
+        ]
+        with mock.patch.object(FeedNotifier, "fetch", side_effect=fetch), mock.patch(
+            "kino.skills.feed.DataHandler.read_feeds", return_value={}
+        ):
+            feed = FeedNotifier()
+            fetched_feeds = feed.fetch_all(feed_urls)
+
+        self.assertEqual([f["url"] for f, _ in fetched_feeds[:7]], feed_urls[:7])
+        self.assertEqual(isinstance(fetched_feeds[7][1], ValueError), True)
+        self.assertLessEqual(max_running["a.com"], FeedNotifier.MAX_FETCH_PER_HOST)
+
+    def test_fetch_not_modified(self):
+        response = mock.Mock(status_code=304, headers={}, content=b"")
+        with mock.patch(
+            "kino.skills.feed.requests.get", return_value=response
+        ) as get, mock.patch(
+            "kino.skills.feed.DataHandler.read_feeds", return_value={}
+        ):
+            feed = FeedNotifier()
+            f = feed.fetch(
+                "http://a.com/feed", etag='"v1"', modified="Mon, 05 Mar 2018"
+            )
+
+        headers = get.call_args[1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 05 Mar 2018")
+        self.assertEqual(f.status, 304)
+        self.assertEqual(f.entries, [])
+
+    def test_notify_all_writes_cache_once(self):
+        feeds = {"News": [(f"feed{i}", f"http://a.com/{i}", False) for i in range(3)]}
+
+        def fetch(feed_url, etag=None, modified=None):
+            if feed_url.endswith("0"):
+                return feedparser.FeedParserDict(status=304, entries=[])
+            return feedparser.FeedParserDict(status=200, entries=[])
+
+        with mock.patch(
+            "kino.skills.feed.DataHandler.read_feeds", return_value=feeds
+        ), mock.patch.object(FeedNotifier, "fetch", side_effect=fetch), mock.patch(
+            "kino.skills.feed.DataHandler.read_cache", return_value={}
+        ) as read_cache, mock.patch(
+            "kino.skills.feed.DataHandler.write_file"
+        ) as write_file, mock.patch.object(
+            FeedNotifier, "notify"
+        ):
+            feed = FeedNotifier()
+            feed.notify_all()
+
+        self.assertEqual(read_cache.call_count, 1)
+        self.assertEqual(write_file.call_count, 1)
+
+    def test_keep_validators_of_failed_feed(self):
+        feeds = {"News": [(f"feed{i}", f"http://a.com/{i}", False) for i in range(2)]}
+        cache_data = {}
+
+        def fetch(feed_url, etag=None, modified=None):
+            return feedparser.FeedParserDict(
+                status=200, entries=[], etag=f'"{feed_url}"', modified=None, bytes=10
+            )
+
+        def notify(category, feed, results, predictions=None):
+            if feed[1].endswith("1"):
+                raise ValueError("slack error")
+
+        with mock.patch(
+            "kino.skills.feed.DataHandler.read_feeds", return_value=feeds
+        ), mock.patch.object(FeedNotifier, "fetch", side_effect=fetch), mock.patch(
+            "kino.skills.feed.DataHandler.read_cache", return_value=cache_data
+        ), mock.patch(
+            "kino.skills.feed.DataHandler.write_file"
+        ), mock.patch.object(
+            FeedNotifier, "notify", side_effect=notify
+        ):
+            feed = FeedNotifier()
+            feed.notify_all()
+
+        self.assertEqual(list(cache_data["http_cache"]), ["http://a.com/0"])
+
+    def test_predict_once_per_run(self):
+        feeds = {"News": [(f"feed{i}", f"http://a.com/{i}", False) for i in range(2)]}
+
+        def get_notify_list(category, feed, f=None, cache_data=None):
+            entry = (f"[{category}] - {feed[0]} \ntitle", feed[1] + "/1", "")
+            return [(entry, False)]
+
+        with mock.patch(
+            "kino.skills.feed.DataHandler.read_feeds", return_value=feeds
+        ), mock.patch.object(
+            FeedNotifier,
+            "fetch",
+            return_value=feedparser.FeedParserDict(status=200, entries=[]),
+        ), mock.patch.object(
+            FeedNotifier, "get_notify_list", side_effect=get_notify_list
+        ), mock.patch(
+            "kino.skills.feed.DataHandler.read_cache", return_value={}
+        ), mock.patch(
+            "kino.skills.feed.DataHandler.write_file"
+        ), mock.patch(
+            "kino.skills.feed.MsgTemplate.make_feed_template"
+        ):
+            feed = FeedNotifier(slackbot=mock.Mock())
+            feed.feed_classifier = mock.Mock()
+            feed.feed_classifier.predict.return_value = [False, False]
+            feed.notify_all()
+
+        self.assertEqual(feed.feed_classifier.predict.call_count, 1)
+        self.assertEqual(len(feed.feed_classifier.predict.call_args[0][0]), 2)
+        self.assertEqual(feed.slackbot.send_message.call_count, 2)
@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+
+import requests
+from hbconfig import Config
+from kino.slack.slackbot import GiphyClient
+from kino.slack.slackbot import SlackerAdapter
+
+
+def giphy_response(status_code=200, urls=("http://gif/1",)):
+    data = [{"images": {"downsized": {"url": url}}} for url in urls]
+    return mock.Mock(status_code=status_code, json=lambda: {"data": data})
+
+
+class GiphyClientTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        GiphyClient.cache.clear()
+
+    def tearDown(self):
+        GiphyClient.cache.clear()
+
+    def test_cache_hit(self):
+        with mock.patch(
+            "kino.slack.slackbot.requests.get", return_value=giphy_response()
+        ) as get:
+            giphy = GiphyClient(slackbot=mock.Mock())
+            self.assertEqual(giphy.search_urls("hello"), ["http://gif/1"])
+            self.assertEqual(giphy.search_urls("hello"), ["http://gif/1"])
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(get.call_args[1]["timeout"], GiphyClient.TIMEOUT)
+
+    def test_cache_ttl(self):
+        with mock.patch(
+            "kino.slack.slackbot.requests.get", return_value=giphy_response()
+        ) as get, mock.patch("kino.slack.slackbot.time.time") as now:
+            giphy = GiphyClient(slackbot=mock.Mock())
+            now.return_value = 1000
+            giphy.search_urls("hello")
+            now.return_value = 1000 + GiphyClient.CACHE_TTL - 1
+            giphy.search_urls("hello")
+            self.assertEqual(get.call_count, 1)
+
+            now.return_value = 1000 + GiphyClient.CACHE_TTL + 1
+            giphy.search_urls("hello")
+            self.assertEqual(get.call_count, 2)
+
+    def test_cache_lru(self):
+        with mock.patch(
+            "kino.slack.slackbot.requests.get", return_value=giphy_response()
+        ), mock.patch.object(GiphyClient, "CACHE_SIZE", 2):
+            giphy = GiphyClient(slackbot=mock.Mock())
+            for q in ["a", "b", "a", "c"]:
+                giphy.search_urls(q)
+
+        self.assertEqual(list(GiphyClient.cache), ["a", "c"])  # 'b' is the oldest
+
+    def test_error_not_cached(self):
+        responses = [
+            requests.ConnectTimeout("timeout"),
+            giphy_response(status_code=500),
+            giphy_response(),
+        ]
+        with mock.patch(
+            "kino.slack.slackbot.requests.get", side_effect=responses
+        ) as get:
+            giphy = GiphyClient(slackbot=mock.Mock())
+            self.assertEqual(giphy.search_urls("hello"), [])
+            self.assertEqual(giphy.search_urls("hello"), [])
+            self.assertEqual(giphy.search_urls("hello"), ["http://gif/1"])
+
+        self.assertEqual(get.call_count, 3)
+
+    def test_attach_async(self):
+        futures = []
+        attach_async = GiphyClient.attach_async
+
+        def attach_and_keep_future(giphy, q, message):
+            futures.append(attach_async(giphy, q, message))
+            return futures[-1]
+
+        with mock.patch("kino.slack.slackbot.Slacker") as slacker_class, mock.patch(
+            "kino.slack.slackbot.DataHandler"
+        ), mock.patch(
+            "kino.slack.slackbot.random.randint", return_value=100
+        ), mock.patch.object(
+            GiphyClient, "search_urls", return_value=["http://gif/1"]
+        ), mock.patch.object(
+            GiphyClient, "attach_async", attach_and_keep_future
+        ):
+            slacker = slacker_class.return_value
+            slacker.chat.post_message.return_value = mock.Mock(
+                body={"channel": "C1", "ts": "1.0"}
+            )
+
+            slackbot = SlackerAdapter()
+            slackbot.send_message(text="hello")
+            futures[0].result(5)
+
+        # the text is posted first, then the gif is attached to it
+        self.assertEqual(
+            [name for name, _, _ in slacker.method_calls],
+            ["chat.post_message", "chat.update"],
+        )
+        update_kwargs = slacker.chat.update.call_args[1]
+        self.assertEqual(update_kwargs["channel"], "C1")
+        self.assertEqual(update_kwargs["ts"], "1.0")
+        self.assertEqual(update_kwargs["text"], "hello")
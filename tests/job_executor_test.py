@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from hbconfig import Config
+from kino.background.executor import JobExecutor
+
+
+class JobExecutorTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        self.executor = JobExecutor()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def slow_job(self):
+        self.release.wait(5)
+        return "done"
+
+    def test_max_instances(self):
+        first = self.executor.submit("max_instances", self.slow_job, coalesce=False)
+        second = self.executor.submit("max_instances", self.slow_job, coalesce=False)
+        self.assertNotEqual(first, None)
+        self.assertEqual(second, None)
+
+        self.release.set()
+        self.assertEqual(first.result(5), "done")
+
+        third = self.executor.submit("max_instances", self.slow_job)
+        self.assertEqual(third.result(5), "done")
+
+    def fill_workers(self):
+        # submit busy jobs until one of them does not start
+        for i in range(100):
+            started = threading.Event()
+
+            def busy_job():
+                started.set()
+                self.release.wait(5)
+
+            self.executor.submit(f"busy{i}", busy_job)
+            if not started.wait(0.5):
+                return
+        self.fail("workers are not busy")
+
+    def test_coalesce(self):
+        # every worker is busy, so the runs stay queued
+        self.fill_workers()
+
+        futures = [
+            self.executor.submit("coalesce", self.slow_job, max_instances=3)
+            for _ in range(10)
+        ]
+        self.assertEqual(len([f for f in futures if f is not None]), 1)
+        self.release.set()
+
+    def test_counts(self):
+        started = threading.Event()
+
+        def job():
+            started.set()
+            self.release.wait(5)
+
+        future = self.executor.submit("counts", job)
+        started.wait(5)
+        self.assertGreaterEqual(self.executor.running_count, 1)
+
+        self.release.set()
+        future.result(5)
+        self.assertEqual(self.executor.queued_count, 0)
+
+    def test_timeout(self):
+        future = self.executor.submit("timeout", self.slow_job, timeout=0.1)
+        time.sleep(0.3)
+
+        # over the timeout, but still running: the next run is skipped
+        self.assertEqual(self.executor.submit("timeout", self.slow_job), None)
+        self.assertGreaterEqual(self.executor.running_count, 1)
+
+        self.release.set()
+        self.assertEqual(future.result(5), "done")
+        self.assertEqual(
+            self.executor.submit("timeout", self.slow_job).result(5), "done"
+        )
+
+    def test_callback(self):
+        results = []
+        future = self.executor.submit(
+            "callback", lambda x: x * 2, kwargs={"x": 21}, callback=results.append
+        )
+        future.result(5)
+        self.assertEqual(results, [42])
@@ -0,0 +1,70 @@
+import datetime
+import unittest
+
+from hbconfig import Config
+from kino.background import schedule
+from kino.background.job_store import JobStore
+
+
+class JobStoreTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        self.job_store = JobStore()
+        self.now = datetime.datetime(2018, 3, 6, 0, 10)
+
+    def make_daily_job(self, at_time, next_run):
+        job = schedule.Job(1).day.at(at_time)
+        job.period = datetime.timedelta(days=1)
+        job.next_run = next_run
+        return job
+
+    def set_last_run(self, job_id, last_run):
+        self.job_store.last_runs[job_id] = last_run.timestamp()
+
+    def test_missed_at_time(self):
+        # restarted at 00:10, the bot was down at 23:55
+        job = self.make_daily_job("23:55", datetime.datetime(2018, 3, 6, 23, 55))
+        self.set_last_run("test:sync", datetime.datetime(2018, 3, 4, 23, 55))
+
+        self.assertEqual(
+            self.job_store.is_misfired("test:sync", job, now=self.now, grace_time=3600),
+            True,
+        )
+        self.assertEqual(
+            self.job_store.is_misfired("test:sync", job, now=self.now, grace_time=60),
+            False,
+        )
+
+    def test_already_run(self):
+        job = self.make_daily_job("23:55", datetime.datetime(2018, 3, 6, 23, 55))
+        self.set_last_run("test:ran", datetime.datetime(2018, 3, 5, 23, 55, 1))
+        self.assertEqual(
+            self.job_store.is_misfired("test:ran", job, now=self.now, grace_time=3600),
+            False,
+        )
+
+    def test_never_run(self):
+        job = self.make_daily_job("23:55", datetime.datetime(2018, 3, 6, 23, 55))
+        self.assertEqual(
+            self.job_store.is_misfired(
+                "test:never", job, now=self.now, grace_time=3600
+            ),
+            False,
+        )
+
+    def test_missed_interval(self):
+        job = schedule.Job(20).minutes
+        job.period = datetime.timedelta(minutes=20)
+        job.next_run = self.now + job.period
+
+        self.set_last_run("test:feed", self.now - datetime.timedelta(minutes=50))
+        self.assertEqual(
+            self.job_store.is_misfired("test:feed", job, now=self.now, grace_time=3600),
+            True,
+        )
+
+        self.set_last_run("test:feed", self.now - datetime.timedelta(minutes=10))
+        self.assertEqual(
+            self.job_store.is_misfired("test:feed", job, now=self.now, grace_time=3600),
+            False,
+        )
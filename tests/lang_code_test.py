@@ -0,0 +1,42 @@
+import unittest
+
+import langid
+from hbconfig import Config
+from kino.nlp.lang_code import LangCode
+
+
+class LangCodeTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        print(Config)
+
+    def test_guess_by_script(self):
+        self.assertEqual(LangCode.guess_by_script("오늘 날씨 어때?"), "ko")
+        self.assertEqual(LangCode.guess_by_script("날씨 알려줘 kino"), "ko")
+        self.assertEqual(LangCode.guess_by_script("how is the weather"), None)
+        self.assertEqual(LangCode.guess_by_script("hola que tal"), None)
+        self.assertEqual(LangCode.guess_by_script("Ça va très bien"), None)
+        self.assertEqual(LangCode.guess_by_script("?!"), None)
+
+    def test_classify_default(self):
+        default_lang_code = Config.bot.get("LANG_CODE", "ko")
+
+        self.assertEqual(LangCode.classify(None), default_lang_code)
+        self.assertEqual(LangCode.classify(""), default_lang_code)
+        self.assertEqual(LangCode.classify("2017"), default_lang_code)
+
+    def test_classify_cache(self):
+        LangCode.cached_classify.cache_clear()
+
+        self.assertEqual(LangCode.classify("좋은 아침"), "ko")
+        self.assertEqual(LangCode.classify("좋은 아침"), "ko")
+
+        cache_info = LangCode.cached_classify.cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 1)
+
+    def test_classify_ascii_with_langid(self):
+        LangCode.cached_classify.cache_clear()
+
+        for text in ["hola que tal", "how is the weather"]:
+            self.assertEqual(LangCode.classify(text), langid.classify(text)[0])
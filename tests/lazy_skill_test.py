@@ -0,0 +1,23 @@
+import unittest
+
+from hbconfig import Config
+from kino.skills import LazySkill
+
+
+class LazySkillTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        print(Config)
+
+    def test_load_on_first_use(self):
+        humor = LazySkill("humor", "Humor")
+        self.assertEqual(humor.is_loaded, False)
+
+        self.assertEqual(humor.__name__, "Humor")
+        self.assertEqual(humor.is_loaded, True)
+
+    def test_call(self):
+        from kino.skills.humor import Humor
+
+        humor = LazySkill("humor", "Humor")
+        self.assertEqual(isinstance(humor(), Humor), True)
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from kino.bot.leader import FileLockElection
+from kino.bot.leader import Leader
+from kino.bot.leader import LeaderElection
+from kino.bot.leader import SQLiteLeaseElection
+
+
+class LeaderTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_election_backend(self):
+        with self.assertRaises(TypeError):
+            LeaderElection()  # acquire is not implemented
+
+    def test_file_lock(self):
+        path = os.path.join(self.temp_dir.name, "leader.lock")
+        first, second = FileLockElection(path), FileLockElection(path)
+
+        self.assertEqual(first.acquire(), True)
+        self.assertEqual(first.acquire(), True)
+        self.assertEqual(second.acquire(), False)
+
+        first.release()
+        self.assertEqual(second.acquire(), True)
+        second.release()
+
+    def test_sqlite_lease(self):
+        path = os.path.join(self.temp_dir.name, "leader.db")
+        first = SQLiteLeaseElection(path, ttl=0.3)
+        second = SQLiteLeaseElection(path, ttl=0.3)
+
+        self.assertEqual(first.acquire(), True)
+        self.assertEqual(second.acquire(), False)
+        self.assertEqual(first.acquire(), True)  # renew
+
+        time.sleep(0.4)  # the first one stopped renewing
+        self.assertEqual(second.acquire(), True)
+        self.assertEqual(first.acquire(), False)
+
+        second.release()
+        self.assertEqual(first.acquire(), True)
+
+    def test_leader_callbacks(self):
+        path = os.path.join(self.temp_dir.name, "leader.db")
+        events = []
+
+        first = Leader(SQLiteLeaseElection(path, ttl=0.3))
+        first.on_elected = lambda: events.append("first elected")
+        first.on_demoted = lambda: events.append("first demoted")
+        second = Leader(SQLiteLeaseElection(path, ttl=0.3))
+        second.on_elected = lambda: events.append("second elected")
+
+        first.check()
+        second.check()
+        self.assertEqual(first.is_leader, True)
+        self.assertEqual(second.is_leader, False)
+
+        time.sleep(0.4)
+        self.assertEqual(first.is_leader, False)  # lease is over without check
+        second.check()
+        first.check()
+        self.assertEqual(second.is_leader, True)
+        self.assertEqual(events, ["first elected", "second elected", "first demoted"])
+
+    def test_election_error(self):
+        path = os.path.join(self.temp_dir.name, "leader.db")
+        leader = Leader(SQLiteLeaseElection(path, ttl=0.3))
+        leader.on_demoted = mock.Mock()
+        leader.check()
+
+        with mock.patch.object(
+            leader.election, "acquire", side_effect=sqlite3.OperationalError("locked")
+        ):
+            leader.check()
+            self.assertEqual(leader.is_leader, True)  # the lease is still valid
+            self.assertEqual(leader.on_demoted.call_count, 0)
+
+            time.sleep(0.4)
+            leader.check()
+            self.assertEqual(leader.is_leader, False)
+            self.assertEqual(leader.on_demoted.call_count, 1)
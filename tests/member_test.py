@@ -0,0 +1,69 @@
+import time
+import unittest
+from unittest import mock
+
+from hbconfig import Config
+from kino.utils.member import Member
+
+
+class MemberTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        Member.instance = None
+
+    def tearDown(self):
+        Member.instance = None
+
+    test_members = [{"id": "U1", "profile": {"real_name": "Kino"}}]
+
+    @mock.patch("kino.utils.member.SlackerAdapter")
+    @mock.patch("kino.utils.member.DataHandler")
+    def test_cache_time(self, data_handler_class, slackbot_class):
+        data_handler_class.return_value.read_cache.return_value = {
+            "member": self.test_members,
+            "member_updated_time": 0,
+        }
+        self.assertEqual(Member().instance.is_expired(), True)
+
+        Member.instance = None
+        data_handler_class.return_value.read_cache.return_value = {
+            "member": self.test_members,
+            "member_updated_time": time.time(),
+        }
+        member = Member()
+        self.assertEqual(member.instance.is_expired(), False)
+        self.assertEqual(member.get_name("U1"), "Kino")
+
+    @mock.patch("kino.utils.member.SlackerAdapter")
+    @mock.patch("kino.utils.member.DataHandler")
+    def test_unknown_id_after_refresh(self, data_handler_class, slackbot_class):
+        data_handler_class.return_value.read_cache.return_value = {
+            "member": self.test_members,
+            "member_updated_time": time.time(),
+        }
+        get_users = slackbot_class.return_value.get_users
+        get_users.return_value = self.test_members
+
+        member = Member()
+        with mock.patch.object(member.instance, "refresh_in_background") as refresh:
+            self.assertEqual(member.get_name("U2"), None)
+            self.assertEqual(refresh.call_count, 1)
+
+            member.instance.refresh()
+            self.assertEqual(member.get_name("U2"), None)
+            self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(get_users.call_count, 1)
+
+    @mock.patch("kino.utils.member.SlackerAdapter")
+    @mock.patch("kino.utils.member.DataHandler")
+    def test_write_cache_once(self, data_handler_class, slackbot_class):
+        data_handler_class.return_value.read_cache.return_value = {}
+        slackbot_class.return_value.get_users.return_value = self.test_members
+
+        member = Member()  # no members in the cache, refreshed
+        data_handler_class.return_value.update_cache.assert_called_once_with(
+            {
+                "member": self.test_members,
+                "member_updated_time": member.instance.updated_time,
+            }
+        )
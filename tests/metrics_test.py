@@ -0,0 +1,44 @@
+import unittest
+
+from kino.utils.metrics import Metrics
+
+
+class MetricsTest(unittest.TestCase):
+    def test_counter(self):
+        metrics = Metrics()
+        metrics.inc("test_events_total", type="message")
+        metrics.inc("test_events_total", type="message")
+
+        self.assertIn('test_events_total{type="message"} 2', metrics.render())
+
+    def test_gauge(self):
+        metrics = Metrics()
+        metrics.gauge("test_running", 3)
+        metrics.gauge("test_running", 1)
+
+        text = metrics.render()
+        self.assertIn("# TYPE test_running gauge", text)
+        self.assertIn("test_running 1", text)
+
+    def test_histogram(self):
+        metrics = Metrics()
+        metrics.observe("test_duration_seconds", 0.03, skill="forecast")
+        metrics.observe("test_duration_seconds", 100, skill="forecast")
+
+        text = metrics.render()
+        self.assertIn(
+            'test_duration_seconds_bucket{skill="forecast",le="0.05"} 1', text
+        )
+        self.assertIn(
+            'test_duration_seconds_bucket{skill="forecast",le="+Inf"} 2', text
+        )
+        self.assertIn('test_duration_seconds_count{skill="forecast"} 2', text)
+
+    def test_cache_hit_ratio(self):
+        metrics = Metrics()
+        metrics.cache_hit("test")
+        metrics.cache_hit("test")
+        metrics.cache_hit("test")
+        metrics.cache_miss("test")
+
+        self.assertIn('kino_cache_hit_ratio{cache="test"} 0.75', metrics.render())
@@ -0,0 +1,55 @@
+import threading
+import unittest
+
+from kino.slack.resource import compile_message
+from kino.slack.resource import Message
+
+
+class MsgResourceTest(unittest.TestCase):
+    def test_text(self):
+        formatter = compile_message("Hello {name}")
+        self.assertEqual(formatter.has_fields, True)
+        self.assertEqual(formatter.render((), {"name": "kino"}), "Hello kino")
+
+        formatter = compile_message("Hello")
+        self.assertEqual(formatter.has_fields, False)
+        self.assertEqual(formatter.render((), {}), "Hello")
+
+    def test_choice(self):
+        formatter = compile_message(["a {x}", "b {x}"])
+        for _ in range(10):
+            self.assertIn(formatter.render((), {"x": "1"}), ["a 1", "b 1"])
+
+    def test_lookup_nearest_number(self):
+        formatter = compile_message({"90": "green", "60": "yellow", "0": "red"})
+        self.assertEqual(formatter.render(("90",), {}), "green")
+        self.assertEqual(formatter.render((80,), {}), "green")
+        self.assertEqual(formatter.render((65,), {}), "yellow")
+        self.assertEqual(formatter.render((10,), {}), "red")
+
+    def test_lookup_unknown_key(self):
+        formatter = compile_message({"clear-day": ":sunny: ", "rain": ":umbrella: "})
+        self.assertEqual(formatter.render(("rain",), {}), ":umbrella: ")
+        self.assertEqual(formatter.render(("wind",), {}), "")
+
+    def test_message_concat(self):
+        message = "> " + Message("A", (("A", (), {}),)) + "\n" + Message("B", ("B",))
+        self.assertEqual(message, "> A\nB")
+        self.assertEqual(isinstance(message, Message), True)
+        self.assertEqual(message.parts, ("> ", ("A", (), {}), "\n", "B"))
+
+    def test_concurrent_render(self):
+        formatter = compile_message("user: {name}")
+        errors = []
+
+        def render(name):
+            for _ in range(1000):
+                if formatter.render((), {"name": name}) != "user: " + name:
+                    errors.append(name)
+
+        threads = [threading.Thread(target=render, args=(str(i),)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
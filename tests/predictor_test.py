@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+from hbconfig import Config
+from kino.skills.predictor import SkillModel
+
+
+class SkillSamples(object):
+    def __init__(self):
+        self.version = 0
+        self.data_X = []
+        self.data_y = []
+
+    def add(self, x, y):
+        self.data_X.append(x)
+        self.data_y.append(y)
+        self.version += 1
+
+    def make_data_set(self):
+        return self.version, list(self.data_X), list(self.data_y)
+
+
+class SkillModelTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+
+    def test_fit_only_after_samples_changed(self):
+        skill_data = SkillSamples()
+        skill_data.add([1, 10, 0, 3, 0], 0)
+
+        with mock.patch("kino.skills.predictor.KNeighborsClassifier") as knn_class:
+            knn = knn_class.return_value
+            knn.predict.return_value = [0]
+            knn.predict_proba.return_value = [[0.9, 0.1]]
+
+            model = SkillModel(n_neighbors=1, skill_data=skill_data)
+            for _ in range(10):
+                self.assertEqual(model.predict([[1, 10, 0, 3, 0]]), (0, 0.9))
+            self.assertEqual(knn.fit.call_count, 1)
+
+            skill_data.add([6, 22, 30, 1, 1], 1)
+            model.predict([[1, 10, 0, 3, 0]])
+            self.assertEqual(knn.fit.call_count, 2)
+            knn.fit.assert_called_with(skill_data.data_X, skill_data.data_y)
@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+from kino.management import make_skills_fingerprint
+from kino.management import register_skills
+from kino.nlp.ner import NamedEntitiyRecognizer
+from kino.utils.registry import SkillRegistry
+
+
+class SkillRegistryTest(unittest.TestCase):
+    def setUp(self):
+        skills = {
+            "feed": {"keyword": [["피드", "알다"], ["새 소식", "있다"]]},
+            "holiday": {"keyword": ["휴일", "holiday"]},
+            "rescuetime": {"keyword": ["작업 효율", ["rescuetime", "chart"]]},
+            "total_chart": {"keyword": [["total", "chart"]]},
+            "help": {"keyword": []},
+        }
+        with mock.patch("kino.utils.registry.DataHandler") as data_handler_class:
+            data_handler_class.return_value.read_file.return_value = {
+                "fingerprint": "test",
+                "skills": skills,
+            }
+            SkillRegistry.instance = None
+            self.registry = SkillRegistry()
+        self.addCleanup(setattr, SkillRegistry, "instance", None)
+
+    def test_match(self):
+        ner = NamedEntitiyRecognizer()
+        texts = [
+            "피드 알려줘",
+            "새 소식 있어?",
+            "holiday",
+            "rescuetime total chart",
+            "total chart",
+            "작업 효율 보여줘",
+            "피드",
+            "hello",
+        ]
+        for text in texts:
+            self.assertEqual(
+                self.registry.match(text), ner.parse(self.registry.keywords, text), text
+            )
+        self.assertEqual(self.registry.match("rescuetime total chart"), "rescuetime")
+
+
+class RegisterSkillsTest(unittest.TestCase):
+    @mock.patch("kino.management.parse_skills")
+    @mock.patch("kino.management.SkillRegistry")
+    def test_skip_parse_when_up_to_date(self, registry_class, parse_skills):
+        registry = registry_class.return_value
+        registry.fingerprint = make_skills_fingerprint()
+        registry.list = {}
+
+        register_skills()
+        self.assertEqual(parse_skills.call_count, 0)
+        self.assertEqual(registry.save.call_count, 0)
+
+        register_skills(force=True)
+        self.assertEqual(parse_skills.call_count, 1)
+        registry.save.assert_called_once_with(
+            registry.fingerprint, parse_skills.return_value
+        )
@@ -0,0 +1,81 @@
+import collections
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from hbconfig import Config
+from kino.management.replay import FakeSlacker
+from kino.management.replay import MessageReplay
+from kino.management.replay import keep_data_files
+from kino.management.replay import replace_attr
+from kino.slack import slackbot
+
+
+class MessageReplayTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = self.tmp_dir.name + "/"
+        with open(self.data_path + "schedule.json", "w") as f:
+            f.write("{}")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_keep_data_files(self):
+        with keep_data_files(self.data_path):
+            with open(self.data_path + "schedule.json", "w") as f:
+                f.write('{"alarm": {}}')
+            os.makedirs(self.data_path + "record")
+            with open(self.data_path + "record/2018-03-05.json", "w") as f:
+                f.write("{}")
+
+        self.assertEqual(os.listdir(self.data_path + "record"), [])
+        with open(self.data_path + "schedule.json") as f:
+            self.assertEqual(f.read(), "{}")
+
+    def test_bot_id_found_once(self):
+        cache = {}
+        FakeSlacker.calls = collections.Counter()
+        with replace_attr(slackbot, "Slacker", FakeSlacker), mock.patch(
+            "kino.slack.slackbot.DataHandler"
+        ) as data_handler_class:
+            data_handler = data_handler_class.return_value
+            data_handler.read_cache.return_value = cache
+            data_handler.edit_cache.side_effect = lambda data: cache.update([data])
+
+            adapter = slackbot.SlackerAdapter()
+            self.assertEqual(adapter.get_bot_id(), FakeSlacker.BOT_ID)
+            self.assertEqual(adapter.get_bot_id(), FakeSlacker.BOT_ID)
+
+        self.assertEqual(FakeSlacker.calls["users.list"], 1)
+
+    def test_run(self):
+        def handle(receive_json):
+            event = json.loads(receive_json)
+            slackbot.SlackerAdapter().send_message(text=event["text"], giphy=False)
+            with open(self.data_path + "state.json", "w") as f:
+                f.write(receive_json)
+
+        replay = MessageReplay()
+        events = [(i, replay.make_event(text=f"hello {i}")) for i in range(3)]
+        with mock.patch(
+            "kino.management.replay.DataHandler"
+        ) as data_handler_class, mock.patch(
+            "kino.management.replay.MsgListener"
+        ) as listener_class, mock.patch(
+            "kino.management.replay.SkillRegistry"
+        ) as registry_class, mock.patch(
+            "kino.slack.slackbot.DataHandler"
+        ):
+            data_handler_class.return_value.data_path = self.data_path
+            listener_class.return_value.handle.side_effect = handle
+            registry_class.return_value.list = {}
+
+            report = replay.run(events)
+
+        self.assertEqual(report["count"], 3)
+        self.assertEqual(report["slack_api_calls"], {"chat.post_message": 3})
+        self.assertEqual(os.listdir(self.data_path), ["schedule.json"])
@@ -0,0 +1,183 @@
+import contextlib
+import datetime
+import random
+import threading
+import time
+import unittest
+
+from kino.background import schedule
+
+
+@contextlib.contextmanager
+def mock_datetime(now):
+    class MockDate(datetime.datetime):
+        @classmethod
+        def today(cls):
+            return cls(now.year, now.month, now.day)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls(now.year, now.month, now.day, now.hour, now.minute, now.second)
+
+    original_datetime = datetime.datetime
+    datetime.datetime = MockDate
+    try:
+        yield
+    finally:
+        datetime.datetime = original_datetime
+
+
+class ScheduleTest(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime.datetime(2018, 3, 5, 12, 0)
+        self.scheduler = schedule.Scheduler()
+        self.runs = []
+
+    def job(self, job_id):
+        self.runs.append(job_id)
+
+    def test_thousands_of_jobs(self):
+        intervals = [random.randint(1, 120) for _ in range(5000)]
+        with mock_datetime(self.start):
+            for job_id, interval in enumerate(intervals):
+                self.scheduler.every(interval).minutes.do(self.job, job_id)
+
+        self.assertEqual(len(self.scheduler.jobs), 5000)
+        self.assertEqual(
+            self.scheduler.next_run, min(j.next_run for j in self.scheduler.jobs)
+        )
+
+        with mock_datetime(self.start + datetime.timedelta(minutes=30)):
+            self.scheduler.run_pending()
+
+        expected = [i for i, interval in enumerate(intervals) if interval <= 30]
+        self.assertEqual(sorted(self.runs), expected)
+        self.assertEqual(
+            self.scheduler.next_run, min(j.next_run for j in self.scheduler.jobs)
+        )
+
+    def test_run_in_next_run_order(self):
+        with mock_datetime(self.start):
+            for job_id in range(1000):
+                self.scheduler.every(1000 - job_id).seconds.do(self.job, job_id)
+
+        with mock_datetime(self.start + datetime.timedelta(hours=1)):
+            self.scheduler.run_pending()
+        self.assertEqual(self.runs, list(reversed(range(1000))))
+
+    def test_cancel_thousands_of_jobs(self):
+        with mock_datetime(self.start):
+            jobs = [
+                self.scheduler.every(i + 1).seconds.do(self.job, i) for i in range(3000)
+            ]
+            for job in jobs[::2]:
+                self.scheduler.cancel_job(job)
+            self.scheduler.cancel_job(jobs[0])  # already cancelled
+
+        self.assertEqual(len(self.scheduler.jobs), 1500)
+        self.assertEqual(self.scheduler.next_run, jobs[1].next_run)
+
+        with mock_datetime(self.start + datetime.timedelta(hours=1)):
+            self.scheduler.run_pending()
+        self.assertEqual(sorted(self.runs), list(range(1, 3000, 2)))
+
+    def test_cancel_job_returned(self):
+        def once():
+            self.runs.append("once")
+            return schedule.CancelJob
+
+        with mock_datetime(self.start):
+            self.scheduler.every().minute.do(once)
+            self.scheduler.every(2).minutes.do(self.job, "repeat")
+
+        for minutes in range(1, 5):
+            with mock_datetime(self.start + datetime.timedelta(minutes=minutes)):
+                self.scheduler.run_pending()
+
+        self.assertEqual(self.runs, ["once", "repeat", "repeat"])
+        self.assertEqual(len(self.scheduler.jobs), 1)
+
+    def test_day_at(self):
+        with mock_datetime(self.start):
+            job = self.scheduler.every().day.at("10:30").do(self.job, "day")
+            self.assertEqual(job.next_run, datetime.datetime(2018, 3, 6, 10, 30))
+
+            job = self.scheduler.every().day.at("23:55").do(self.job, "day")
+            self.assertEqual(job.next_run, datetime.datetime(2018, 3, 5, 23, 55))
+            self.assertEqual(self.scheduler.next_run, job.next_run)
+
+    def test_clear_tag(self):
+        with mock_datetime(self.start):
+            self.scheduler.every().minute.do(self.job, "a").tag("a")
+            self.scheduler.every().minute.do(self.job, "b").tag("b")
+
+        self.scheduler.clear("a")
+        with mock_datetime(self.start + datetime.timedelta(minutes=1)):
+            self.scheduler.run_pending()
+        self.assertEqual(self.runs, ["b"])
+
+        self.scheduler.clear()
+        self.assertEqual(len(self.scheduler.jobs), 0)
+        self.assertEqual(self.scheduler.next_run, None)
+
+    def test_job_exception_keeps_schedule(self):
+        def fail_once():
+            if "failed" not in self.runs:
+                self.runs.append("failed")
+                raise ValueError("fail")
+            self.runs.append("retried")
+
+        with mock_datetime(self.start):
+            self.scheduler.every().minute.do(fail_once)
+            self.scheduler.every().minute.do(self.job, "ok")
+
+        with mock_datetime(self.start + datetime.timedelta(minutes=1)):
+            with self.assertRaises(ValueError):
+                self.scheduler.run_pending()
+            self.assertEqual(len(self.scheduler.jobs), 2)
+            self.scheduler.run_pending()  # the failed job waits for its next run
+        self.assertEqual(sorted(self.runs), ["failed", "ok"])
+
+        with mock_datetime(self.start + datetime.timedelta(minutes=2)):
+            self.scheduler.run_pending()
+        self.assertEqual(sorted(self.runs), ["failed", "ok", "ok", "retried"])
+
+    def test_run_continuously_survives_job_exception(self):
+        failures = []
+        ran = threading.Event()
+
+        def fail():
+            failures.append(1)
+            raise ValueError("fail")
+
+        self.scheduler.every().second.do(fail)
+        cease_continuous_run = self.scheduler.run_continuously(interval=60)
+        try:
+            time.sleep(1.5)
+            self.scheduler.every().second.do(ran.set)
+            self.assertEqual(ran.wait(5), True)
+        finally:
+            cease_continuous_run.set()
+
+        self.assertTrue(1 <= len(failures) <= 10)  # not retried in a busy loop
+
+    def test_run_continuously_wakes_up_on_new_job(self):
+        ran = threading.Event()
+
+        cease_continuous_run = self.scheduler.run_continuously(interval=60)
+        try:
+            time.sleep(0.1)  # sleeping without jobs
+            self.scheduler.every().second.do(ran.set)
+            self.assertEqual(ran.wait(5), True)
+        finally:
+            cease_continuous_run.set()
+
+    def test_shift_interval_jobs(self):
+        with mock_datetime(self.start):
+            interval_job = self.scheduler.every(10).minutes.do(self.job, "interval")
+            at_job = self.scheduler.every().day.at("13:00").do(self.job, "at")
+
+        self.scheduler._shift_interval_jobs(datetime.timedelta(hours=-1))
+        self.assertEqual(interval_job.next_run, datetime.datetime(2018, 3, 5, 11, 10))
+        self.assertEqual(at_job.next_run, datetime.datetime(2018, 3, 5, 13, 0))
+        self.assertEqual(self.scheduler.next_run, interval_job.next_run)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from kino.utils.seen_store import SeenStore
+
+
+class SeenStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "seen", "test.log")
+
+    def tearDown(self):
+        SeenStore.instances.pop("test", None)
+        self.tmp_dir.cleanup()
+
+    def reload(self, **kwargs):
+        SeenStore.instances.pop("test", None)
+        return SeenStore("test", path=self.path, **kwargs)
+
+    def test_add_and_contains(self):
+        store = self.reload()
+        store.add("http://a.com/1")
+        store.add(1234)
+
+        self.assertIn("http://a.com/1", store)
+        self.assertIn(1234, store)
+        self.assertNotIn("http://a.com/2", store)
+        self.assertIs(SeenStore("test").instance, store.instance)
+
+    def test_max_size_keeps_latest(self):
+        store = self.reload(max_size=100)
+        for i in range(300):
+            store.add(i)
+
+        self.assertEqual(len(store), 100)
+        self.assertNotIn(199, store)
+        self.assertIn(200, store)
+
+        store.add(200)  # seen again, moved to the end
+        store.add(300)
+        self.assertIn(200, store)
+        self.assertNotIn(201, store)
+
+    def test_max_age(self):
+        store = self.reload(max_age=60)
+        store.add("old", now=1000)
+        store.add("new", now=1050)
+
+        self.assertEqual(store.contains("old", now=1070), False)
+        self.assertEqual(store.contains("new", now=1070), True)
+
+        store.add("latest", now=1100)
+        self.assertEqual(len(store), 2)
+
+    def test_persist(self):
+        store = self.reload()
+        for i in range(10):
+            store.add(f"link{i}")
+        store.save()
+        store.add("link0")
+        store.save()
+
+        store = self.reload(max_size=5)
+        self.assertEqual(
+            list(store.seen), ["link6", "link7", "link8", "link9", "link0"]
+        )
+
+    def test_compact(self):
+        store = self.reload(max_size=100)
+        for i in range(5000):
+            store.add(i)
+            if i % 100 == 0:
+                store.save()
+        store.save()
+
+        with open(self.path) as f:
+            self.assertLessEqual(
+                len(f.readlines()), SeenStore.instances["test"].COMPACT_MIN_LINES
+            )
+
+        store = self.reload(max_size=100)
+        self.assertEqual(list(store.seen), [str(i) for i in range(4900, 5000)])
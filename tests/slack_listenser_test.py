@@ -52,3 +52,12 @@ class MsgListenerTest(unittest.TestCase):
 
     def test_is_dnd_updated_user(self):
         self.assertEqual(MsgListener().is_dnd_updated_user(self.test_dnd_msg1), True)
+
+    test_user_change_msg1 = {"type": "user_change", "user": {"id": "U12345"}}
+
+    test_user_change_msg2 = {"type": "team_join", "user": {"id": "U12345"}}
+
+    def test_is_user_change(self):
+        self.assertEqual(MsgListener().is_user_change(self.test_user_change_msg1), True)
+        self.assertEqual(MsgListener().is_user_change(self.test_user_change_msg2), True)
+        self.assertEqual(MsgListener().is_user_change(self.test_message_msg), False)
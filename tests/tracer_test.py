@@ -0,0 +1,35 @@
+import time
+import unittest
+
+from kino.utils.tracer import Tracer
+
+
+class TracerTest(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer()
+        self.tracer.reset()
+
+    def test_trace_stages(self):
+        with self.tracer.trace("message") as trace:
+            with self.tracer.stage("ner"):
+                time.sleep(0.01)
+            with self.tracer.stage("skill"):
+                with self.tracer.stage("send_message"):
+                    time.sleep(0.02)
+
+        self.assertEqual(sorted(trace.stages.keys()), ["ner", "send_message", "skill"])
+        self.assertEqual(trace.stages["skill"] < trace.stages["send_message"], True)
+
+        summary = self.tracer.summary()
+        self.assertEqual(summary["message.total"]["count"], 1)
+        self.assertEqual(summary["message.send_message"]["p50"] >= 20, True)
+
+    def test_percentiles(self):
+        for ms in range(1, 101):
+            self.tracer.record("skill", ms / 1000)
+
+        stats = self.tracer.summary()["skill"]
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["p50"], 50)
+        self.assertAlmostEqual(stats["p99"], 99)
+        self.assertAlmostEqual(stats["max"], 100)
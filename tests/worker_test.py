@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+
+from hbconfig import Config
+from kino.background import schedule
+from kino.bot.worker import Worker
+
+
+class WorkerTest(unittest.TestCase):
+    def setUp(self):
+        Config("config_example")
+
+        with mock.patch("kino.bot.worker.NamedEntitiyRecognizer"), mock.patch(
+            "kino.bot.worker.FunctionRunner"
+        ), mock.patch("kino.utils.profile.Profile"):
+            self.worker = Worker(slackbot=mock.Mock())
+        self.worker.profile = mock.Mock()
+        self.worker.profile.get_schedule.return_value = "07:00"
+        self.worker.data_handler = mock.Mock()
+        self.worker.data_handler.read_file.return_value = {
+            "alarm": {"1": {"time": "09:00", "f_name": "send_message"}}
+        }
+        # load_function of a 'repeat: False' job
+        self.worker.function_runner = lambda **kwargs: schedule.CancelJob
+
+        with mock.patch("kino.bot.worker.JobStore") as job_store_class:
+            job_store_class.return_value.is_misfired.return_value = False
+            self.worker.set_schedules()
+
+    def tearDown(self):
+        schedule.clear()
+
+    def run_job(self, job_id):
+        job = [job for job, i, *_ in self.worker.scheduled_jobs if i == job_id][0]
+        with mock.patch("kino.bot.worker.JobStore"):
+            future = job.job_func()
+        future.result(5)
+        return job
+
+    def test_profile_job_repeats(self):
+        job = self.run_job("profile:good_morning:07:00")
+        self.assertIn(job, schedule.jobs)
+
+    def test_time_alarm_runs_once(self):
+        job = self.run_job("alarm:1:time")
+        self.assertNotIn(job, schedule.jobs)
+
+    def test_skip_when_not_leader(self):
+        self.worker.leader = mock.Mock(is_leader=False)
+        self.worker.function_runner = mock.Mock()
+
+        job = self.worker.scheduled_jobs[0][0]
+        self.assertEqual(job.job_func(), None)
+        self.assertEqual(self.worker.function_runner.call_count, 0)
+
+    def test_regain_leadership(self):
+        job_count = len(self.worker.scheduled_jobs)
+        self.worker.stop(init=True)  # demoted
+
+        with mock.patch("kino.bot.worker.JobStore") as job_store_class, mock.patch(
+            "kino.bot.worker.JobExecutor"
+        ) as executor_class:
+            job_store_class.return_value.is_misfired.side_effect = (
+                lambda job_id, job: job_id == "alarm:1:time"
+            )
+            self.worker.set_schedules()  # elected again
+
+        self.assertEqual(len(self.worker.scheduled_jobs), job_count)
+        self.assertEqual(executor_class.return_value.submit.call_count, 1)